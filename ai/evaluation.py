@@ -0,0 +1,103 @@
+"""Board features and placement helpers for AI players.
+
+Boards are handled as lists or tuples of row bitmasks (bit x set for a filled
+cell in column x, row 0 at the top), the same layout BitBoard uses, so
+candidate placements can be tried without touching the real board.
+"""
+
+# Feature weights (aggregate height, lines, holes, bumpiness) from the well-known El-Tetris tuning
+WEIGHTS = {
+    'height': -0.510066,
+    'lines': 0.760666,
+    'holes': -0.35663,
+    'bumpiness': -0.184483
+}
+
+
+def board_rows(board):
+    """Return the row bitmasks of a Board or BitBoard"""
+    rows = getattr(board, 'rows', None)
+    if rows is not None:
+        return list(rows)
+    return [sum(1 << x for x, cell in enumerate(row) if cell) for row in board.grid]
+
+
+def fits(rows, width, height, masks, x, y):
+    """Check if a piece with the given (row_masks, left, right) fits at (x, y)"""
+    row_masks, left, right = masks
+    if x + left < 0 or x + right >= width or y + len(row_masks) > height:
+        return False
+
+    for i, mask in enumerate(row_masks):
+        if y + i >= 0 and rows[y + i] & (mask << x):
+            return False
+
+    return True
+
+
+def drop(rows, width, height, masks, x, y):
+    """Return the lowest row the piece reaches when dropped from (x, y)"""
+    while fits(rows, width, height, masks, x, y + 1):
+        y += 1
+    return y
+
+
+def place(rows, width, masks, x, y):
+    """Lock a piece into the rows and clear lines.
+
+    Returns (new_rows, lines_cleared, topped_out) where new_rows is a tuple,
+    which also makes it a compact hashable key for the resulting board.
+    """
+    full_row = (1 << width) - 1
+    new_rows = list(rows)
+    topped_out = False
+
+    for i, mask in enumerate(masks[0]):
+        if y + i < 0:
+            topped_out = True
+        else:
+            new_rows[y + i] |= mask << x
+
+    kept = [row for row in new_rows if row != full_row]
+    lines = len(new_rows) - len(kept)
+    return (0,) * lines + tuple(kept), lines, topped_out
+
+
+def column_heights(rows, width):
+    """Height of the highest filled cell of every column"""
+    height = len(rows)
+    heights = [0] * width
+    remaining = (1 << width) - 1
+    for y, row in enumerate(rows):
+        new = row & remaining
+        if new:
+            for x in range(width):
+                if new >> x & 1:
+                    heights[x] = height - y
+            remaining &= ~new
+            if not remaining:
+                break
+    return heights
+
+
+def count_holes(rows, width):
+    """Number of empty cells with a filled cell somewhere above them"""
+    holes = 0
+    covered = 0
+    for row in rows:
+        holes += bin(covered & ~row).count('1')
+        covered |= row
+    return holes
+
+
+def evaluate(rows, width, lines=0, heights=None, holes=None):
+    """Score a board position, higher is better.
+
+    heights and holes can be passed in when the caller already tracks them.
+    """
+    heights = heights if heights is not None else column_heights(rows, width)
+    holes = holes if holes is not None else count_holes(rows, width)
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+
+    return (WEIGHTS['height'] * sum(heights) + WEIGHTS['lines'] * lines +
+            WEIGHTS['holes'] * holes + WEIGHTS['bumpiness'] * bumpiness)
@@ -0,0 +1,121 @@
+"""Enumerate every reachable final placement of a piece.
+
+A breadth-first search over (rotation, x, y) states, using the same moves and
+SRS kicks as Board, finds every resting position the piece can reach,
+including tucks and spins that need a soft drop followed by a slide or a
+rotation. Gravity is ignored, i.e. the player is assumed to be faster than the
+piece falls. Placements producing the same board are reported once, with the
+shortest input path.
+"""
+from collections import deque, namedtuple
+
+from core.rotation import KICKS, ROTATION_MASKS, ROTATIONS, SPAWN_ROTATION
+from core.simulation import Action
+from ai.evaluation import board_rows, fits, place
+
+# A final resting position, the inputs that reach it (ending with a hard drop) and the resulting board
+Placement = namedtuple('Placement', 'rotation x y path rows lines topped_out')
+
+# Moves tried from every state: (action, dx, dy, quarter turns)
+MOVES = (
+    (Action.MOVE_LEFT, -1, 0, 0),
+    (Action.MOVE_RIGHT, 1, 0, 0),
+    (Action.SOFT_DROP, 0, 1, 0),
+    (Action.ROTATE_CW, 0, 0, 1),
+    (Action.ROTATE_CCW, 0, 0, 3),
+    (Action.ROTATE_180, 0, 0, 2)
+)
+
+
+def spawn_state(shape_idx, width):
+    """Return the (rotation, x, y) a piece spawns at on a board of the given width"""
+    rotation = SPAWN_ROTATION[shape_idx]
+    shape = ROTATIONS[shape_idx][rotation]
+    return rotation, width // 2 - len(shape[0]) // 2, -len(shape)
+
+
+def _path(parents, state):
+    """Rebuild the input path leading to a state, collapsing trailing soft drops into a hard drop"""
+    path = []
+    while parents[state] is not None:
+        state, action = parents[state]
+        path.append(action)
+    path.reverse()
+
+    while path and path[-1] == Action.SOFT_DROP:
+        path.pop()
+    path.append(Action.HARD_DROP)
+    return tuple(path)
+
+
+def enumerate_from(rows, width, height, shape_idx, rotation, x, y, allow_180=True):
+    """Return the list of distinct placements reachable from a piece state on the given rows"""
+    masks = ROTATION_MASKS[shape_idx]
+    kicks = KICKS[shape_idx]
+    start = (rotation, x, y)
+    if not fits(rows, width, height, masks[rotation], x, y):
+        return []
+
+    parents = {start: None}
+    queue = deque([start])
+    placements = {}
+
+    while queue:
+        state = queue.popleft()
+        rotation, x, y = state
+
+        # Resting states are final placements
+        if not fits(rows, width, height, masks[rotation], x, y + 1):
+            new_rows, lines, topped_out = place(rows, width, masks[rotation], x, y)
+            if new_rows not in placements:
+                placements[new_rows] = Placement(rotation, x, y, _path(parents, state), new_rows, lines, topped_out)
+
+        for action, dx, dy, turns in MOVES:
+            if turns == 2 and not allow_180:
+                continue
+
+            if turns:
+                new_rotation = (rotation + turns) % 4
+                for kick_x, kick_y in kicks[rotation][new_rotation]:
+                    if fits(rows, width, height, masks[new_rotation], x + kick_x, y + kick_y):
+                        new_state = (new_rotation, x + kick_x, y + kick_y)
+                        break
+                else:
+                    continue
+            elif fits(rows, width, height, masks[rotation], x + dx, y + dy):
+                new_state = (rotation, x + dx, y + dy)
+            else:
+                continue
+
+            if new_state not in parents:
+                parents[new_state] = (state, action)
+                queue.append(new_state)
+
+    return list(placements.values())
+
+
+def enumerate_placements(board, piece=None, allow_180=True):
+    """Return every distinct placement of a piece (the current one by default) on a Board"""
+    piece = piece or board.current_piece
+    return enumerate_from(board_rows(board), board.width, board.height, piece.shape_idx,
+                          piece.rotation, piece.x, piece.y, allow_180)
+
+
+def apply_path(board, path):
+    """Play an input path on a Board, returns False if the game ended"""
+    for action in path:
+        if action == Action.MOVE_LEFT:
+            board.move_piece(dx=-1)
+        elif action == Action.MOVE_RIGHT:
+            board.move_piece(dx=1)
+        elif action == Action.SOFT_DROP:
+            board.move_piece(dy=1)
+        elif action == Action.ROTATE_CW:
+            board.rotate_piece(1)
+        elif action == Action.ROTATE_CCW:
+            board.rotate_piece(3)
+        elif action == Action.ROTATE_180:
+            board.rotate_piece(2)
+        elif action == Action.HARD_DROP:
+            return board.hard_drop()
+    return not board.game_over
@@ -0,0 +1,123 @@
+"""Placement policies used by AI players and the self-play farm.
+
+A policy looks at a board and returns the (rotation, x) it wants for the
+current piece; play() then rotates, shifts and hard-drops the piece. Policies
+that plan real input sequences override play() instead.
+"""
+import random
+
+from core.rotation import OFFSETS, ROTATION_MASKS, TOPS, BOTTOMS
+from core.board import surface_drop_distance
+from ai.evaluation import board_rows, fits, drop, place, evaluate
+from ai.placement import apply_path
+from ai.search import Searcher
+
+
+def drop_placements(board, piece=None):
+    """Yield (rotation, x, y) for every column and rotation the piece can be dropped in from above"""
+    piece = piece or board.current_piece
+    offsets = OFFSETS[piece.shape_idx]
+    rows = board_rows(board)
+
+    for rotation in range(4):
+        masks = ROTATION_MASKS[piece.shape_idx][rotation]
+        bottoms = BOTTOMS[piece.shape_idx][rotation]
+        y = piece.y + offsets[rotation][1] - offsets[piece.rotation][1]
+        for x in range(-masks[1], board.width - masks[2]):
+            if fits(rows, board.width, board.height, masks, x, y):
+                # The board's column heights give the landing row without stepping down
+                distance = surface_drop_distance(board.heights, board.height, bottoms, x, y)
+                if distance is None:
+                    yield rotation, x, drop(rows, board.width, board.height, masks, x, y)
+                else:
+                    yield rotation, x, y + distance
+
+
+class Policy:
+    """Base class for placement policies"""
+    name = None
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose(self, board):
+        """Return the (rotation, x) to play the current piece at"""
+        raise NotImplementedError
+
+    def play(self, board):
+        """Place the current piece on the board, returns False if the game ended"""
+        rotation, x = self.choose(board)
+        piece = board.current_piece
+        piece.rotate((rotation - piece.rotation) % 4)
+        piece.x = x
+        return board.hard_drop()
+
+
+class RandomPolicy(Policy):
+    """Drop every piece at a random rotation and column"""
+    name = 'random'
+
+    def choose(self, board):
+        placements = list(drop_placements(board))
+        if not placements:
+            return board.current_piece.rotation, board.current_piece.x
+        rotation, x, _ = self.rng.choice(placements)
+        return rotation, x
+
+
+class GreedyPolicy(Policy):
+    """Pick the drop placement with the best one-ply board evaluation"""
+    name = 'greedy'
+
+    def choose(self, board):
+        piece = board.current_piece
+        rows = board_rows(board)
+        best, best_score = (piece.rotation, piece.x), None
+
+        for rotation, x, y in drop_placements(board):
+            masks = ROTATION_MASKS[piece.shape_idx][rotation]
+            new_rows, lines, topped_out = place(rows, board.width, masks, x, y)
+
+            heights = holes = None
+            if not lines and not topped_out:
+                # Without a line clear the new profile follows from the board's heights,
+                # a topped out piece leaves cells above the grid and is evaluated from the rows
+                heights = board.heights[:]
+                for j, top in enumerate(TOPS[piece.shape_idx][rotation]):
+                    heights[x + j] = max(heights[x + j], board.height - y - top)
+                holes = sum(heights) - board.filled_cells - 4
+
+            score = evaluate(new_rows, board.width, lines, heights, holes) - (1000 if topped_out else 0)
+            if best_score is None or score > best_score:
+                best, best_score = (rotation, x), score
+
+        return best
+
+
+class SearchPolicy(Policy):
+    """Play the best reachable placement found by a two-piece search"""
+    name = 'search'
+
+    def __init__(self, seed=None, time_budget=0.05):
+        super().__init__(seed)
+        self.searcher = Searcher(time_budget=time_budget)
+
+    def choose(self, board):
+        placement = self.searcher.best_placement(board)
+        if placement is None:
+            return board.current_piece.rotation, board.current_piece.x
+        return placement.rotation, placement.x
+
+    def play(self, board):
+        placement = self.searcher.best_placement(board)
+        if placement is None:
+            return board.hard_drop()
+        return apply_path(board, placement.path)
+
+
+# Policies available by name, e.g. from the command line of the self-play farm
+POLICIES = {
+    RandomPolicy.name: RandomPolicy,
+    GreedyPolicy.name: GreedyPolicy,
+    SearchPolicy.name: SearchPolicy
+}
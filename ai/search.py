@@ -0,0 +1,117 @@
+"""Two-piece move search with a bounded transposition table.
+
+The searcher looks at every placement of the current piece and, for each,
+every placement of the next piece, scoring the resulting boards with
+ai.evaluation.evaluate. Boards are keyed by their row-mask tuple, so
+transpositions (different move orders reaching the same board) are
+evaluated only once. Static evaluations and best follow-up values live in
+separate tables, each with its own capacity and hit counters. A per-piece
+time budget bounds how many first-ply candidates get the deeper look.
+"""
+import time
+from collections import OrderedDict
+
+from ai.evaluation import board_rows, evaluate, WEIGHTS
+from ai.placement import enumerate_from, spawn_state
+
+# Penalty for a placement that leaves part of the piece above the grid
+TOP_OUT_PENALTY = 1000.0
+
+
+class TranspositionTable:
+    """LRU cache with a fixed number of entries and hit/miss counters"""
+
+    def __init__(self, max_size=200000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return the cached value or None"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+class Searcher:
+    def __init__(self, time_budget=0.05, table_size=200000, allow_180=True):
+        self.time_budget = time_budget  # Seconds per decision
+        self.evaluations = TranspositionTable(table_size)  # rows -> static evaluation
+        self.follow_ups = TranspositionTable(table_size)  # (rows, shape_idx) -> best follow-up value
+        self.allow_180 = allow_180
+
+    def stats(self):
+        """Return the size and hit/miss counters of both tables"""
+        return {name: {'entries': len(table), 'hits': table.hits, 'misses': table.misses}
+                for name, table in (('evaluations', self.evaluations), ('follow_ups', self.follow_ups))}
+
+    def _static_value(self, rows, width):
+        """Evaluation of a board without the line bonus, memoized by board"""
+        value = self.evaluations.get(rows)
+        if value is None:
+            value = evaluate(rows, width)
+            self.evaluations.put(rows, value)
+        return value
+
+    def _leaf_value(self, placement, width, lines=0):
+        value = self._static_value(placement.rows, width) + WEIGHTS['lines'] * (placement.lines + lines)
+        return value - TOP_OUT_PENALTY if placement.topped_out else value
+
+    def _best_follow_up(self, rows, width, height, shape_idx):
+        """Best leaf value over all placements of a piece spawned on the given board"""
+        key = (rows, shape_idx)
+        value = self.follow_ups.get(key)
+        if value is None:
+            rotation, x, y = spawn_state(shape_idx, width)
+            placements = enumerate_from(rows, width, height, shape_idx, rotation, x, y, self.allow_180)
+            if placements:
+                value = max(self._leaf_value(placement, width) for placement in placements)
+            else:
+                value = -TOP_OUT_PENALTY * 2  # The next piece could not even spawn
+            self.follow_ups.put(key, value)
+        return value
+
+    def best_placement(self, board, current=None, next_piece=None):
+        """Return the best Placement for the current piece, or None if it cannot move"""
+        deadline = time.perf_counter() + self.time_budget
+        current = current or board.current_piece
+        next_piece = next_piece or board.next_piece
+        width, height = board.width, board.height
+
+        placements = enumerate_from(board_rows(board), width, height, current.shape_idx,
+                                    current.rotation, current.x, current.y, self.allow_180)
+        if not placements:
+            return None
+
+        # One-ply ordering so the most promising candidates get the deeper look first
+        placements.sort(key=lambda placement: self._leaf_value(placement, width), reverse=True)
+        if next_piece is None:
+            return placements[0]
+
+        best, best_value = placements[0], None
+        for placement in placements:
+            if best_value is not None and time.perf_counter() > deadline:
+                break
+            if placement.topped_out:
+                continue
+
+            value = (self._best_follow_up(placement.rows, width, height, next_piece.shape_idx) +
+                     WEIGHTS['lines'] * placement.lines)
+            if best_value is None or value > best_value:
+                best, best_value = placement, value
+
+        return best
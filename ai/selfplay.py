@@ -0,0 +1,124 @@
+"""Self-play farm running many AI games in parallel.
+
+Games are split into chunks of seeds and fanned out over a process pool, one
+worker per CPU core by default. Each finished chunk streams its per-game
+results back to the parent, which aggregates them and writes a JSON summary.
+Use it to compare scoring or level-curve changes in core/rules.py.
+
+Run with: python -m ai.selfplay --games 1000 --policy greedy
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import services.config as config
+from core.simulation import create_board
+from ai.policies import POLICIES
+
+DEFAULT_OUTPUT = os.path.join(config.BASE_DIR, 'data', 'selfplay_summary.json')
+
+
+def play_game(seed, policy_name='greedy', max_pieces=1000):
+    """Play one game with a seeded piece sequence and return its result"""
+    board = create_board(rng=random.Random(seed))
+    policy = POLICIES[policy_name](seed=seed)
+
+    start = time.perf_counter()
+    while not board.game_over and board.pieces_placed < max_pieces:
+        policy.play(board)
+
+    return {
+        'seed': seed,
+        'score': board.score,
+        'lines': board.lines_cleared,
+        'level': board.level,
+        'pieces': board.pieces_placed,
+        'topped_out': board.game_over,
+        'duration': time.perf_counter() - start
+    }
+
+
+def play_chunk(seeds, policy_name, max_pieces):
+    """Worker entry point: play a batch of games"""
+    return [play_game(seed, policy_name, max_pieces) for seed in seeds]
+
+
+def run_farm(games, policy_name='greedy', workers=None, chunk_size=8, seed=0, max_pieces=1000, on_result=None):
+    """Play games across a process pool and return all results.
+
+    on_result is called in the parent with every game result as soon as its
+    chunk completes.
+    """
+    seeds = list(range(seed, seed + games))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(play_chunk, chunk, policy_name, max_pieces) for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+    results.sort(key=lambda result: result['seed'])
+    return results
+
+
+def summarize(results):
+    """Aggregate per-game results into summary statistics"""
+    summary = {'games': len(results)}
+    for key in ('score', 'lines', 'level', 'pieces', 'duration'):
+        values = [result[key] for result in results]
+        summary[key] = {
+            'mean': statistics.mean(values),
+            'median': statistics.median(values),
+            'min': min(values),
+            'max': max(values)
+        }
+    summary['topped_out'] = sum(result['topped_out'] for result in results)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run AI games in parallel and summarize the results")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--workers', type=int, default=None, help="Defaults to the number of CPU cores")
+    parser.add_argument('--chunk-size', type=int, default=8, help="Games per task sent to a worker")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the first game")
+    parser.add_argument('--max-pieces', type=int, default=1000, help="Piece limit per game")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Where to write the JSON summary")
+    args = parser.parse_args()
+
+    def report(result):
+        print(f"seed {result['seed']:>6}: score {result['score']:>8} lines {result['lines']:>5} "
+              f"level {result['level']:>3} pieces {result['pieces']:>5} ({result['duration']:.2f}s)")
+
+    start = time.perf_counter()
+    results = run_farm(args.games, args.policy, args.workers, args.chunk_size, args.seed, args.max_pieces, report)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    summary.update({
+        'policy': args.policy,
+        'workers': args.workers or os.cpu_count(),
+        'elapsed': elapsed,
+        'games_per_second': len(results) / elapsed,
+        'results': results
+    })
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"{len(results)} games in {elapsed:.2f}s ({summary['games_per_second']:.1f} games/s), "
+          f"mean score {summary['score']['mean']:.1f}; summary written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
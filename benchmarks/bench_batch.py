@@ -0,0 +1,58 @@
+"""Benchmark of BatchEngine against looping over Board-backed simulations.
+
+Run with: python -m benchmarks.bench_batch
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from core.batch import BatchEngine
+from core.simulation import Simulation, random_actions
+
+
+def bench_loop(count, steps, seed=0):
+    """Return board-steps per second when stepping one Simulation per game"""
+    rng = random.Random(seed)
+    simulations = [Simulation(seed=seed + i) for i in range(count)]
+    # Pre-draw inputs like bench_batch so the timing only covers the simulations
+    inputs = [[random_actions(rng) for _ in range(count)] for _ in range(steps)]
+    start = time.perf_counter()
+    for actions in inputs:
+        for i, simulation in enumerate(simulations):
+            if simulation.game_over:
+                simulations[i] = simulation = Simulation(seed=rng.random())
+            simulation.tick(actions[i])
+    return count * steps / (time.perf_counter() - start)
+
+
+def bench_batch(count, steps, seed=0):
+    """Return board-steps per second when stepping all games in one BatchEngine"""
+    rng = random.Random(seed)
+    engine = BatchEngine(count, seed=seed)
+    # Pre-draw inputs so the timing only covers the engine
+    inputs = np.array([[random_actions(rng) for _ in range(count)] for _ in range(steps)], dtype=np.uint8)
+    start = time.perf_counter()
+    for actions in inputs:
+        engine.step(actions)
+        if engine.game_over.any():
+            engine.reset(engine.game_over)
+    return count * steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--steps', type=int, default=300)
+    parser.add_argument('--counts', type=int, nargs='+', default=[64, 1024, 8192])
+    args = parser.parse_args()
+
+    print(f"{'boards':>8} {'loop':>16} {'batch':>16} {'speedup':>8}")
+    for count in args.counts:
+        loop = bench_loop(count, args.steps)
+        batch = bench_batch(count, args.steps)
+        print(f"{count:>8} {loop:14,.0f}/s {batch:14,.0f}/s {batch / loop:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Micro-benchmark comparing move throughput of Board and BitBoard.
+
+Run with: python -m benchmarks.bench_board
+"""
+import argparse
+import random
+import time
+
+from core.board import Board
+from core.bitboard import BitBoard
+from core.piece import Tetromino
+
+
+def fill_stack(board, rows, seed=0):
+    """Fill the bottom rows of a board with random blocks, leaving one hole per row"""
+    rng = random.Random(seed)
+    for y in range(board.height - rows, board.height):
+        hole = rng.randrange(board.width)
+        for x in range(board.width):
+            if x != hole and rng.random() < 0.7:
+                board.grid[y][x] = 1
+        if hasattr(board, 'rows'):
+            board.rows[y] = sum(1 << x for x in range(board.width) if board.grid[y][x])
+    board.recompute_heights()
+
+
+def move_storm(board, iterations, seed=0):
+    """Slide, rotate and drop pieces over the stack; return the number of moves attempted"""
+    rng = random.Random(seed)
+    moves = 0
+    for _ in range(iterations):
+        board.current_piece = Tetromino(shape_idx=rng.randrange(len(Tetromino.SHAPES)))
+        board.current_piece.y = 0
+        for dx in (-1, 1):
+            while board.move_piece(dx=dx):
+                moves += 1
+            moves += 1
+        board.rotate_piece()
+        moves += 1
+        while board.move_piece(dy=1):
+            moves += 1
+        moves += 1
+    return moves
+
+
+def run(board_class, iterations, stack_rows):
+    board = board_class()
+    fill_stack(board, stack_rows)
+    start = time.perf_counter()
+    moves = move_storm(board, iterations)
+    elapsed = time.perf_counter() - start
+    return moves / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--stack-rows', type=int, default=8)
+    args = parser.parse_args()
+
+    results = {}
+    for board_class in (Board, BitBoard):
+        results[board_class.__name__] = run(board_class, args.iterations, args.stack_rows)
+        print(f"{board_class.__name__:>8}: {results[board_class.__name__]:12,.0f} moves/s")
+
+    print(f" speedup: {results['BitBoard'] / results['Board']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark of Board.clear_lines on tall and wide boards.
+
+Compares the current single-pass compaction against the previous
+row-by-row shifting implementation.
+
+Run with: python -m benchmarks.bench_clear_lines
+"""
+import argparse
+import random
+import time
+
+import services.config as config
+from core.board import Board
+from core.bitboard import BitBoard
+
+# (label, width, height)
+BOARD_SIZES = [
+    ('default', config.GRID_WIDTH, config.GRID_HEIGHT),
+    ('tall', 10, 200),
+    ('wide', 100, 20),
+    ('huge', 100, 200)
+]
+
+
+def shift_remove_rows(board, full_rows):
+    """Row removal as Board did before single-pass compaction, kept for comparison"""
+    for i in full_rows:
+        for j in range(i, 0, -1):
+            board.grid[j] = board.grid[j - 1][:]
+            board.colors[j] = board.colors[j - 1][:]
+        board.grid[0] = [0] * board.width
+        board.colors[0] = [config.BLACK] * board.width
+
+
+def prepare_stack(board, rng):
+    """Fill the bottom half of the board, with a Tetris (4 full rows) near the bottom"""
+    for y in range(board.height // 2, board.height):
+        full = board.height - 6 <= y < board.height - 2
+        for x in range(board.width):
+            if full or rng.random() < 0.6:
+                board.grid[y][x] = 1
+                board.colors[y][x] = config.CYAN
+        if not full:
+            board.grid[y][rng.randrange(board.width)] = 0
+    if hasattr(board, 'rows'):
+        board.rows[:] = [sum(1 << x for x, cell in enumerate(row) if cell) for row in board.grid]
+    board.recompute_heights()
+
+
+def time_clears(board_class, width, height, iterations, legacy=False):
+    """Return the average time in microseconds of one clear_lines call"""
+    rng = random.Random(0)
+    total = 0.0
+    for _ in range(iterations):
+        board = board_class(width=width, height=height)
+        prepare_stack(board, rng)
+        if legacy:
+            board._remove_rows = lambda rows, board=board: shift_remove_rows(board, rows)
+
+        start = time.perf_counter()
+        board.clear_lines()
+        total += time.perf_counter() - start
+
+    return total / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'board':>8} {'size':>8} {'shifting':>12} {'Board':>12} {'BitBoard':>12}")
+    for label, width, height in BOARD_SIZES:
+        legacy = time_clears(Board, width, height, args.iterations, legacy=True)
+        board = time_clears(Board, width, height, args.iterations)
+        bitboard = time_clears(BitBoard, width, height, args.iterations)
+        print(f"{label:>8} {f'{width}x{height}':>8} {legacy:10.1f}us {board:10.1f}us {bitboard:10.1f}us")
+
+
+if __name__ == '__main__':
+    main()
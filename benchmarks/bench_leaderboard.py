@@ -0,0 +1,67 @@
+"""Benchmark of the SQLite leaderboard with a large score history.
+
+Bulk-inserts a history of random scores over a year, then times the
+queries the game and the leaderboard screens use.
+
+Run with: python -m benchmarks.bench_leaderboard [--rows 1000000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from services.leaderboard import SQLiteLeaderboard
+
+DAY = 24 * 60 * 60
+
+
+def fill(leaderboard, rows, players, now, seed=0):
+    """Insert rows random scores spread over the last year, return the seconds taken"""
+    rng = random.Random(seed)
+    entries = ((f"Player{rng.randrange(players)}", rng.randrange(1000000), now - rng.random() * 365 * DAY,
+                rng.choice(('classic', 'sprint'))) for _ in range(rows))
+    start = time.perf_counter()
+    leaderboard.add_many(entries)
+    return time.perf_counter() - start
+
+
+def time_query(function, iterations):
+    """Return the average time in microseconds of one call"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        function(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    now = time.time()
+    with tempfile.TemporaryDirectory() as directory:
+        leaderboard = SQLiteLeaderboard(os.path.join(directory, 'scores.db'), migrate_from='')
+        elapsed = fill(leaderboard, args.rows, args.players, now)
+        print(f"inserted {args.rows:,} rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+        rng = random.Random(1)
+        queries = [
+            ('top 10', lambda i: leaderboard.top(10)),
+            ('daily top 10', lambda i: leaderboard.daily(10, now=now)),
+            ('weekly top 10', lambda i: leaderboard.weekly(10, now=now)),
+            ('personal best', lambda i: leaderboard.personal_best(f"Player{i % args.players}")),
+            ('is_high_score', lambda i: leaderboard.is_high_score(rng.randrange(1000000))),
+            ('get_rank (top 10)', lambda i: leaderboard.get_rank(rng.randrange(1000000))),
+            ('rank (all scores)', lambda i: leaderboard.rank(rng.randrange(1000000))),
+            ('save_score', lambda i: leaderboard.save_score(rng.randrange(1000000), "Bench"))
+        ]
+        for label, function in queries:
+            print(f"{label:>18} {time_query(function, args.iterations):10.1f}us")
+        leaderboard.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of full-screen against dirty-rect rendering of the game screen.
+
+Every mode replays the same seeded game with random inputs; the time covers
+drawing and presenting each frame. --stack pre-fills rows of every new board
+to show how the cost depends on how full the board is. Runs headless with SDL's dummy video driver
+unless SDL_VIDEODRIVER is already set.
+
+Run with: python -m benchmarks.bench_render
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import services.config as config
+from core.simulation import Simulation, random_actions
+from ui.renderer import Renderer
+
+
+def new_simulation(seed, stack):
+    """Return a simulation whose bottom rows are filled except for one column"""
+    simulation = Simulation(seed=seed, tick_rate=config.FPS)
+    board = simulation.board
+    for y in range(board.height - stack, board.height):
+        for x in range(board.width):
+            if x != y % board.width:
+                board.grid[y][x] = 1
+                board.colors[y][x] = config.SHAPE_COLORS[(x + y) % len(config.SHAPE_COLORS)]
+    board.recompute_heights()
+    return simulation
+
+
+def bench_mode(screen, dirty_rects, indexed_grid, frames, stack=0, seed=0):
+    """Return the mean milliseconds per rendered frame"""
+    config.INDEXED_GRID_RENDERING = indexed_grid
+    rng = random.Random(seed)
+    simulation = new_simulation(seed, stack)
+    renderer = Renderer(screen, dirty_rects=dirty_rects)
+    elapsed = 0.0
+    for _ in range(frames):
+        if simulation.game_over:
+            simulation = new_simulation(rng.random(), stack)
+        simulation.tick(random_actions(rng))
+
+        start = time.perf_counter()
+        renderer.render_game(simulation.board)
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--stack', type=int, default=0, help="Rows to pre-fill on every board")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+
+    modes = (
+        ('full, rects', False, False),
+        ('full, indexed', False, True),
+        ('dirty, indexed', True, True)
+    )
+    baseline = None
+    for name, dirty_rects, indexed_grid in modes:
+        ms = bench_mode(screen, dirty_rects, indexed_grid, args.frames, args.stack)
+        baseline = baseline or ms
+        print(f"{name:>16} {ms:8.3f} ms/frame ({baseline / ms:.1f}x)")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
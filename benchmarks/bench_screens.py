@@ -0,0 +1,65 @@
+"""Frame times of each screen with and without the cached static layers.
+
+Runs headless with SDL's dummy video driver unless SDL_VIDEODRIVER is
+already set.
+
+Run with: python -m benchmarks.bench_screens
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import services.config as config
+from core.simulation import Simulation
+from ui.renderer import Renderer
+from ui.text import text_cache
+from ui.widgets import Menu
+
+
+def bench_screen(draw, frames):
+    """Return the mean milliseconds per frame of a draw function"""
+    draw()  # Warm up caches
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=1000)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    text_cache.preload()
+
+    board = Simulation(seed=0).board
+    main_menu = Menu(["Start Game", "High Scores", "Quit"], None)
+    pause_menu = Menu(["Resume", "Restart", "Main Menu"], None)
+
+    screens = (
+        ('title', lambda renderer: renderer.render_title_screen()),
+        ('main menu', lambda renderer: renderer.render_main_menu(main_menu)),
+        ('game', lambda renderer: renderer.render_game(board)),
+        ('pause', lambda renderer: renderer.render_pause_menu(pause_menu))
+    )
+
+    print(f"{'screen':>10} {'uncached':>12} {'cached':>12} {'speedup':>8}")
+    for name, draw in screens:
+        times = []
+        for cached in (False, True):
+            config.CACHE_STATIC_LAYERS = cached
+            renderer = Renderer(screen, dirty_rects=False)
+            times.append(bench_screen(lambda: draw(renderer), args.frames))
+        print(f"{name:>10} {times[0]:9.3f} ms {times[1]:9.3f} ms {times[0] / times[1]:7.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
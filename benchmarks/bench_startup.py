@@ -0,0 +1,42 @@
+"""Benchmark of cold start: time from launching the game to its first frame.
+
+Starts main.py headless several times with --startup-report and reports
+the time to the first frame it prints.
+
+Run with: python -m benchmarks.bench_startup [--runs 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+import services.config as config
+
+
+def first_frame_ms(env):
+    """Launch the game once and return its time to first frame in milliseconds"""
+    output = subprocess.run(
+        [sys.executable, os.path.join(config.BASE_DIR, 'main.py'), '--startup-report', '--frames', '1'],
+        cwd=config.BASE_DIR, env=env, capture_output=True, text=True, check=True).stdout
+    match = re.search(r"First frame after (\d+) ms", output)
+    if not match:
+        raise RuntimeError(f"No startup report in output:\n{output}")
+    return int(match.group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    first_frame_ms(env)  # Warm the disk cache and bytecode
+    times = [first_frame_ms(env) for _ in range(args.runs)]
+    print(f"first frame: median {statistics.median(times):.0f} ms, best {min(times)} ms, "
+          f"worst {max(times)} ms over {args.runs} runs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""Benchmark suite of the hot paths, with JSON baselines and regression checks.
+
+Every scenario is seeded, so runs are repeatable; each one is run a few times
+and the best ops/sec is kept to reduce noise. Renderer scenarios use SDL's
+dummy video driver, so the whole suite runs headless.
+
+Run the suite:            python -m benchmarks.suite
+Save a baseline:          python -m benchmarks.suite --save benchmarks/baseline.json
+Check for regressions:    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import services.config as config
+from core.board import Board
+from core.bitboard import BitBoard
+from core.rules import calculate_score, calculate_level
+from core.simulation import Simulation, random_actions
+from benchmarks.bench_board import fill_stack, move_storm
+from benchmarks.bench_clear_lines import prepare_stack
+
+# Scenario name -> function(scale) returning (operations, seconds)
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register a benchmark scenario"""
+    def register(function):
+        SCENARIOS[name] = function
+        return function
+    return register
+
+
+@scenario('board.move_storm')
+def board_move_storm(scale):
+    board = Board(rng=random.Random(0))
+    fill_stack(board, 8)
+    start = time.perf_counter()
+    moves = move_storm(board, int(2000 * scale))
+    return moves, time.perf_counter() - start
+
+
+@scenario('bitboard.move_storm')
+def bitboard_move_storm(scale):
+    board = BitBoard(rng=random.Random(0))
+    fill_stack(board, 8)
+    start = time.perf_counter()
+    moves = move_storm(board, int(2000 * scale))
+    return moves, time.perf_counter() - start
+
+
+@scenario('board.is_valid_position')
+def board_is_valid_position(scale):
+    board = Board(rng=random.Random(0))
+    fill_stack(board, 8)
+    rng = random.Random(0)
+    offsets = [(rng.randint(-5, 5), rng.randint(0, 15)) for _ in range(int(50000 * scale))]
+    start = time.perf_counter()
+    for dx, dy in offsets:
+        board.is_valid_position(x_offset=dx, y_offset=dy)
+    return len(offsets), time.perf_counter() - start
+
+
+@scenario('board.clear_lines')
+def board_clear_lines(scale):
+    rng = random.Random(0)
+    boards = []
+    for _ in range(int(2000 * scale)):
+        board = Board(rng=random.Random(0))
+        prepare_stack(board, rng)
+        boards.append(board)
+    start = time.perf_counter()
+    for board in boards:
+        board.clear_lines()
+    return len(boards), time.perf_counter() - start
+
+
+@scenario('board.hard_drop')
+def board_hard_drop(scale):
+    rng = random.Random(0)
+    board = Board(rng=random.Random(0))
+    drops = int(5000 * scale)
+    done = 0
+    elapsed = 0.0
+    while done < drops:
+        piece = board.current_piece
+        piece.rotate(rng.randrange(4))
+        piece.x = rng.randrange(0, board.width - len(piece.shape[0]) + 1)
+        if board.game_over or not board.is_valid_position():
+            # Stack reached the spawn area, start a new board outside the timing
+            board = Board(rng=random.Random(rng.random()))
+            continue
+        start = time.perf_counter()
+        board.hard_drop()
+        elapsed += time.perf_counter() - start
+        done += 1
+    return done, elapsed
+
+
+@scenario('rules.scoring')
+def rules_scoring(scale):
+    calls = int(200000 * scale)
+    start = time.perf_counter()
+    for i in range(calls):
+        calculate_score(i % 5, calculate_level(i % 300))
+    return calls, time.perf_counter() - start
+
+
+@scenario('simulation.games')
+def simulation_games(scale):
+    rng = random.Random(0)
+    simulation = Simulation(seed=0)
+    ticks = int(20000 * scale)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if simulation.game_over:
+            simulation = Simulation(seed=rng.random())
+        simulation.tick(random_actions(rng))
+    return ticks, time.perf_counter() - start
+
+
+def _render_frames(scale, dirty_rects):
+    import pygame
+    from ui.renderer import Renderer
+
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        renderer = Renderer(screen, dirty_rects=dirty_rects)
+        rng = random.Random(0)
+        simulation = Simulation(seed=0)
+        frames = int(1000 * scale)
+        start = time.perf_counter()
+        for _ in range(frames):
+            if simulation.game_over:
+                simulation = Simulation(seed=rng.random())
+            simulation.tick(random_actions(rng))
+            renderer.render_game(simulation.board)
+        return frames, time.perf_counter() - start
+    finally:
+        from ui.text import text_cache
+        text_cache.reset()
+        pygame.quit()
+
+
+@scenario('renderer.render_game')
+def renderer_render_game(scale):
+    return _render_frames(scale, dirty_rects=False)
+
+
+@scenario('renderer.render_game_dirty')
+def renderer_render_game_dirty(scale):
+    return _render_frames(scale, dirty_rects=True)
+
+
+def _high_score_file(directory, entries):
+    """Write a high score file with many entries and return its path"""
+    rng = random.Random(0)
+    path = os.path.join(directory, 'high_scores.json')
+    scores = sorted(({'score': rng.randrange(1000000), 'name': f"Player{i}", 'date': "2024-01-01"}
+                     for i in range(entries)), key=lambda entry: entry['score'], reverse=True)
+    with open(path, 'w') as f:
+        json.dump(scores, f)
+    return path
+
+
+def _high_score_manager(path, entries):
+    from services.highscores import HighScoreManager
+    return HighScoreManager(path, max_scores=entries)  # Keep the file large across saves
+
+
+@scenario('highscores.load')
+def highscores_load(scale):
+    """Cold loads of the file, as done once at startup"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = _high_score_file(directory, 10000)
+        loads = max(1, int(50 * scale))
+        start = time.perf_counter()
+        for _ in range(loads):
+            _high_score_manager(path, 10000)
+        return loads, time.perf_counter() - start
+
+
+@scenario('highscores.save')
+def highscores_save(scale):
+    """Saves including the time until the last one is on disk"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = _high_score_manager(_high_score_file(directory, 10000), 10000)
+        saves = max(1, int(20 * scale))
+        start = time.perf_counter()
+        for i in range(saves):
+            manager.save_score(i * 997 % 1000000, "Bench")
+        manager.close()
+        return saves, time.perf_counter() - start
+
+
+@scenario('highscores.rank')
+def highscores_rank(scale):
+    with tempfile.TemporaryDirectory() as directory:
+        manager = _high_score_manager(_high_score_file(directory, 10000), 10000)
+        rng = random.Random(0)
+        queries = int(100000 * scale)
+        start = time.perf_counter()
+        for _ in range(queries):
+            manager.get_rank(rng.randrange(1000000))
+        return queries, time.perf_counter() - start
+
+
+def run_suite(names=None, scale=1.0, repeat=3, report=None):
+    """Run scenarios and return {name: best ops/sec}"""
+    results = {}
+    for name, function in SCENARIOS.items():
+        if names and not any(part in name for part in names):
+            continue
+        try:
+            best = max(operations / seconds for operations, seconds in (function(scale) for _ in range(repeat)))
+        except ImportError as e:
+            if report:
+                report(name, None, f"skipped ({e})")
+            continue
+        results[name] = best
+        if report:
+            report(name, best, "")
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """Return [(name, baseline ops/sec, current ops/sec, ratio, regressed)] for scenarios in both"""
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous:
+            ratio = current / previous
+            rows.append((name, previous, current, ratio, ratio < 1 - threshold))
+    return rows
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def save_baseline(path, results, scale):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': scale,
+            'results': results
+        }, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', help="Only run scenarios whose name contains one of these")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplier of the work done by each scenario")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per scenario, the best is kept")
+    parser.add_argument('--save', metavar='PATH', help="Write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="Compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Slowdown fraction flagged as a regression (default 0.1 = 10%%)")
+    parser.add_argument('--list', action='store_true', help="List the scenarios and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(SCENARIOS))
+        return
+
+    def report(name, ops, note):
+        print(f"{name:<28} {ops:14,.0f} ops/s" if ops else f"{name:<28} {note}")
+
+    results = run_suite(args.scenarios, args.scale, args.repeat, report)
+
+    if args.save:
+        save_baseline(args.save, results, args.scale)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        rows = compare(results, load_baseline(args.compare), args.threshold)
+        print(f"\n{'scenario':<28} {'baseline':>14} {'current':>14} {'change':>8}")
+        for name, previous, current, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<28} {previous:14,.0f} {current:14,.0f} {ratio - 1:+7.1%}{flag}")
+
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""Vectorized engine that simulates many boards in lockstep with NumPy.
+
+All K boards live in a single (K, height, width) uint8 array (0 for an empty
+cell, shape index + 1 for a filled one) and every per-game value (piece,
+rotation, position, score, level, ...) is a length-K array. One call to
+step() applies the inputs, gravity, merges and line clears of every board at
+once, following the same tick order as core.simulation.Simulation.
+
+Requires numpy, which the game itself does not need.
+"""
+import numpy as np
+
+import services.config as config
+from core.rotation import ROTATIONS, KICKS, SPAWN_ROTATION
+from core.rules import calculate_score, calculate_level
+from core.simulation import Action, ROTATIONS as ROTATION_ACTIONS
+
+
+def _build_cell_table():
+    """CELLS[shape_idx, rotation] is a (4, 2) array of (row, col) offsets of the filled cells"""
+    cells = np.zeros((len(ROTATIONS), 4, 4, 2), dtype=np.int16)
+    for shape_idx, states in enumerate(ROTATIONS):
+        for rotation, shape in enumerate(states):
+            filled = [(i, j) for i, row in enumerate(shape) for j, cell in enumerate(row) if cell]
+            cells[shape_idx, rotation] = filled
+    return cells
+
+
+def _build_kick_table():
+    """KICK_DX/KICK_DY[shape_idx, from, to, k]; shorter kick lists repeat their last entry"""
+    length = max(len(kicks) for piece in KICKS for row in piece for kicks in row)
+    dx = np.zeros((len(KICKS), 4, 4, length), dtype=np.int16)
+    dy = np.zeros_like(dx)
+    for shape_idx, piece in enumerate(KICKS):
+        for src, row in enumerate(piece):
+            for dst, kicks in enumerate(row):
+                if kicks:
+                    padded = list(kicks) + [kicks[-1]] * (length - len(kicks))
+                    dx[shape_idx, src, dst] = [kick[0] for kick in padded]
+                    dy[shape_idx, src, dst] = [kick[1] for kick in padded]
+    return dx, dy
+
+
+CELLS = _build_cell_table()
+KICK_DX, KICK_DY = _build_kick_table()
+SHAPE_WIDTHS = np.array([len(states[SPAWN_ROTATION[i]][0]) for i, states in enumerate(ROTATIONS)], dtype=np.int16)
+SHAPE_HEIGHTS = np.array([len(states[SPAWN_ROTATION[i]]) for i, states in enumerate(ROTATIONS)], dtype=np.int16)
+SPAWN_ROTATIONS = np.array(SPAWN_ROTATION, dtype=np.int8)
+
+# Shared scoring rules, applied element-wise to the boards that cleared lines
+_score = np.frompyfunc(calculate_score, 2, 1)
+_level = np.frompyfunc(calculate_level, 1, 1)
+
+
+class BatchEngine:
+    def __init__(self, count, width=None, height=None, seed=None, tick_rate=None):
+        self.count = count
+        self.width = width or config.GRID_WIDTH
+        self.height = height or config.GRID_HEIGHT
+        self.tick_rate = tick_rate or config.FPS
+        self.rng = np.random.default_rng(seed)
+
+        self.boards = np.zeros((count, self.height, self.width), dtype=np.uint8)
+        self.piece = np.zeros(count, dtype=np.int8)
+        self.next_piece = np.zeros(count, dtype=np.int8)
+        self.rotation = np.zeros(count, dtype=np.int8)
+        self.x = np.zeros(count, dtype=np.int16)
+        self.y = np.zeros(count, dtype=np.int16)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.lines_cleared = np.zeros(count, dtype=np.int32)
+        self.level = np.ones(count, dtype=np.int32)
+        self.fall_frames = np.zeros(count, dtype=np.int32)
+        self.pieces_placed = np.zeros(count, dtype=np.int32)
+        self.game_over = np.zeros(count, dtype=bool)
+        self.frame = 0
+
+        # Gravity interval in ticks for every level until the speed curve bottoms out
+        intervals = [max(1, round(config.get_drop_speed(level) * self.tick_rate)) for level in range(1, 101)]
+        self._gravity = np.array([intervals[0]] + intervals, dtype=np.int32)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Restart the boards selected by a boolean mask (all boards by default)"""
+        idx = np.arange(self.count) if mask is None else np.flatnonzero(mask)
+        self.boards[idx] = 0
+        self.score[idx] = 0
+        self.lines_cleared[idx] = 0
+        self.level[idx] = 1
+        self.fall_frames[idx] = 0
+        self.pieces_placed[idx] = 0
+        self.game_over[idx] = False
+        self.next_piece[idx] = self.rng.integers(0, len(ROTATIONS), len(idx))
+        self._spawn(idx)
+
+    def _spawn(self, idx):
+        """Promote the next piece of the given boards and draw a new next piece"""
+        self.piece[idx] = self.next_piece[idx]
+        self.next_piece[idx] = self.rng.integers(0, len(ROTATIONS), len(idx))
+        self.rotation[idx] = SPAWN_ROTATIONS[self.piece[idx]]
+        self.x[idx] = self.width // 2 - SHAPE_WIDTHS[self.piece[idx]] // 2
+        self.y[idx] = -SHAPE_HEIGHTS[self.piece[idx]]
+
+        # Like Board.spawn_new_piece, a new piece overlapping the stack ends the game right away
+        self.game_over[idx[~self._fits(idx)]] = True
+
+    def _cells(self, idx, rotation=None, dx=0, dy=0):
+        """Return (rows, cols) arrays of shape (n, 4) for the pieces of the given boards"""
+        rotation = self.rotation[idx] if rotation is None else rotation
+        cells = CELLS[self.piece[idx], rotation]
+        rows = cells[:, :, 0] + (self.y[idx] + dy)[:, None]
+        cols = cells[:, :, 1] + (self.x[idx] + dx)[:, None]
+        return rows, cols
+
+    def _fits(self, idx, rotation=None, dx=0, dy=0):
+        """Vectorized Board.is_valid_position for the given boards"""
+        rows, cols = self._cells(idx, rotation, dx, dy)
+        inside = (cols >= 0) & (cols < self.width) & (rows < self.height)
+        occupied = self.boards[idx[:, None], np.clip(rows, 0, self.height - 1), np.clip(cols, 0, self.width - 1)]
+        free = inside & ((rows < 0) | (occupied == 0))
+        return free.all(axis=1)
+
+    def _rotate(self, idx, direction):
+        """Rotate pieces with SRS kicks, trying every kick of every board in parallel"""
+        new_rotation = (self.rotation[idx] + direction) % 4
+        piece = self.piece[idx]
+        pending = np.ones(len(idx), dtype=bool)
+        for k in range(KICK_DX.shape[3]):
+            dx = KICK_DX[piece, self.rotation[idx], new_rotation, k]
+            dy = KICK_DY[piece, self.rotation[idx], new_rotation, k]
+            fits = pending & self._fits(idx, new_rotation, dx, dy)
+            hit = idx[fits]
+            self.x[hit] += dx[fits]
+            self.y[hit] += dy[fits]
+            self.rotation[hit] = new_rotation[fits]
+            pending &= ~fits
+            if not pending.any():
+                break
+
+    def _lock(self, idx):
+        """Merge the pieces of the given boards, clear lines and spawn the next pieces"""
+        if not len(idx):
+            return
+
+        rows, cols = self._cells(idx)
+        inside = rows >= 0
+        board_idx = np.broadcast_to(idx[:, None], rows.shape)
+        self.boards[board_idx[inside], rows[inside], cols[inside]] = (self.piece[idx] + 1).repeat(4)[inside.ravel()]
+        self.pieces_placed[idx] += 1
+
+        # If part of the piece was above the grid, it's game over
+        self.game_over[idx[~inside.all(axis=1)]] = True
+
+        self._clear_lines(idx)
+        self._spawn(idx)
+        self.fall_frames[idx] = 0
+
+    def _clear_lines(self, idx):
+        """Remove full rows of the given boards and update score, lines and level"""
+        full = (self.boards[idx] != 0).all(axis=2)
+        cleared = full.sum(axis=1)
+        hit = cleared > 0
+        if not hit.any():
+            return
+
+        idx, full, cleared = idx[hit], full[hit], cleared[hit]
+
+        # Stable sort puts the full rows first and keeps the others in order, then blank the top rows
+        order = np.argsort(~full, axis=1, kind='stable')
+        compacted = np.take_along_axis(self.boards[idx], order[:, :, None], axis=1)
+        compacted[np.arange(self.height)[None, :] < cleared[:, None]] = 0
+        self.boards[idx] = compacted
+
+        self.score[idx] += _score(cleared, self.level[idx]).astype(np.int64)
+        self.lines_cleared[idx] += cleared
+        self.level[idx] = np.maximum(self.level[idx], _level(self.lines_cleared[idx]).astype(np.int32))
+
+    def step(self, actions):
+        """Advance every running board by one tick.
+
+        actions is a length-K array of core.simulation.Action flag values.
+        """
+        actions = np.asarray(actions)
+        self.frame += 1
+
+        active = ~self.game_over
+        idx = np.flatnonzero(active)
+
+        # A piece that no longer fits means the stack reached the spawn area
+        stuck = ~self._fits(idx)
+        self.game_over[idx[stuck]] = True
+        idx = idx[~stuck]
+
+        for action, direction in ROTATION_ACTIONS:
+            self._rotate(idx[(actions[idx] & action) != 0], direction)
+
+        for action, dx in ((Action.MOVE_LEFT, -1), (Action.MOVE_RIGHT, 1)):
+            moving = idx[(actions[idx] & action) != 0]
+            self.x[moving[self._fits(moving, dx=dx)]] += dx
+
+        # Hard drop: step every dropping piece down until none can move
+        dropping = idx[(actions[idx] & Action.HARD_DROP) != 0]
+        falling = dropping
+        while len(falling):
+            falling = falling[self._fits(falling, dy=1)]
+            self.y[falling] += 1
+            self.score[falling] += 2
+        self._lock(dropping)
+        idx = idx[(actions[idx] & Action.HARD_DROP) == 0]
+
+        # Soft drop: move down or lock
+        soft = (actions[idx] & Action.SOFT_DROP) != 0
+        dropping = idx[soft]
+        fits = self._fits(dropping, dy=1)
+        self.y[dropping[fits]] += 1
+        self._lock(dropping[~fits])
+        idx = np.concatenate((idx[~soft], dropping[fits]))
+
+        # Handle automatic falling
+        self.fall_frames[idx] += 1
+        due = idx[self.fall_frames[idx] >= self._gravity[np.minimum(self.level[idx], len(self._gravity) - 1)]]
+        fits = self._fits(due, dy=1)
+        self.y[due[fits]] += 1
+        self._lock(due[~fits])
+        self.fall_frames[due] = 0
@@ -0,0 +1,85 @@
+import services.config as config
+from core.board import Board
+from core.rotation import ROTATION_MASKS
+
+
+def piece_masks(piece):
+    """Return (row_masks, left, right) for a piece, bit j of a mask being column j of its shape"""
+    return ROTATION_MASKS[piece.shape_idx][piece.rotation]
+
+
+class BitBoard(Board):
+    """Board that keeps each row as an integer bitmask.
+
+    Collision, merge and full-row detection become a few AND/OR/compare
+    operations per piece row instead of a scan over every cell. `grid` and
+    `colors` are still maintained so the renderer can draw the board, but
+    `rows` is the source of truth for game logic.
+    """
+
+    def __init__(self, width=None, height=None, rng=None, generator=None):
+        # The rows must exist before Board.__init__ spawns the first piece
+        self.rows = [0] * (height or config.GRID_HEIGHT)
+        self.full_row = (1 << (width or config.GRID_WIDTH)) - 1
+        super().__init__(width, height, rng, generator)
+
+    def is_valid_position(self, piece=None, x_offset=0, y_offset=0):
+        """Check if the piece can be placed at the given position"""
+        piece = piece or self.current_piece
+        row_masks, left, right = piece_masks(piece)
+
+        x = piece.x + x_offset
+        y = piece.y + y_offset
+
+        # Out of bounds horizontally or at the bottom
+        if x + left < 0 or x + right >= self.width or y + len(row_masks) > self.height:
+            return False
+
+        # Collision with existing pieces (rows above the grid are always free)
+        rows = self.rows
+        for i, mask in enumerate(row_masks):
+            if y + i >= 0 and rows[y + i] & (mask << x if x >= 0 else mask >> -x):
+                return False
+
+        return True
+
+    def _overlaps_stack(self, piece):
+        """Check if any in-grid cell of the piece overlaps an existing block"""
+        row_masks = piece_masks(piece)[0]
+        for i, mask in enumerate(row_masks):
+            y = piece.y + i
+            if 0 <= y < self.height:
+                shifted = mask << piece.x if piece.x >= 0 else mask >> -piece.x
+                if self.rows[y] & shifted:
+                    return True
+        return False
+
+    def _place_cells(self, piece):
+        """Write the cells of a piece into the grid and the row masks"""
+        super()._place_cells(piece)
+
+        row_masks = piece_masks(piece)[0]
+        for i, mask in enumerate(row_masks):
+            y = piece.y + i
+            if 0 <= y < self.height:
+                shifted = mask << piece.x if piece.x >= 0 else mask >> -piece.x
+                self.rows[y] |= shifted & self.full_row
+
+    def _find_full_rows(self):
+        """Return the indices of all completed rows, top to bottom"""
+        full_row = self.full_row
+        return [i for i, row in enumerate(self.rows) if row == full_row]
+
+    def _remove_rows(self, full_rows):
+        """Remove the given rows and shift everything above them down"""
+        super()._remove_rows(full_rows)
+
+        full_row = self.full_row
+        self.rows[:] = [0] * len(full_rows) + [row for row in self.rows if row != full_row]
+
+    def add_garbage(self, count, hole):
+        """Push the stack up by count rows of garbage, full except the hole column"""
+        count = min(count, self.height)
+        if count > 0:
+            self.rows[:] = self.rows[count:] + [self.full_row & ~(1 << hole)] * count
+        return super().add_garbage(count, hole)
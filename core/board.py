@@ -1,45 +1,87 @@
+import random
 import services.config as config
 from core.piece import Tetromino
-from core.rules import calculate_score
+from core.randomizer import PieceQueue, create_generator
+from core.rotation import ROTATIONS, KICKS, BOTTOMS, CLOCKWISE
+from core.rules import calculate_score, calculate_level
+
+
+def surface_drop_distance(heights, height, bottoms, x, y):
+    """Rows a piece with the given bottom profile falls from (x, y) onto the column heights.
+
+    Returns None if the piece is under an overhang, where only stepping down
+    gives the right answer.
+    """
+    distance = height - y  # More than any real drop, the piece may start above the grid
+    for j, bottom in enumerate(bottoms):
+        surface = height - heights[x + j]  # Row of the column's top block
+        gap = surface - (y + bottom) - 1
+        if gap < 0:
+            return None
+        distance = min(distance, gap)
+    return distance
 
 
 class Board:
-    def __init__(self, sounds=None):
-        self.width = config.GRID_WIDTH
-        self.height = config.GRID_HEIGHT
+    def __init__(self, width=None, height=None, rng=None, generator=None):
+        self.width = width or config.GRID_WIDTH
+        self.height = height or config.GRID_HEIGHT
         self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
         self.colors = [[config.BLACK for _ in range(self.width)] for _ in range(self.height)]
+        self.last_cleared_rows = []  # Row indices removed by the last clear_lines call
+        self.last_locked_rows = range(0)  # Rows spanned by the last merged piece, before its line clear
+        self.heights = [0] * self.width  # Height of the highest block of every column
+        self.filled_cells = 0  # Number of blocks in the grid
         self.current_piece = None
         self.next_piece = None
         self.score = 0
         self.lines_cleared = 0
         self.level = 1
+        self.pieces_placed = 0
         self.game_over = False
-        self.sounds = sounds or {}
+        self.events = []  # Sound events ('line_clear', 'tetris', 'level_up') of the last merge_piece call
+        self.rng = rng or random  # Source of piece shapes, seed it for reproducible games
+        # Shapes after next_piece, drawn ahead from the generator (config.PIECE_GENERATOR by default)
+        self.queue = PieceQueue(generator or create_generator(rng=self.rng), config.PREVIEW_PIECES - 1)
         self.spawn_new_piece()
 
     def spawn_new_piece(self):
         """Spawns a new piece and checks for game over"""
+        locked_piece = self.current_piece
         if self.next_piece:
             self.current_piece = self.next_piece
         else:
-            self.current_piece = Tetromino()
+            self.current_piece = Tetromino(self.queue.pop())
 
-        self.next_piece = Tetromino()
+        # Center the piece on this board, which may be wider or narrower than the default grid
+        self.current_piece.x = self.width // 2 - len(self.current_piece.shape[0]) // 2
+
+        # The piece that just locked becomes the new preview instead of allocating another
+        if locked_piece is None or locked_piece is self.current_piece:
+            self.next_piece = Tetromino(self.queue.pop())
+        else:
+            self.next_piece = locked_piece.reset(self.queue.pop())
 
         # Check if any part of the new piece overlaps with existing blocks
-        for i, row in enumerate(self.current_piece.shape):
+        if self._overlaps_stack(self.current_piece):
+            self.game_over = True
+            return False
+
+        return True
+
+    def _overlaps_stack(self, piece):
+        """Check if any in-grid cell of the piece overlaps an existing block"""
+        for i, row in enumerate(piece.shape):
             for j, cell in enumerate(row):
                 if cell:
-                    x = self.current_piece.x + j
-                    y = self.current_piece.y + i
+                    x = piece.x + j
+                    y = piece.y + i
 
                     # If the cell is within the grid and overlaps with an existing block
                     if 0 <= y < self.height and 0 <= x < self.width and self.grid[y][x]:
-                        self.game_over = True
-                        return False
+                        return True
 
-        return True
+        return False
 
     def is_valid_position(self, piece=None, x_offset=0, y_offset=0):
         """Check if the piece can be placed at the given position"""
@@ -61,22 +103,24 @@ class Board:
 
         return True
 
+    def preview(self, count=1):
+        """Return the shapes of the next count pieces, starting with next_piece"""
+        return [self.next_piece.shape_idx] + self.queue.peek(count - 1)
+
     def merge_piece(self):
         """Merge the current piece with the board"""
         if not self.current_piece:
             return False
+        self.events = []
 
         # Check if any part of the piece is above the grid
         piece_partly_above_grid = any(self.current_piece.y + i < 0 for i in range(len(self.current_piece.shape)))
 
         # Merge piece with the board
-        for i, row in enumerate(self.current_piece.shape):
-            for j, cell in enumerate(row):
-                if cell:
-                    # Only merge cells that are within the grid
-                    if 0 <= self.current_piece.y + i < self.height and 0 <= self.current_piece.x + j < self.width:
-                        self.grid[self.current_piece.y + i][self.current_piece.x + j] = 1
-                        self.colors[self.current_piece.y + i][self.current_piece.x + j] = self.current_piece.color
+        piece = self.current_piece
+        self.last_locked_rows = range(max(0, piece.y), min(self.height, piece.y + len(piece.shape)))
+        self._place_cells(piece)
+        self.pieces_placed += 1
 
         # Clear lines and update scores
         lines_cleared = self.clear_lines()
@@ -92,57 +136,135 @@ class Board:
 
         return not self.game_over
 
+    @property
+    def holes(self):
+        """Number of empty cells below the top block of their column"""
+        # Every cell under a column's top block is either filled or a hole
+        return sum(self.heights) - self.filled_cells
+
+    def recompute_heights(self):
+        """Rebuild the column heights and block count from the grid, e.g. after editing it directly"""
+        self.filled_cells = sum(map(sum, self.grid))
+        for x in range(self.width):
+            self.heights[x] = next((self.height - y for y in range(self.height) if self.grid[y][x]), 0)
+
+    def _place_cells(self, piece):
+        """Write the cells of a piece into the grid and update the column heights"""
+        for i, row in enumerate(piece.shape):
+            for j, cell in enumerate(row):
+                if cell:
+                    # Only merge cells that are within the grid
+                    if 0 <= piece.y + i < self.height and 0 <= piece.x + j < self.width:
+                        self.grid[piece.y + i][piece.x + j] = 1
+                        self.colors[piece.y + i][piece.x + j] = piece.color
+                        self.filled_cells += 1
+                        self.heights[piece.x + j] = max(self.heights[piece.x + j], self.height - piece.y - i)
+
+    def _find_full_rows(self):
+        """Return the indices of all completed rows, top to bottom"""
+        return [i for i in range(self.height) if all(self.grid[i])]
+
+    def _remove_rows(self, full_rows):
+        """Remove the given rows and shift everything above them down.
+
+        The stack is compacted in a single pass: the surviving rows are moved
+        down by reference and the removed row lists are emptied and reused as
+        the new top rows, so no row is copied or reallocated.
+        """
+        cleared = set(full_rows)
+        empty_grid_row = [0] * self.width
+        empty_color_row = [config.BLACK] * self.width
+
+        recycled_grid = [self.grid[i] for i in full_rows]
+        recycled_colors = [self.colors[i] for i in full_rows]
+        for grid_row, color_row in zip(recycled_grid, recycled_colors):
+            grid_row[:] = empty_grid_row
+            color_row[:] = empty_color_row
+
+        # Assign in place so references to grid and colors stay valid
+        self.grid[:] = recycled_grid + [row for i, row in enumerate(self.grid) if i not in cleared]
+        self.colors[:] = recycled_colors + [row for i, row in enumerate(self.colors) if i not in cleared]
+
+        # Full rows span every column, so each column loses exactly that many blocks
+        # and its top block drops by that many rows unless the top block itself was cleared
+        self.filled_cells = max(0, self.filled_cells - len(full_rows) * self.width)
+        for x in range(self.width):
+            height = max(0, self.heights[x] - len(full_rows))
+            while height > 0 and not self.grid[self.height - height][x]:
+                height -= 1
+            self.heights[x] = height
+
     def clear_lines(self):
-        """Clear completed lines and return the number of lines cleared"""
-        lines_cleared = 0
-
-        for i in range(self.height):
-            if all(self.grid[i]):
-                lines_cleared += 1
-                # Move all lines above down
-                for j in range(i, 0, -1):
-                    self.grid[j] = self.grid[j - 1][:]
-                    self.colors[j] = self.colors[j - 1][:]
-                # Clear the top line
-                self.grid[0] = [0] * self.width
-                self.colors[0] = [config.BLACK] * self.width
-
-        # Update score based on lines cleared
+        """Clear completed lines and return the number of lines cleared.
+
+        The indices of the removed rows (before compaction, top to bottom) are
+        kept in last_cleared_rows for the renderer and animations.
+        """
+        full_rows = self._find_full_rows()
+        if full_rows:
+            self._remove_rows(full_rows)
+
+        self.last_cleared_rows = full_rows
+
+        self._score_lines(len(full_rows))
+        return len(full_rows)
+
+    def _score_lines(self, lines_cleared):
+        """Update score, line count and level after a line clear"""
         if lines_cleared > 0:
-            if lines_cleared == 1:
-                self.score += 100 * self.level
-                if 'line_clear' in self.sounds:
-                    self.sounds['line_clear'].play()
-            elif lines_cleared == 2:
-                self.score += 300 * self.level
-                if 'line_clear' in self.sounds:
-                    self.sounds['line_clear'].play()
-            elif lines_cleared == 3:
-                self.score += 500 * self.level
-                if 'line_clear' in self.sounds:
-                    self.sounds['line_clear'].play()
-            elif lines_cleared == 4:
-                self.score += 800 * self.level
-                if 'tetris' in self.sounds:
-                    self.sounds['tetris'].play()
+            # Scoring and level curve come from core.rules
+            self.score += calculate_score(lines_cleared, self.level)
+
+            self.events.append('tetris' if lines_cleared == 4 else 'line_clear')
 
             # Update lines cleared count
             self.lines_cleared += lines_cleared
 
             # Calculate new level
-            new_level = (self.lines_cleared // 10) + 1
+            new_level = calculate_level(self.lines_cleared)
 
             # Check if level has increased
             if new_level > self.level:
                 # Level up!
-                old_level = self.level
                 self.level = new_level
 
-                # Play level up sound
-                if 'level_up' in self.sounds:
-                    self.sounds['level_up'].play()
+                self.events.append('level_up')
 
-        return lines_cleared
+    def add_garbage(self, count, hole):
+        """Push the stack up by count rows of garbage, full except the hole column.
+
+        Used by versus play when the opponent clears lines. The top rows
+        are recycled as the garbage rows like in _remove_rows. Returns False
+        and ends the game if blocks were pushed out of the top.
+        """
+        count = min(count, self.height)
+        if count <= 0:
+            return True
+        topped_out = any(any(row) for row in self.grid[:count])
+
+        recycled_grid = self.grid[:count]
+        recycled_colors = self.colors[:count]
+        for grid_row, color_row in zip(recycled_grid, recycled_colors):
+            grid_row[:] = [1] * self.width
+            color_row[:] = [config.GARBAGE_COLOR] * self.width
+            grid_row[hole] = 0
+            color_row[hole] = config.BLACK
+
+        # Assign in place so references to grid and colors stay valid
+        self.grid[:] = self.grid[count:] + recycled_grid
+        self.colors[:] = self.colors[count:] + recycled_colors
+
+        if topped_out:
+            self.recompute_heights()
+            self.game_over = True
+            return False
+
+        # Every column rises by count rows, the hole column only if it had blocks above the hole
+        self.filled_cells += count * (self.width - 1)
+        for x in range(self.width):
+            if self.heights[x] or x != hole:
+                self.heights[x] += count
+        return True
 
     def move_piece(self, dx=0, dy=0):
         """Move the current piece if valid"""
@@ -152,29 +274,55 @@ class Board:
             return True
         return False
 
-    def rotate_piece(self):
-        """Rotate the current piece if valid"""
-        original_shape = self.current_piece.shape
-        self.current_piece.rotate()
-
-        if not self.is_valid_position():
-            # Try wall kicks (adjust x position if rotation puts piece against wall)
-            for dx in [-1, 1, -2, 2]:
-                if self.is_valid_position(x_offset=dx):
-                    self.current_piece.x += dx
-                    return True
+    def rotate_piece(self, direction=CLOCKWISE):
+        """Rotate the current piece using the SRS kick table, return True if it rotated.
+
+        direction is the number of clockwise quarter turns (1, 2 or 3).
+        """
+        piece = self.current_piece
+        original_shape = piece.shape
+        original_rotation = piece.rotation
+        new_rotation = (original_rotation + direction) % 4
+
+        piece.rotation = new_rotation
+        piece.shape = ROTATIONS[piece.shape_idx][new_rotation]
+
+        # Try each kick in order; the first one is the plain rotation
+        for dx, dy in KICKS[piece.shape_idx][original_rotation][new_rotation]:
+            if self.is_valid_position(x_offset=dx, y_offset=dy):
+                piece.x += dx
+                piece.y += dy
+                return True
+
+        # Revert rotation if all wall kicks fail
+        piece.shape = original_shape
+        piece.rotation = original_rotation
+        return False
 
-            # Revert rotation if all wall kicks fail
-            self.current_piece.shape = original_shape
-            return False
+    def drop_distance(self, piece=None):
+        """Number of rows the piece can fall before it lands.
 
-        return True
+        Computed from the piece's bottom profile against the column heights;
+        only a piece tucked under an overhang needs to be stepped down.
+        """
+        piece = piece or self.current_piece
+        distance = surface_drop_distance(self.heights, self.height, BOTTOMS[piece.shape_idx][piece.rotation],
+                                         piece.x, piece.y)
+        if distance is None:
+            return self._step_drop_distance(piece)
+        return distance
+
+    def _step_drop_distance(self, piece):
+        """Drop distance found by moving the piece down one row at a time"""
+        distance = 0
+        while self.is_valid_position(piece, y_offset=distance + 1):
+            distance += 1
+        return distance
 
     def hard_drop(self):
         """Drop the piece to the lowest valid position"""
-        drop_distance = 0
-        while self.move_piece(dy=1):
-            drop_distance += 1
+        drop_distance = self.drop_distance()
+        self.current_piece.y += drop_distance
 
         # Give score for hard drop (2 points per cell dropped)
         self.score += drop_distance * 2
@@ -0,0 +1,138 @@
+"""Frame-rate independent auto-repeat (DAS/ARR) for held keys.
+
+The engine consumes timestamped press/release events and, once per logic
+tick, returns the actions of that tick along with how many times each
+repeating action fires. Repeats are computed from the press time, not from
+how often the game happens to poll, so the same inputs give the same moves
+at any frame rate:
+
+- MOVE_LEFT / MOVE_RIGHT move once on press, again after DAS and then every
+  ARR milliseconds; ARR = 0 slides the piece to the wall once DAS expires.
+  With both held, the last one pressed wins and the other resumes (after a
+  fresh DAS) when it is released.
+- SOFT_DROP moves once on press and then every soft_drop milliseconds, with
+  no DAS; soft_drop = 0 drops the piece to the stack.
+- Any other action fires once, on the tick its press falls in.
+
+Times are in milliseconds. Nothing here imports pygame.
+"""
+from collections import deque, namedtuple
+
+import services.config as config
+from core.simulation import Action
+
+# Auto-repeat timings in milliseconds
+InputSettings = namedtuple('InputSettings', 'das arr soft_drop')
+
+# Repeat count standing for "as far as the piece can go"
+INSTANT = 1000
+
+HORIZONTAL = (Action.MOVE_LEFT, Action.MOVE_RIGHT)
+REPEATING = HORIZONTAL + (Action.SOFT_DROP,)
+
+
+def settings_for(player_name=None):
+    """Return the input settings of a player, falling back to the defaults in config"""
+    settings = dict(config.INPUT_SETTINGS)
+    settings.update(config.PLAYER_INPUT_SETTINGS.get(player_name, {}))
+    return InputSettings(**settings)
+
+
+class _HeldKey:
+    """Repeat schedule of a held key"""
+
+    def __init__(self, start, delay, interval, initial=True):
+        self.start = start  # Time the schedule started (press or resume)
+        self.delay = delay  # Time from start to the first repeat
+        self.interval = interval  # Time between repeats, 0 for instant
+        self.initial = initial  # Fires once at start
+        self.fired = 0
+
+    def fires_until(self, time):
+        """Number of fires scheduled from the start up to and including the given time"""
+        fires = 1 if self.initial and time >= self.start else 0
+        repeat_time = time - self.start - self.delay
+        if repeat_time >= 0:
+            fires += INSTANT if self.interval == 0 else int(repeat_time // self.interval) + 1
+        return fires
+
+
+class InputEngine:
+    def __init__(self, settings=None):
+        self.settings = settings or settings_for()
+        self.events = deque()  # Pending (time, action, pressed), in time order
+        self.held = {}  # Repeating action -> _HeldKey
+        self.horizontal = []  # Held horizontal actions, most recent last
+
+    def press(self, action, time):
+        self.events.append((time, action, True))
+
+    def release(self, action, time):
+        self.events.append((time, action, False))
+
+    def reset(self):
+        """Forget held keys and pending events, e.g. when the game is paused"""
+        self.events.clear()
+        self.held.clear()
+        self.horizontal.clear()
+
+    def _schedule(self, action, start, initial=True):
+        if action == Action.SOFT_DROP:
+            # Soft drop repeats right away at its own rate
+            interval = self.settings.soft_drop
+            return _HeldKey(start, interval, interval, initial)
+        return _HeldKey(start, self.settings.das, self.settings.arr, initial)
+
+    def _active(self):
+        """Held repeating actions currently allowed to fire"""
+        for action, held in self.held.items():
+            if action in HORIZONTAL and action != self.horizontal[-1]:
+                continue  # Overridden by the other direction
+            yield action, held
+
+    def _advance(self, time, counts):
+        """Add the repeats of every active key up to the given time"""
+        for action, held in self._active():
+            fires = held.fires_until(time)
+            if held.interval == 0 and fires >= INSTANT:
+                # Instant repeat keeps pushing on every tick, e.g. for the next piece
+                counts[action] = INSTANT
+            elif fires > held.fired:
+                counts[action] = min(INSTANT, counts.get(action, 0) + fires - held.fired)
+            held.fired = fires
+
+    def tick(self, time):
+        """Return (actions, counts) for the logic tick ending at the given time.
+
+        counts maps each repeating action in actions to the number of times it
+        fires during the tick (INSTANT for as far as possible).
+        """
+        actions = Action.NONE
+        counts = {}
+
+        while self.events and self.events[0][0] <= time:
+            event_time, action, pressed = self.events.popleft()
+            self._advance(event_time, counts)
+
+            if action not in REPEATING:
+                if pressed:
+                    actions |= action
+            elif pressed and action not in self.held:
+                self.held[action] = self._schedule(action, event_time)
+                if action in HORIZONTAL:
+                    self.horizontal.append(action)
+                self._advance(event_time, counts)
+            elif not pressed and action in self.held:
+                del self.held[action]
+                if action in HORIZONTAL:
+                    was_active = self.horizontal[-1] == action
+                    self.horizontal.remove(action)
+                    if was_active and self.horizontal:
+                        # The other direction takes over after a fresh DAS
+                        self.held[self.horizontal[-1]] = self._schedule(self.horizontal[-1], event_time, False)
+
+        self._advance(time, counts)
+
+        for action in counts:
+            actions |= action
+        return actions, counts
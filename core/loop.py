@@ -0,0 +1,74 @@
+"""Fixed-timestep loop timing, independent of the render rate.
+
+Each rendered frame calls advance(), which returns how many logic ticks to run
+so the game logic keeps a constant rate however fast or slow frames are drawn:
+several ticks after a slow frame, none when frames come faster than ticks.
+Catching up is capped per frame so a long stall (window drag, breakpoint,
+slow disk) cannot trigger a spiral of ever longer frames; the ticks beyond
+the cap are dropped and counted.
+"""
+import time
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate=60, max_catch_up=5, clock=time.perf_counter):
+        self.tick_rate = tick_rate
+        self.step = 1.0 / tick_rate  # Seconds per logic tick
+        self.max_catch_up = max_catch_up  # Most ticks run in a single frame
+        self.clock = clock
+
+        self.accumulator = 0.0  # Elapsed time not yet consumed by ticks
+        self.last_time = None
+
+        # Counters
+        self.frames = 0
+        self.ticks = 0
+        self.dropped_ticks = 0  # Ticks skipped because catching up was capped
+        self.duplicated_frames = 0  # Frames rendered without any new tick
+        self.catch_up_frames = 0  # Frames that ran more than one tick
+
+    def reset(self):
+        """Restart timing from now, e.g. after loading, without catching up"""
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self, now=None):
+        """Return the number of logic ticks to run before rendering this frame"""
+        now = self.clock() if now is None else now
+        if self.last_time is None:
+            # First frame: run one tick and start timing from here
+            self.last_time = now
+            ticks = 1
+        else:
+            self.accumulator += now - self.last_time
+            self.last_time = now
+            # The epsilon keeps float rounding from losing a tick when frames land exactly on tick times
+            ticks = int(self.accumulator / self.step + 1e-9)
+            self.accumulator -= ticks * self.step
+
+            if ticks > self.max_catch_up:
+                self.dropped_ticks += ticks - self.max_catch_up
+                ticks = self.max_catch_up
+
+        self.frames += 1
+        self.ticks += ticks
+        if ticks == 0:
+            self.duplicated_frames += 1
+        elif ticks > 1:
+            self.catch_up_frames += 1
+        return ticks
+
+    @property
+    def alpha(self):
+        """Fraction of a tick elapsed since the last one, for interpolating between ticks"""
+        return max(self.accumulator, 0.0) / self.step
+
+    def stats(self):
+        """Return the loop counters"""
+        return {
+            'frames': self.frames,
+            'ticks': self.ticks,
+            'dropped_ticks': self.dropped_ticks,
+            'duplicated_frames': self.duplicated_frames,
+            'catch_up_frames': self.catch_up_frames
+        }
@@ -1,6 +1,6 @@
 import random
 import services.config as config
-from ui.theme import SHAPE_COLORS
+from core.rotation import ROTATIONS, OFFSETS, SPAWN_ROTATION, CLOCKWISE
 
 
 class Tetromino:
@@ -18,23 +18,33 @@ class Tetromino:
     # Names of shapes for reference
     SHAPE_NAMES = ["I", "O", "T", "L", "J", "S", "Z"]
 
-    def __init__(self, shape_idx=None):
+    def __init__(self, shape_idx=None, rng=random):
         """Initialize a new tetromino with random shape if not specified"""
         if shape_idx is None:
-            shape_idx = random.randint(0, len(self.SHAPES) - 1)
+            shape_idx = rng.randint(0, len(self.SHAPES) - 1)
+        self.reset(shape_idx)
 
+    def reset(self, shape_idx):
+        """Turn this piece into a freshly spawned one of the given shape, so it can be reused"""
         self.shape_idx = shape_idx
-        self.shape = [row[:] for row in self.SHAPES[shape_idx]]  # Deep copy
-        self.color = SHAPE_COLORS[shape_idx]
+        self.rotation = SPAWN_ROTATION[shape_idx]  # SRS rotation state
+        self.shape = ROTATIONS[shape_idx][self.rotation]  # Shared, never mutated
+        self.color = config.SHAPE_COLORS[shape_idx]
         self.x = config.GRID_WIDTH // 2 - len(self.shape[0]) // 2
         self.y = -len(self.shape)  # Start above visible grid
         self.name = self.SHAPE_NAMES[shape_idx]
+        return self
 
-    def rotate(self):
-        """Rotate the piece 90 degrees clockwise"""
-        # Special case for O piece (no rotation)
-        if self.shape_idx == 1:  # O piece
-            return
+    def rotate(self, direction=CLOCKWISE):
+        """Rotate the piece around its SRS center, without wall kicks.
 
-        # Transpose and reverse rows to rotate 90 degrees clockwise
-        self.shape = [list(row) for row in zip(*self.shape[::-1])]
\ No newline at end of file
+        direction is the number of clockwise quarter turns (1, 2 or 3).
+        """
+        new_rotation = (self.rotation + direction) % 4
+        offsets = OFFSETS[self.shape_idx]
+
+        # Keep the SRS bounding box in place while swapping the tight shape
+        self.x += offsets[new_rotation][0] - offsets[self.rotation][0]
+        self.y += offsets[new_rotation][1] - offsets[self.rotation][1]
+        self.rotation = new_rotation
+        self.shape = ROTATIONS[self.shape_idx][new_rotation]
\ No newline at end of file
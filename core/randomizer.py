@@ -0,0 +1,87 @@
+"""Piece generators and the preview queue.
+
+A generator turns a random source into an endless stream of shape indices
+(see Tetromino.SHAPES). All of its randomness comes from the rng it is
+given, so a seeded random.Random gives the same piece sequence on every run.
+"""
+import random
+import services.config as config
+
+PIECE_COUNT = 7
+
+
+class RandomGenerator:
+    """Every piece drawn independently, the original behaviour of the game"""
+
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def next(self):
+        return self.rng.randint(0, PIECE_COUNT - 1)
+
+
+class BagGenerator:
+    """7-bag: every group of seven pieces is a shuffled set of all seven shapes"""
+
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.bag = []
+
+    def next(self):
+        if not self.bag:
+            self.bag = list(range(PIECE_COUNT))
+            self.rng.shuffle(self.bag)
+        return self.bag.pop()
+
+
+class ClassicGenerator:
+    """NES-style: roll one of eight, and roll again once on a repeat or on the unused eighth value"""
+
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.last = None
+
+    def next(self):
+        shape = self.rng.randrange(PIECE_COUNT + 1)
+        if shape == PIECE_COUNT or shape == self.last:
+            shape = self.rng.randrange(PIECE_COUNT)
+        self.last = shape
+        return shape
+
+
+GENERATORS = {
+    'bag': BagGenerator,
+    'random': RandomGenerator,
+    'nes': ClassicGenerator
+}
+
+
+def create_generator(name=None, rng=random):
+    """Create the generator registered under name, config.PIECE_GENERATOR by default"""
+    return GENERATORS[name or config.PIECE_GENERATOR](rng)
+
+
+class PieceQueue:
+    """Fixed-size ring buffer of upcoming shapes, filled ahead from a generator.
+
+    Pieces come out in generator order whatever the size, so the preview
+    length never changes the sequence of a seeded game.
+    """
+
+    def __init__(self, generator, size=1):
+        self.generator = generator
+        self.buffer = [generator.next() for _ in range(max(1, size))]
+        self.head = 0
+
+    def pop(self):
+        """Return the next shape and refill its slot"""
+        shape = self.buffer[self.head]
+        self.buffer[self.head] = self.generator.next()
+        self.head = (self.head + 1) % len(self.buffer)
+        return shape
+
+    def peek(self, count=None):
+        """Return up to count upcoming shapes, nearest first"""
+        size = len(self.buffer)
+        count = size if count is None else min(count, size)
+        return [self.buffer[(self.head + i) % size] for i in range(count)]
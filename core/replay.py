@@ -0,0 +1,224 @@
+"""Compact binary replays of simulated games.
+
+A replay is everything needed to play a game again tick for tick: the seed
+of the piece sequence, the board size and tick rate, a fingerprint of the
+rules, and the inputs of every tick that had any. Inputs come from the
+simulation side of core.input (actions plus repeat counts), so playback does
+not depend on frame timing.
+
+File layout, integers as unsigned LEB128 varints unless noted:
+
+    b'TRPL' version(byte) seed(8 bytes, little endian) tick_rate width height fingerprint(8 bytes)
+    record*: tick_delta actions [count for each of MOVE_LEFT, MOVE_RIGHT, SOFT_DROP in actions]
+    trailer: tick_delta 0 score lines
+
+tick_delta is the number of ticks since the previous record (or the start),
+so idle stretches cost one or two bytes. The trailer (actions 0) marks a
+finished game and holds the final tick count, score and lines used to verify
+playback; replays of abandoned games have no trailer.
+
+Play a replay headless at full speed with: python -m core.replay FILE
+"""
+import argparse
+import glob
+import hashlib
+import io
+import os
+import struct
+import time
+from collections import namedtuple
+
+import services.config as config
+from core.rotation import KICKS, ROTATIONS
+from core.rules import calculate_score, calculate_level
+from core.simulation import Action, Simulation
+
+MAGIC = b'TRPL'
+VERSION = 1
+
+# Actions whose repeat count is stored after the action bits
+COUNTED = (Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.SOFT_DROP)
+
+# inputs maps tick -> (actions, counts); final is (ticks, score, lines) or None
+Replay = namedtuple('Replay', 'seed tick_rate width height fingerprint inputs final')
+
+
+class ReplayError(Exception):
+    """Raised for unreadable replays and replays that do not play back to the recorded result"""
+
+
+def config_fingerprint():
+    """Return 8 bytes identifying the rules a game was played with"""
+    rules = (
+        [config.get_drop_speed(level) for level in range(1, 31)],
+        [calculate_score(lines, 1) for lines in range(5)],
+        [calculate_level(lines) for lines in (0, 9, 10, 99, 100)],
+        ROTATIONS,
+        KICKS,
+        config.PIECE_GENERATOR
+    )
+    return hashlib.sha256(repr(rules).encode()).digest()[:8]
+
+
+def write_varint(stream, value):
+    """Write an unsigned integer as LEB128"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            break
+    stream.write(out)
+
+
+def read_varint(stream):
+    """Read an unsigned LEB128 integer, or None at the end of the stream"""
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise ReplayError("Truncated replay")
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+class ReplayWriter:
+    """Writes a replay incrementally through a buffered file"""
+
+    def __init__(self, path, seed, tick_rate, width, height, buffer_size=64 * 1024):
+        self.file = open(path, 'wb', buffering=buffer_size)
+        self.file.write(MAGIC + bytes([VERSION]) + struct.pack('<Q', seed))
+        for value in (tick_rate, width, height):
+            write_varint(self.file, value)
+        self.file.write(config_fingerprint())
+        self.last_tick = 0
+
+    def record(self, tick, actions, counts=None):
+        """Record the input of a tick; ticks must be given in increasing order"""
+        if not actions:
+            return
+        counts = counts or {}
+        write_varint(self.file, tick - self.last_tick)
+        write_varint(self.file, int(actions))
+        for action in COUNTED:
+            if actions & action:
+                write_varint(self.file, counts.get(action, 1))
+        self.last_tick = tick
+
+    def finish(self, ticks, score, lines):
+        """Write the final result and close the file"""
+        write_varint(self.file, ticks - self.last_tick)
+        write_varint(self.file, 0)
+        write_varint(self.file, score)
+        write_varint(self.file, lines)
+        self.close()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_replay(path):
+    """Read a replay file"""
+    with open(path, 'rb') as f:
+        stream = io.BytesIO(f.read())
+
+    header = stream.read(13)
+    if len(header) < 13 or header[:4] != MAGIC:
+        raise ReplayError(f"{path} is not a replay")
+    if header[4] != VERSION:
+        raise ReplayError(f"Unsupported replay version {header[4]}")
+    seed = struct.unpack('<Q', header[5:13])[0]
+    tick_rate, width, height = (read_varint(stream) for _ in range(3))
+    fingerprint = stream.read(8)
+
+    inputs = {}
+    final = None
+    tick = 0
+    while True:
+        delta = read_varint(stream)
+        if delta is None:
+            break
+        tick += delta
+        bits = read_varint(stream)
+        if bits is None:
+            raise ReplayError("Truncated replay")
+        if bits == 0:
+            final = (tick, read_varint(stream), read_varint(stream))
+            break
+        actions = Action(bits)
+        inputs[tick] = (actions, {action: read_varint(stream) for action in COUNTED if actions & action})
+
+    return Replay(seed, tick_rate, width, height, fingerprint, inputs, final)
+
+
+def prune_replays(directory, keep):
+    """Delete all but the newest keep replays of a directory, return the number deleted"""
+    # Oldest first by last write, the name (which starts with the recording time) breaks ties
+    paths = sorted(glob.glob(os.path.join(directory, 'replay_*.trpl')), key=lambda path: (os.path.getmtime(path), path))
+    stale = paths[:-keep or None]
+    for path in stale:
+        os.remove(path)
+    return len(stale)
+
+
+def replay_ticks(replay):
+    """Yield the (actions, counts) of every tick of a replay, in order"""
+    last = replay.final[0] if replay.final else max(replay.inputs, default=-1) + 1
+    for tick in range(last):
+        yield replay.inputs.get(tick, (Action.NONE, None))
+
+
+def new_simulation(replay, check_fingerprint=True):
+    """Return a fresh Simulation set up like the recorded game"""
+    if check_fingerprint and replay.fingerprint != config_fingerprint():
+        raise ReplayError("Replay was recorded with different rules")
+    return Simulation(seed=replay.seed, tick_rate=replay.tick_rate, width=replay.width, height=replay.height)
+
+
+def verify(replay, simulation):
+    """Raise ReplayError if a played-back game does not match the recorded result"""
+    if replay.final is None:
+        return
+    _, score, lines = replay.final
+    board = simulation.board
+    if (board.score, board.lines_cleared) != (score, lines):
+        raise ReplayError(f"Playback ended with score {board.score} and {board.lines_cleared} lines, "
+                          f"recorded {score} and {lines}")
+
+
+def play_headless(replay, check_fingerprint=True):
+    """Play a replay at full speed, verify the result and return the Simulation"""
+    simulation = new_simulation(replay, check_fingerprint)
+    for actions, counts in replay_ticks(replay):
+        simulation.tick(actions, counts)
+    verify(replay, simulation)
+    return simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a replay headless at full speed and verify it")
+    parser.add_argument('path')
+    parser.add_argument('--ignore-fingerprint', action='store_true', help="Play even if the rules changed")
+    args = parser.parse_args()
+
+    replay = read_replay(args.path)
+    start = time.perf_counter()
+    simulation = play_headless(replay, not args.ignore_fingerprint)
+    elapsed = time.perf_counter() - start
+
+    board = simulation.board
+    status = "verified" if replay.final else "unfinished game, nothing to verify"
+    print(f"{simulation.frame} ticks in {elapsed:.3f}s ({simulation.frame / max(elapsed, 1e-9):,.0f} ticks/s): "
+          f"score {board.score}, lines {board.lines_cleared} ({status})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Table-driven Super Rotation System (SRS).
+
+Every orientation of every piece is computed once at import. A piece keeps a
+tight shape (no empty rows or columns) plus its SRS rotation state, so rotating
+is an index change followed by a lookup in a precomputed kick list. The kick
+offsets already include the shift between the tight shapes of the two states,
+which keeps the piece turning around its SRS center.
+
+Rotation states: 0 = spawn, 1 = R (clockwise), 2 = 180, 3 = L (counter-clockwise).
+"""
+
+CLOCKWISE = 1
+HALF_TURN = 2
+COUNTER_CLOCKWISE = 3
+
+# SRS bounding boxes in spawn state, indexed like Tetromino.SHAPES
+SRS_BOXES = [
+    [[0, 0, 0, 0], [1, 1, 1, 1], [0, 0, 0, 0], [0, 0, 0, 0]],  # I
+    [[1, 1], [1, 1]],  # O
+    [[0, 1, 0], [1, 1, 1], [0, 0, 0]],  # T
+    [[0, 0, 1], [1, 1, 1], [0, 0, 0]],  # L
+    [[1, 0, 0], [1, 1, 1], [0, 0, 0]],  # J
+    [[0, 1, 1], [1, 1, 0], [0, 0, 0]],  # S
+    [[1, 1, 0], [0, 1, 1], [0, 0, 0]]  # Z
+]
+
+# Rotation state each piece spawns in, chosen so the spawn shapes match Tetromino.SHAPES
+SPAWN_ROTATION = (0, 0, 2, 2, 2, 0, 0)
+
+# SRS wall kicks as (x, y) with y pointing up, keyed by (from_state, to_state)
+JLSTZ_KICKS = {
+    (0, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (1, 0): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (1, 2): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (2, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (0, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2))
+}
+
+I_KICKS = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1))
+}
+
+# SRS has no 180 rotation; these are the kicks commonly used by modern guideline games
+HALF_TURN_KICKS = {
+    (0, 2): ((0, 0), (0, 1), (1, 1), (-1, 1), (1, 0), (-1, 0)),
+    (2, 0): ((0, 0), (0, -1), (-1, -1), (1, -1), (-1, 0), (1, 0)),
+    (1, 3): ((0, 0), (1, 0), (1, 2), (1, 1), (0, 2), (0, 1)),
+    (3, 1): ((0, 0), (-1, 0), (-1, 2), (-1, 1), (0, 2), (0, 1))
+}
+
+
+def _rotate_box(box):
+    """Rotate a square matrix 90 degrees clockwise"""
+    return [list(row) for row in zip(*box[::-1])]
+
+
+def _trim(box):
+    """Return (shape, x_offset, y_offset) of the tight shape inside a box"""
+    rows = [i for i, row in enumerate(box) if any(row)]
+    cols = [j for j in range(len(box[0])) if any(row[j] for row in box)]
+    shape = [box[i][cols[0]:cols[-1] + 1] for i in range(rows[0], rows[-1] + 1)]
+    return shape, cols[0], rows[0]
+
+
+def _row_masks(shape):
+    """Return (row_masks, left, right) with bit j of a mask set for column j"""
+    row_masks = tuple(sum(1 << j for j, cell in enumerate(row) if cell) for row in shape)
+    return row_masks, 0, len(shape[0]) - 1
+
+
+def _column_profiles(shape):
+    """Return (tops, bottoms): the first and last filled row of every column of a shape"""
+    columns = list(zip(*shape))
+    tops = tuple(column.index(1) for column in columns)
+    bottoms = tuple(len(column) - 1 - column[::-1].index(1) for column in columns)
+    return tops, bottoms
+
+
+def _build_tables():
+    shapes, offsets, masks, kicks, profiles = [], [], [], [], []
+
+    for shape_idx, box in enumerate(SRS_BOXES):
+        piece_shapes, piece_offsets = [], []
+        for _ in range(4):
+            shape, ox, oy = _trim(box)
+            piece_shapes.append(shape)
+            piece_offsets.append((ox, oy))
+            box = _rotate_box(box)
+
+        # Kick table for this piece: piece_kicks[from_state][to_state] -> ((dx, dy), ...)
+        table = dict(I_KICKS if shape_idx == 0 else JLSTZ_KICKS)
+        table.update(HALF_TURN_KICKS)
+        piece_kicks = [[() for _ in range(4)] for _ in range(4)]
+        for (src, dst), srs_kicks in table.items():
+            if shape_idx == 1:  # O piece never kicks
+                srs_kicks = ((0, 0),)
+            shift_x = piece_offsets[dst][0] - piece_offsets[src][0]
+            shift_y = piece_offsets[dst][1] - piece_offsets[src][1]
+            # Board y grows downwards, SRS y grows upwards
+            piece_kicks[src][dst] = tuple((shift_x + kx, shift_y - ky) for kx, ky in srs_kicks)
+
+        shapes.append(tuple(piece_shapes))
+        offsets.append(tuple(piece_offsets))
+        masks.append(tuple(_row_masks(shape) for shape in piece_shapes))
+        kicks.append(tuple(tuple(row) for row in piece_kicks))
+        profiles.append(tuple(_column_profiles(shape) for shape in piece_shapes))
+
+    tops = tuple(tuple(state[0] for state in piece) for piece in profiles)
+    bottoms = tuple(tuple(state[1] for state in piece) for piece in profiles)
+    return tuple(shapes), tuple(offsets), tuple(masks), tuple(kicks), tops, bottoms
+
+
+# ROTATIONS[shape_idx][state] is the tight shape; it is shared between pieces and must not be mutated
+# OFFSETS[shape_idx][state] is the (x, y) position of that shape inside the SRS box
+# ROTATION_MASKS[shape_idx][state] is (row_masks, left, right) for bitboard collision checks
+# KICKS[shape_idx][from_state][to_state] is the ordered tuple of (dx, dy) position changes to try
+# TOPS/BOTTOMS[shape_idx][state] hold the first/last filled row of every column of the shape
+ROTATIONS, OFFSETS, ROTATION_MASKS, KICKS, TOPS, BOTTOMS = _build_tables()
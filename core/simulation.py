@@ -0,0 +1,181 @@
+"""Headless game simulation driven by explicit ticks.
+
+Nothing in here imports pygame or reads the wall clock: the game advances
+one tick at a time with the actions given for that tick, so it can run at
+thousands of frames per second in tests, tools and servers.
+
+Run a batch of simulated games with: python -m core.simulation --games 100
+"""
+import argparse
+import random
+import time
+from enum import IntFlag
+
+import services.config as config
+from core.board import Board
+from core.bitboard import BitBoard
+from core.rotation import CLOCKWISE, COUNTER_CLOCKWISE, HALF_TURN
+
+
+class Action(IntFlag):
+    """Inputs that can be applied during a single tick, combinable with |"""
+    NONE = 0
+    MOVE_LEFT = 1
+    MOVE_RIGHT = 2
+    SOFT_DROP = 4
+    ROTATE_CW = 8
+    ROTATE_CCW = 16
+    ROTATE_180 = 32
+    HARD_DROP = 64
+
+
+# Rotation actions mapped to the number of clockwise quarter turns
+ROTATIONS = (
+    (Action.ROTATE_CW, CLOCKWISE),
+    (Action.ROTATE_CCW, COUNTER_CLOCKWISE),
+    (Action.ROTATE_180, HALF_TURN)
+)
+
+
+def create_board(**kwargs):
+    """Create a board using the backend selected in config.BOARD_BACKEND"""
+    board_class = BitBoard if config.BOARD_BACKEND == 'bitboard' else Board
+    return board_class(**kwargs)
+
+
+class Simulation:
+    def __init__(self, seed=None, tick_rate=None, width=None, height=None, board=None):
+        self.tick_rate = tick_rate or config.FPS  # Ticks per simulated second
+        self.rng = random.Random(seed)
+        self.board = board or create_board(width=width, height=height, rng=self.rng)
+        self.frame = 0
+        self.fall_frames = 0
+
+    @property
+    def game_over(self):
+        return self.board.game_over
+
+    def gravity_interval(self):
+        """Number of ticks between automatic drops at the current level"""
+        return max(1, round(config.get_drop_speed(self.board.level) * self.tick_rate))
+
+    def tick(self, actions=Action.NONE, counts=None):
+        """Advance the game by one tick and return the list of events it produced.
+
+        Events are sound names ('rotate', 'drop', 'line_clear', 'tetris',
+        'level_up', 'game_over') so front-ends can give feedback without the
+        simulation knowing about audio.
+        counts optionally gives how many times MOVE_LEFT, MOVE_RIGHT and
+        SOFT_DROP repeat within the tick (1 by default), see core.input.
+        """
+        board = self.board
+        events = []
+        placed = board.pieces_placed
+
+        self._step(actions, counts or {}, events)
+
+        # Line clears and level ups of the piece that locked this tick
+        if board.pieces_placed != placed:
+            events.extend(board.events)
+        return events
+
+    def _step(self, actions, counts, events):
+        """Apply one tick of input and gravity, appending events"""
+        board = self.board
+        if board.game_over:
+            return
+
+        self.frame += 1
+
+        # A piece that no longer fits means the stack reached the spawn area
+        if board.current_piece and not board.is_valid_position():
+            board.game_over = True
+            return
+
+        # Most ticks carry no input, skip the flag tests for them (IntFlag & costs microseconds)
+        if actions:
+            for action, direction in ROTATIONS:
+                if actions & action and board.rotate_piece(direction):
+                    events.append('rotate')
+
+            for action, dx in ((Action.MOVE_LEFT, -1), (Action.MOVE_RIGHT, 1)):
+                if actions & action:
+                    for _ in range(counts.get(action, 1)):
+                        if not board.move_piece(dx=dx):
+                            break
+
+            if actions & Action.HARD_DROP:
+                if board.hard_drop():
+                    events.append('drop')
+                else:
+                    events.append('game_over')
+                self.fall_frames = 0
+                return
+
+            if actions & Action.SOFT_DROP:
+                if not board.move_piece(dy=1):
+                    # Piece hit bottom, merge with board
+                    board.merge_piece()
+                    self.fall_frames = 0
+                    return
+
+                # Further rows only go as far as the stack, locking is left to gravity
+                for _ in range(counts.get(Action.SOFT_DROP, 1) - 1):
+                    if not board.move_piece(dy=1):
+                        break
+
+        # Handle automatic falling
+        self.fall_frames += 1
+        if self.fall_frames >= self.gravity_interval():
+            if not board.move_piece(dy=1):
+                # Piece hit bottom or another piece, merge with board
+                board.merge_piece()
+            self.fall_frames = 0
+
+
+def random_actions(rng):
+    """Pick a random input for one tick, mostly doing nothing like a human would"""
+    roll = rng.random()
+    if roll < 0.80:
+        return Action.NONE
+    if roll < 0.99:
+        return rng.choice((Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.SOFT_DROP, Action.ROTATE_CW,
+                           Action.ROTATE_CCW))
+    return Action.HARD_DROP
+
+
+def run_games(games, seed=0, max_frames=100000):
+    """Play random games headlessly and return (total_frames, elapsed_seconds, scores)"""
+    rng = random.Random(seed)
+    total_frames = 0
+    scores = []
+
+    start = time.perf_counter()
+    for game in range(games):
+        simulation = Simulation(seed=seed + game)
+        while not simulation.game_over and simulation.frame < max_frames:
+            simulation.tick(random_actions(rng))
+        total_frames += simulation.frame
+        scores.append(simulation.board.score)
+    elapsed = time.perf_counter() - start
+
+    return total_frames, elapsed, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run simulated games and report frames per second")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-frames', type=int, default=100000, help="Frame limit per game")
+    args = parser.parse_args()
+
+    total_frames, elapsed, scores = run_games(args.games, args.seed, args.max_frames)
+    print(f"Games:        {args.games}")
+    print(f"Frames:       {total_frames}")
+    print(f"Elapsed:      {elapsed:.2f}s")
+    print(f"Frames/sec:   {total_frames / elapsed:,.0f}")
+    print(f"Mean score:   {sum(scores) / len(scores):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,14 @@
+import os
+import random
+from datetime import datetime
+
 import pygame
 from enum import Enum, auto
-from core.board import Board
+from core.simulation import Simulation, Action
+from core.input import InputEngine, settings_for
 import services.config as config
 from ui.widgets import InputBox, Menu
+from ui.text import text_cache
 
 
 class GameStates(Enum):
@@ -96,38 +102,52 @@ class MainMenuState(GameState):
     def handle_event(self, event):
         selection = self.menu.handle_event(event)
         if selection == "Start Game":
-            self.state_manager.change_state(GameStates.PLAYING)
+            self.state_manager.change_state(GameStates.PLAYING, reset=True)
         elif selection == "High Scores":
             self.state_manager.change_state(GameStates.HIGH_SCORES)
         elif selection == "Exit":
-            pygame.quit()
-            exit()
+            self.state_manager.quit_requested = True
 
     def render(self):
         self.state_manager.renderer.render_main_menu(self.menu)
 
 class PlayingState(GameState):
+    """Thin pygame adapter over the headless Simulation"""
+
+    # Game keys mapped to their action; moves and soft drop repeat while held (see core.input)
+    KEYS = {
+        pygame.K_LEFT: Action.MOVE_LEFT,
+        pygame.K_RIGHT: Action.MOVE_RIGHT,
+        pygame.K_DOWN: Action.SOFT_DROP,
+        pygame.K_UP: Action.ROTATE_CW,
+        pygame.K_z: Action.ROTATE_CCW,
+        pygame.K_a: Action.ROTATE_180,
+        pygame.K_SPACE: Action.HARD_DROP
+    }
+
     def __init__(self, state_manager):
         super().__init__(state_manager)
+        self.simulation = None
         self.board = None
-        self.fall_time = 0
-        self.last_time = 0
-        self.key_repeat = {
-            pygame.K_LEFT: {"pressed": False, "time": 0},
-            pygame.K_RIGHT: {"pressed": False, "time": 0},
-            pygame.K_DOWN: {"pressed": False, "time": 0}
-        }
+        self.input = InputEngine(settings_for(state_manager.player_name))
+        self.tick_ms = 1000 / config.LOGIC_RATE
+        self.tick_time = None  # Logic time of the last tick, in milliseconds
+        self.ticks = 0  # Ticks played in the current game
+        self.recorder = None
 
     def enter(self):
-        # Create a new board
-        self.board = Board()
-
-        # Pass the sounds to the board
-        if hasattr(self.state_manager, 'audio_manager'):
-            self.board.sounds = self.state_manager.audio_manager.sounds
-
-        self.fall_time = 0
-        self.last_time = pygame.time.get_ticks()
+        # Create a new game, unless we are resuming from pause
+        if self.simulation is None or self.simulation.game_over:
+            # An explicit seed makes the game reproducible from its replay
+            seed = random.randrange(2 ** 63)
+            self.simulation = Simulation(seed=seed, tick_rate=config.LOGIC_RATE)
+            self.board = self.simulation.board
+            self.ticks = 0
+            self._start_recording(seed)
+
+        # Keys pressed or released in other screens do not count
+        self.input.reset()
+        self.tick_time = None
 
         # Start playing game music
         self.state_manager.audio_manager.play_music('game')
@@ -136,152 +156,66 @@ class PlayingState(GameState):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_p:
                 self.state_manager.change_state(GameStates.PAUSED)
-            elif event.key == pygame.K_UP:
-                if self.board.rotate_piece():
-                    self.state_manager.audio_manager.play_sound('rotate')
-            elif event.key == pygame.K_SPACE:
-                if self.board.hard_drop():
-                    self.state_manager.audio_manager.play_sound('drop')
-                else:
-                    self.state_manager.audio_manager.play_sound('game_over')
-                    self.state_manager.change_state(GameStates.GAME_OVER)
+            elif event.key in self.KEYS:
+                self.input.press(self.KEYS[event.key], pygame.time.get_ticks())
+        elif event.type == pygame.KEYUP and event.key in self.KEYS:
+            self.input.release(self.KEYS[event.key], pygame.time.get_ticks())
 
     def update(self):
-        """Update the playing state"""
-        # Skip if there's no board
-        if not self.board:
+        """Advance the simulation by one tick with the current input"""
+        # Skip if there's no game
+        if not self.simulation:
             return
 
-        # ADDITIONAL CHECK: Explicitly check for game over condition
-        if self.board and self.board.current_piece:
-            if not self.board.is_valid_position():
-                self.board.game_over = True
-                self.state_manager.final_score = self.board.score
+        actions, counts = self.input.tick(self._next_tick_time())
+        if self.recorder:
+            self.recorder.record(self.ticks, actions, counts)
+        self.ticks += 1
 
-        current_time = pygame.time.get_ticks()
-        delta_time = (current_time - self.last_time) / 1000.0
-        self.last_time = current_time
-        self.fall_time += delta_time
+        for sound_name in self.simulation.tick(actions, counts):
+            self.state_manager.audio_manager.play_sound(sound_name)
 
-        # Check for game over immediately
         if self.board.game_over:
-            # Set the final score again to be sure it's captured
+            self.finish_recording()
             self.state_manager.final_score = self.board.score
-            # Now change the state to GAME_OVER
             self.state_manager.change_state(GameStates.GAME_OVER)
-            return
 
-        # Handle key repeats for smoother movement
-        keys = pygame.key.get_pressed()
-
-        # Handle left key
-        if keys[pygame.K_LEFT]:
-            if not self.key_repeat[pygame.K_LEFT]["pressed"]:
-                self.board.move_piece(dx=-1)
-                self.key_repeat[pygame.K_LEFT]["pressed"] = True
-                self.key_repeat[pygame.K_LEFT]["time"] = current_time
-            elif current_time - self.key_repeat[pygame.K_LEFT]["time"] > config.KEY_REPEAT_DELAY:
-                if (current_time - self.key_repeat[pygame.K_LEFT][
-                    "time"] - config.KEY_REPEAT_DELAY) % config.KEY_REPEAT_INTERVAL < 20:
-                    self.board.move_piece(dx=-1)
-        else:
-            self.key_repeat[pygame.K_LEFT]["pressed"] = False
-
-        # Handle right key
-        if keys[pygame.K_RIGHT]:
-            if not self.key_repeat[pygame.K_RIGHT]["pressed"]:
-                self.board.move_piece(dx=1)
-                self.key_repeat[pygame.K_RIGHT]["pressed"] = True
-                self.key_repeat[pygame.K_RIGHT]["time"] = current_time
-            elif current_time - self.key_repeat[pygame.K_RIGHT]["time"] > config.KEY_REPEAT_DELAY:
-                if (current_time - self.key_repeat[pygame.K_RIGHT][
-                    "time"] - config.KEY_REPEAT_DELAY) % config.KEY_REPEAT_INTERVAL < 20:
-                    self.board.move_piece(dx=1)
-        else:
-            self.key_repeat[pygame.K_RIGHT]["pressed"] = False
-
-        # Handle down key (soft drop)
-        if keys[pygame.K_DOWN]:
-            if not self.key_repeat[pygame.K_DOWN]["pressed"]:
-                if not self.board.move_piece(dy=1):
-                    # Piece hit bottom, merge with board
-                    result = self.board.merge_piece()
-                    if self.board.game_over:
-                        self.state_manager.final_score = self.board.score
-                        self.state_manager.change_state(GameStates.GAME_OVER)
-                self.key_repeat[pygame.K_DOWN]["pressed"] = True
-                self.key_repeat[pygame.K_DOWN]["time"] = current_time
-            elif current_time - self.key_repeat[pygame.K_DOWN]["time"] > config.KEY_REPEAT_DELAY:
-                if (current_time - self.key_repeat[pygame.K_DOWN][
-                    "time"] - config.KEY_REPEAT_DELAY) % config.KEY_REPEAT_INTERVAL < 20:
-                    if not self.board.move_piece(dy=1):
-                        # Piece hit bottom, merge with board
-                        result = self.board.merge_piece()
-                        if self.board.game_over:
-                            self.state_manager.final_score = self.board.score
-                            self.state_manager.change_state(GameStates.GAME_OVER)
-        else:
-            self.key_repeat[pygame.K_DOWN]["pressed"] = False
-
-        # Handle automatic falling
-        drop_speed = config.get_drop_speed(self.board.level)
-        if self.fall_time >= drop_speed:
-            if not self.board.move_piece(dy=1):
-                # Piece hit bottom or another piece, merge with board
-                result = self.board.merge_piece()
-
-                if self.board.game_over:
-                    self.state_manager.final_score = self.board.score
-                    self.state_manager.change_state(GameStates.GAME_OVER)
-                    return
-
-            self.fall_time = 0
-
-    def _handle_key_repeats(self, keys, current_time):
-        # Handle left key
-        if keys[pygame.K_LEFT]:
-            if not self.key_repeat[pygame.K_LEFT]["pressed"]:
-                self.board.move_piece(dx=-1)
-                self.key_repeat[pygame.K_LEFT]["pressed"] = True
-                self.key_repeat[pygame.K_LEFT]["time"] = current_time
-            elif current_time - self.key_repeat[pygame.K_LEFT]["time"] > config.KEY_REPEAT_DELAY:
-                if (current_time - self.key_repeat[pygame.K_LEFT][
-                    "time"] - config.KEY_REPEAT_DELAY) % config.KEY_REPEAT_INTERVAL < 20:
-                    self.board.move_piece(dx=-1)
-        else:
-            self.key_repeat[pygame.K_LEFT]["pressed"] = False
-
-        # Handle right key
-        if keys[pygame.K_RIGHT]:
-            if not self.key_repeat[pygame.K_RIGHT]["pressed"]:
-                self.board.move_piece(dx=1)
-                self.key_repeat[pygame.K_RIGHT]["pressed"] = True
-                self.key_repeat[pygame.K_RIGHT]["time"] = current_time
-            elif current_time - self.key_repeat[pygame.K_RIGHT]["time"] > config.KEY_REPEAT_DELAY:
-                if (current_time - self.key_repeat[pygame.K_RIGHT][
-                    "time"] - config.KEY_REPEAT_DELAY) % config.KEY_REPEAT_INTERVAL < 20:
-                    self.board.move_piece(dx=1)
-        else:
-            self.key_repeat[pygame.K_RIGHT]["pressed"] = False
-
-        # Handle down key (soft drop)
-        if keys[pygame.K_DOWN]:
-            if not self.key_repeat[pygame.K_DOWN]["pressed"]:
-                if not self.board.move_piece(dy=1):
-                    if not self.board.merge_piece():
-                        self.state_manager.audio_manager.play_sound('game_over')
-                        self.state_manager.change_state(GameStates.GAME_OVER)
-                self.key_repeat[pygame.K_DOWN]["pressed"] = True
-                self.key_repeat[pygame.K_DOWN]["time"] = current_time
-            elif current_time - self.key_repeat[pygame.K_DOWN]["time"] > config.KEY_REPEAT_DELAY:
-                if (current_time - self.key_repeat[pygame.K_DOWN][
-                    "time"] - config.KEY_REPEAT_DELAY) % config.KEY_REPEAT_INTERVAL < 20:
-                    if not self.board.move_piece(dy=1):
-                        if not self.board.merge_piece():
-                            self.state_manager.audio_manager.play_sound('game_over')
-                            self.state_manager.change_state(GameStates.GAME_OVER)
+    def _start_recording(self, seed):
+        """Record the new game to a replay file"""
+        self.stop_recording()
+        if not config.RECORD_REPLAYS:
+            return
+        # Only games that are recorded need the replay format
+        from core.replay import ReplayWriter, prune_replays
+        try:
+            os.makedirs(config.REPLAY_DIR, exist_ok=True)
+            path = os.path.join(config.REPLAY_DIR, f"replay_{datetime.now():%Y%m%d_%H%M%S}_{seed:016x}.trpl")
+            self.recorder = ReplayWriter(path, seed, config.LOGIC_RATE, self.board.width, self.board.height)
+            if config.MAX_REPLAYS:
+                prune_replays(config.REPLAY_DIR, config.MAX_REPLAYS)
+        except OSError as e:
+            print(f"Error starting replay recording: {e}")
+
+    def finish_recording(self):
+        """Write the result so far and close the replay, e.g. when the game ends or the window closes"""
+        if self.recorder:
+            self.recorder.finish(self.ticks, self.board.score, self.board.lines_cleared)
+            self.recorder = None
+
+    def stop_recording(self):
+        """Close the replay of an abandoned game, which is left without a final result"""
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+    def _next_tick_time(self):
+        """Logic time of the next tick: one tick after the last, but never further behind than catching up allows"""
+        now = pygame.time.get_ticks()
+        if self.tick_time is None:
+            self.tick_time = now
         else:
-            self.key_repeat[pygame.K_DOWN]["pressed"] = False
+            self.tick_time = max(self.tick_time + self.tick_ms, now - config.MAX_CATCH_UP_TICKS * self.tick_ms)
+        return self.tick_time
 
     def render(self):
         self.state_manager.renderer.render_game(self.board)
@@ -316,13 +250,10 @@ class PausedState(GameState):
         self.cached_screen.blit(self.state_manager.renderer.screen, (0, 0))
 
         # Add a semi-transparent overlay
-        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))  # Transparent black
-        self.cached_screen.blit(overlay, (0, 0))
+        self.cached_screen.blit(self.state_manager.renderer.pause_overlay(), (0, 0))
 
         # Draw pause text and initial menu state
-        font = pygame.font.SysFont(None, 60)
-        pause_text = font.render("PAUSED", True, config.WHITE)
+        pause_text = text_cache.render("PAUSED", 60, config.WHITE)
         text_rect = pause_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 4))
         self.cached_screen.blit(pause_text, text_rect)
 
@@ -355,7 +286,7 @@ class PausedState(GameState):
         # Just draw the menu on top (which could change as user navigates)
         self.menu.draw(self.state_manager.renderer.screen, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2)
 
-        pygame.display.update()
+        self.state_manager.renderer.present()
 
 
 class GameOverState(GameState):
@@ -392,9 +323,8 @@ class GameOverState(GameState):
                     # Go directly to name confirmation
                     self.state_manager.change_state(GameStates.CONFIRM_NAME)
                 elif event.key == pygame.K_ESCAPE:
-                    # Directly exit the game when pressing ESC
-                    pygame.quit()
-                    exit()
+                    # Exit the game when pressing ESC, main() saves everything on the way out
+                    self.state_manager.quit_requested = True
                 elif event.key == pygame.K_h:
                     # Instead of setting a flag, directly change to high score state
                     self.state_manager.change_state(GameStates.HIGH_SCORES)
@@ -496,6 +426,7 @@ class GameStateManager:
         self.high_score_manager = high_score_manager
         self.player_name = "Player"
         self.final_score = 0
+        self.quit_requested = False  # Set by states to leave the main loop through its shutdown
 
         # Initialize all states
         self.states = {
@@ -526,16 +457,24 @@ class GameStateManager:
         # If state is PLAYING and needs to be reset, recreate it
         if new_state_type == GameStates.PLAYING:
             if reset:
+                self.states[GameStates.PLAYING].stop_recording()
                 self.states[GameStates.PLAYING] = PlayingState(self)
                 # Reset the final score when starting a new game
                 self.final_score = 0
 
+        # Other screens draw over the game, so the next game frame must be drawn in full
+        self.renderer.invalidate()
+
         # Set new state
         self.current_state = self.states[new_state_type]
 
         # Enter new state
         self.current_state.enter()
 
+    def close(self):
+        """Finish the replay of a game still being played, call before quitting"""
+        self.states[GameStates.PLAYING].finish_recording()
+
     def handle_event(self, event):
         self.current_state.handle_event(event)
 
@@ -1,51 +1,177 @@
-import pygame
+import time
+START_TIME = time.perf_counter()  # Before the imports, which are part of the startup time
+
+import argparse
 import sys
-from core.state import GameState, GameStateManager
-from ui.renderer import Renderer
-from services.audio import AudioManager
-from services.highscores import HighScoreManager
 import services.config as config
 
+# pygame, the screens and the services are imported in main() once the game is known to run,
+# so importing this module or profiling startup stays light
+
+
+def watch_replay(renderer, clock, path, speed=1.0):
+    """Play a recorded game back on screen in real time (or faster), then verify its result"""
+    import pygame
+    from core.loop import FixedTimestep
+    from core.replay import read_replay, new_simulation, replay_ticks, verify
+
+    replay = read_replay(path)
+    simulation = new_simulation(replay)
+    ticks = replay_ticks(replay)
+    timestep = FixedTimestep(replay.tick_rate * speed, config.MAX_CATCH_UP_TICKS)
+
+    finished = False
+    while not finished:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return
+
+        for _ in range(timestep.advance()):
+            tick = next(ticks, None)
+            if tick is None:
+                finished = True
+                break
+            simulation.tick(*tick)
+
+        renderer.render_game(simulation.board)
+        clock.tick(config.RENDER_FPS)
+
+    verify(replay, simulation)
+    print(f"Replay finished: score {simulation.board.score}, lines {simulation.board.lines_cleared}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument('--replay', metavar='FILE', help="Watch a recorded game instead of playing")
+    parser.add_argument('--speed', type=float, default=1.0, help="Replay speed multiplier")
+    parser.add_argument('--startup-report', action='store_true', help="Print the time to the first frame")
+    parser.add_argument('--frames', type=int, default=0, help="Quit after this many frames (0 to play normally)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Print an import-time breakdown of one launch, exit 1 if over STARTUP_BUDGETS_MS")
+    args = parser.parse_args(argv)
+    report_startup = args.startup_report or config.REPORT_STARTUP_TIME
+
+    if args.profile_startup:
+        from services.startup import profile_startup
+        sys.exit(profile_startup())
+
+    import pygame
+    from core.loop import FixedTimestep
+    from core.state import GameStateManager
+    from ui.renderer import Renderer
+    from ui.text import text_cache
+    from services.profiler import FrameProfiler
+    from services.audio import AudioManager
+    from services.highscores import create_high_score_manager
 
-def main():
-    # Initialize pygame
+    config.ensure_directories()
+
+    # Initialize pygame (the mixer included, AudioManager reuses it)
     pygame.init()
-    pygame.mixer.init()
 
     # Create the screen
-    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    if config.VSYNC:
+        screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+    else:
+        screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
     pygame.display.set_caption('Tetris')
     clock = pygame.time.Clock()
 
+    # Load fonts once instead of on the first frame that needs them
+    text_cache.preload()
+
     # Initialize services
     audio_manager = AudioManager()
-    high_score_manager = HighScoreManager()
+    high_score_manager = create_high_score_manager()
+
+    # Frame phase timings, recorded while enabled or while the overlay is shown
+    profiler = FrameProfiler(config.PROFILER_ENABLED, config.PROFILER_FRAMES)
+    profiler_key = pygame.key.key_code(config.PROFILER_HOTKEY)
 
     # Initialize renderer
-    renderer = Renderer(screen)
+    renderer = Renderer(screen, profiler=profiler)
+
+    if args.replay:
+        watch_replay(renderer, clock, args.replay, args.speed)
+        pygame.quit()
+        sys.exit()
 
     # Initialize game state manager
     state_manager = GameStateManager(renderer, audio_manager, high_score_manager)
 
+    # Logic ticks per frame in the fixed-timestep loop
+    timestep = FixedTimestep(config.LOGIC_RATE, config.MAX_CATCH_UP_TICKS)
+
     # Main game loop
     running = True
+    frames = 0
     while running:
+        profiler.begin_frame()
+
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            if event.type == pygame.KEYDOWN and event.key == profiler_key:
+                # Toggle the profiler overlay, recording while it is shown
+                renderer.show_profiler = not renderer.show_profiler
+                profiler.enabled = config.PROFILER_ENABLED or renderer.show_profiler
+                renderer.invalidate()
+                continue
+
             # Pass event to current state
             state_manager.handle_event(event)
+        if state_manager.quit_requested:
+            running = False
+        profiler.mark('events')
 
         # Update current state
-        state_manager.update()
+        if config.LOOP_MODE == 'fixed':
+            for _ in range(timestep.advance()):
+                state_manager.update()
+        else:
+            state_manager.update()
+        audio_manager.update()
+        profiler.mark('update')
 
-        # Render current state
+        # Render current state (the renderer marks the render and present phases)
         state_manager.render()
 
+        frames += 1
+        if frames == 1 and report_startup:
+            print(f"First frame after {(time.perf_counter() - START_TIME) * 1000:.0f} ms")
+        if frames == args.frames:
+            running = False
+
         # Cap the frame rate
-        clock.tick(config.FPS)
+        clock.tick(config.RENDER_FPS if config.LOOP_MODE == 'fixed' else config.LOGIC_RATE)
+        profiler.mark('idle')
+        profiler.end_frame()
+
+    if config.REPORT_LOOP_STATS and config.LOOP_MODE == 'fixed':
+        stats = timestep.stats()
+        print(f"{stats['frames']} frames, {stats['ticks']} ticks, {stats['dropped_ticks']} dropped ticks, "
+              f"{stats['duplicated_frames']} duplicated frames, {stats['catch_up_frames']} catch-up frames")
+
+    if config.PROFILER_TRACE_FILE and profiler.count:
+        profiler.dump(config.PROFILER_TRACE_FILE)
+
+    if config.REPORT_SOUND_STATS:
+        stats = audio_manager.sound_stats()
+        print(f"{stats['requested']} sounds requested, {stats['played']} played, {stats['coalesced']} coalesced, "
+              f"{stats['rate_limited']} rate limited, {stats['stolen']} voices stolen, "
+              f"peak voices {stats['peak_voices']}")
+
+    if report_startup:
+        if audio_manager.loaded.is_set():
+            print(f"Sound effects loaded in {audio_manager.load_seconds * 1000:.0f} ms, in the background")
+        else:
+            print("Sound effects still loading at exit")
+
+    # Close the replay of a game left running, then wait for the last high score to be written
+    state_manager.close()
+    high_score_manager.close()
 
     pygame.quit()
     sys.exit()
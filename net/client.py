@@ -0,0 +1,55 @@
+"""Client side of a versus match.
+
+VersusClient joins a match on a server, sends the player's inputs and keeps
+a RemoteBoard per player up to date from the frames the server sends.
+"""
+import asyncio
+
+from net import protocol
+
+
+class VersusClient:
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.start = None  # protocol.Start of the match
+        self.boards = []  # RemoteBoard of every player, by player index
+        self.tick = 0  # Server tick of the last frame received
+        self.ack = 0  # Last input tick the server has applied
+        self.finished = False
+        self.winner = None
+
+    async def connect(self, host, port):
+        """Connect and wait until the server has paired us into a match"""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(protocol.encode_join())
+        payload = await protocol.read_message(self.reader)
+        if payload[0] != protocol.START:
+            raise protocol.ProtocolError(f"Expected START, got message type {payload[0]}")
+        self.start = protocol.decode_start(payload)
+        self.boards = [protocol.RemoteBoard(self.start.width, self.start.height) for _ in range(self.start.players)]
+
+    @property
+    def player(self):
+        """Index of our board in boards"""
+        return self.start.player
+
+    def send_input(self, tick, actions, counts=None):
+        """Send the input for a server tick"""
+        self.writer.write(protocol.encode_input(tick, actions, counts))
+
+    async def receive(self):
+        """Read and apply one message from the server, return its type"""
+        payload = await protocol.read_message(self.reader)
+        if payload[0] == protocol.FRAME:
+            self.tick, self.ack, states = protocol.decode_frame(payload)
+            for state in states:
+                self.boards[state.player].apply(state)
+        elif payload[0] == protocol.END:
+            self.tick, self.winner = protocol.decode_end(payload)
+            self.finished = True
+        return payload[0]
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
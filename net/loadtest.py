@@ -0,0 +1,156 @@
+"""Load test of the versus server with bot players.
+
+Starts a server in its own process (unless --port points at a running one),
+connects --matches times PLAYERS_PER_MATCH bots from this process and has
+them send random inputs every tick for --duration seconds. Bots whose match
+ends join a new one. Reports the tick latency seen by the bots, from sending
+the input of a tick to receiving the frame that acknowledges it, and the
+time the server spent on each of its ticks.
+
+Run with: python -m net.loadtest --matches 200 --duration 20
+"""
+import argparse
+import asyncio
+import random
+import struct
+import sys
+import time
+from collections import deque
+
+import services.config as config
+from core.loop import FixedTimestep
+from core.simulation import Action, random_actions
+from net import protocol
+from net.client import VersusClient
+from services.profiler import percentiles
+
+
+class Bot:
+    def __init__(self, host, port, seed):
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.client = None  # Connected and in a match when set
+        self.server_tick = 0  # Server tick of the last frame received
+        self.sent = deque()  # (tick, send time) of inputs not acknowledged yet
+        self.latencies = []  # Seconds from sending an input to its acknowledgement
+        self.matches = 0
+        self.protocol_errors = 0  # Connections dropped on a message that could not be decoded
+
+    async def play(self):
+        """Join matches one after the other until cancelled"""
+        while True:
+            client = VersusClient()
+            try:
+                await client.connect(self.host, self.port)
+                self.client = client
+                self.server_tick = 0
+                self.matches += 1
+                while True:
+                    # Only the frame header is decoded, to leave the CPU to the server
+                    payload = await protocol.read_message(client.reader)
+                    if payload[0] == protocol.END:
+                        break
+                    if payload[0] == protocol.FRAME:
+                        _, self.server_tick, ack, _ = protocol.FRAME_HEADER.unpack_from(payload)
+                        now = time.perf_counter()
+                        while self.sent and self.sent[0][0] <= ack:
+                            self.latencies.append(now - self.sent.popleft()[1])
+            except (asyncio.IncompleteReadError, ConnectionError):
+                await asyncio.sleep(0.1)
+            except (protocol.ProtocolError, struct.error):
+                self.protocol_errors += 1
+                await asyncio.sleep(0.1)
+            finally:
+                self.client = None
+                self.sent.clear()
+                client.close()
+
+    def tick(self):
+        """Send this tick's input, if any, for the next server tick"""
+        if self.client is None:
+            return
+        actions = random_actions(self.rng)
+        if actions != Action.NONE:
+            tick = self.server_tick + 1
+            self.client.send_input(tick, actions)
+            self.sent.append((tick, time.perf_counter()))
+
+
+async def run_bots(host, port, bot_count, duration, tick_rate=None, seed=0):
+    """Run bots for duration seconds and return them"""
+    bots = [Bot(host, port, seed + i) for i in range(bot_count)]
+    tasks = [asyncio.create_task(bot.play()) for bot in bots]
+    timestep = FixedTimestep(tick_rate or config.SERVER_TICK_RATE, config.MAX_CATCH_UP_TICKS)
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            for _ in range(timestep.advance()):
+                for bot in bots:
+                    bot.tick()
+            await asyncio.sleep(max(0.0, timestep.step - timestep.accumulator))
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return bots
+
+
+async def start_server():
+    """Start a server on a free port in a child process, return (process, port)"""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, '-m', 'net.server', '--host', '127.0.0.1', '--port', '0', '--stats', '1',
+        cwd=config.BASE_DIR, stdout=asyncio.subprocess.PIPE)
+    line = (await process.stdout.readline()).decode()
+    if not line.startswith("Listening on"):
+        raise RuntimeError(f"Server did not start: {line}")
+    return process, int(line.rsplit(':', 1)[1])
+
+
+async def read_stats(process, lines):
+    """Keep the stats lines the server prints"""
+    async for line in process.stdout:
+        lines.append(line.decode().rstrip())
+
+
+async def load_test(matches, duration, host=None, port=None, seed=0):
+    process = server_lines = None
+    if port is None:
+        process, port = await start_server()
+        host = '127.0.0.1'
+        server_lines = []
+        reader = asyncio.create_task(read_stats(process, server_lines))
+
+    bots = await run_bots(host, port, matches * config.PLAYERS_PER_MATCH, duration, seed=seed)
+
+    if process:
+        last_stats = server_lines[-1] if server_lines else None
+        process.terminate()
+        await process.wait()
+        reader.cancel()
+
+    latencies = [latency for bot in bots for latency in bot.latencies]
+    print(f"Bots:          {len(bots)}")
+    print(f"Matches:       {sum(bot.matches for bot in bots) // config.PLAYERS_PER_MATCH}")
+    print(f"Inputs acked:  {len(latencies)}")
+    print(f"Bad messages:  {sum(bot.protocol_errors for bot in bots)}")
+    if latencies:
+        print("Tick latency:  " + "  ".join(f"{name} {ms:.1f} ms" for name, ms in percentiles(latencies).items()))
+    if process and last_stats:
+        print(f"Server:        {last_stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the versus server with bot players")
+    parser.add_argument('--matches', type=int, default=100, help="Concurrent matches to fill with bots")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to play")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="Port of a running server, by default one is started")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(load_test(args.matches, args.duration, args.host, args.port, args.seed))
+
+
+if __name__ == '__main__':
+    main()
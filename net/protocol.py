@@ -0,0 +1,158 @@
+"""Binary messages exchanged between the versus server and its clients.
+
+Every message is framed as a 2-byte little-endian length followed by that
+many bytes, the first of which is the message type. Integers are little
+endian and fixed size so messages pack and unpack with one struct call:
+
+    JOIN   client -> server  version
+    START  server -> client  match id, player index, players, seed, tick rate, width, height
+    INPUT  client -> server  tick, actions, repeat counts of MOVE_LEFT, MOVE_RIGHT, SOFT_DROP
+    FRAME  server -> client  tick, ack, then the boards that changed since the last frame
+    END    server -> client  tick, winner (NO_WINNER if nobody won)
+
+A board in a FRAME carries its player, score, lines, level, incoming
+garbage, the falling piece, the next shape and the rows that changed since
+the previous FRAME, each row as a bitmask of its filled cells. ack is the
+last input tick of the receiving player the server has applied. A player
+gets no FRAME while no board changes and none of its inputs is applied.
+"""
+import struct
+from collections import namedtuple
+
+from core.simulation import Action
+
+VERSION = 1
+
+# Message types
+JOIN, START, INPUT, FRAME, END = range(1, 6)
+
+NO_WINNER = 255
+MAX_WIDTH = 16  # Rows are sent as 16-bit masks
+MAX_COUNT = 255  # Repeat counts are clamped to a byte, still more than any board is wide or tall
+
+# Actions whose repeat count is sent after the action bits, as in core.replay
+COUNTED = (Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.SOFT_DROP)
+
+LENGTH = struct.Struct('<H')
+JOIN_MESSAGE = struct.Struct('<BB')
+START_MESSAGE = struct.Struct('<BIBBQBBB')
+INPUT_MESSAGE = struct.Struct('<BIBBBB')
+FRAME_HEADER = struct.Struct('<BIIB')
+BOARD_HEADER = struct.Struct('<BIHBBBBbbBBB')  # ... game over flag, changed row count
+ROW = struct.Struct('<BH')
+END_MESSAGE = struct.Struct('<BIB')
+
+Start = namedtuple('Start', 'match_id player players seed tick_rate width height')
+BoardState = namedtuple('BoardState', 'player score lines level garbage shape rotation x y next_shape game_over rows')
+
+
+class ProtocolError(Exception):
+    """Raised for messages that cannot be decoded"""
+
+
+def frame(payload):
+    """Prefix a message with its length"""
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    """Read one message from an asyncio stream, raises asyncio.IncompleteReadError at the end"""
+    size = LENGTH.unpack(await reader.readexactly(LENGTH.size))[0]
+    if not size:
+        raise ProtocolError("Empty message")  # Every message starts with its type
+    return await reader.readexactly(size)
+
+
+def encode_join():
+    return frame(JOIN_MESSAGE.pack(JOIN, VERSION))
+
+
+def encode_start(start):
+    return frame(START_MESSAGE.pack(START, *start))
+
+
+def decode_start(payload):
+    return Start(*START_MESSAGE.unpack(payload)[1:])
+
+
+def encode_input(tick, actions, counts=None):
+    counts = counts or {}
+    return frame(INPUT_MESSAGE.pack(INPUT, tick, int(actions),
+                                    *(min(counts.get(action, 1), MAX_COUNT) for action in COUNTED)))
+
+
+def decode_input(payload):
+    """Return (tick, actions, counts) of an INPUT message"""
+    _, tick, bits, *repeats = INPUT_MESSAGE.unpack(payload)
+    # Test the bits as plain ints, IntFlag operators are much slower
+    return tick, Action(bits), {action: count for action, count in zip(COUNTED, repeats) if bits & action.value}
+
+
+def board_masks(board):
+    """Return the rows of a board as bitmasks, bit x set for a filled cell in column x"""
+    rows = getattr(board, 'rows', None)  # BitBoard keeps them already
+    if rows is not None:
+        return rows[:]
+    return [sum(1 << x for x, cell in enumerate(row) if cell) for row in board.grid]
+
+
+def encode_board(player, board, garbage, changed_rows, masks):
+    """Encode the state of one board with the given changed row indices"""
+    piece = board.current_piece
+    parts = [BOARD_HEADER.pack(player, board.score, board.lines_cleared, board.level, min(garbage, 255),
+                               piece.shape_idx, piece.rotation, piece.x, piece.y, board.next_piece.shape_idx,
+                               board.game_over, len(changed_rows))]
+    parts.extend(ROW.pack(y, masks[y]) for y in changed_rows)
+    return b''.join(parts)
+
+
+def encode_frame(tick, ack, boards):
+    """Build a FRAME message from already encoded boards"""
+    return frame(FRAME_HEADER.pack(FRAME, tick, ack, len(boards)) + b''.join(boards))
+
+
+def decode_frame(payload):
+    """Return (tick, ack, [BoardState]) of a FRAME message"""
+    try:
+        _, tick, ack, count = FRAME_HEADER.unpack_from(payload)
+        offset = FRAME_HEADER.size
+        boards = []
+        for _ in range(count):
+            *fields, row_count = BOARD_HEADER.unpack_from(payload, offset)
+            offset += BOARD_HEADER.size
+            rows = [ROW.unpack_from(payload, offset + i * ROW.size) for i in range(row_count)]
+            offset += row_count * ROW.size
+            fields[10] = bool(fields[10])
+            boards.append(BoardState(*fields, rows))
+    except struct.error as e:
+        raise ProtocolError(f"Truncated frame: {e}") from e
+    return tick, ack, boards
+
+
+def encode_end(tick, winner):
+    return frame(END_MESSAGE.pack(END, tick, NO_WINNER if winner is None else winner))
+
+
+def decode_end(payload):
+    """Return (tick, winner) of an END message, winner None if nobody won"""
+    _, tick, winner = END_MESSAGE.unpack(payload)
+    return tick, None if winner == NO_WINNER else winner
+
+
+class RemoteBoard:
+    """Client-side copy of a board rebuilt from FRAME deltas"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.rows = [0] * height
+        self.state = None
+
+    def apply(self, state):
+        """Apply the BoardState of a frame"""
+        for y, mask in state.rows:
+            self.rows[y] = mask
+        self.state = state
+
+    def cell(self, x, y):
+        return bool(self.rows[y] >> x & 1)
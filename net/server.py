@@ -0,0 +1,343 @@
+"""Authoritative versus server on asyncio streams.
+
+Players connect over TCP and are paired into matches as they join. The
+server runs one Simulation per player (same seed, so both get the same
+pieces) and is the only one that decides what happens: clients just send
+their inputs tagged with the tick they are meant for. Every input gets a
+tick of its own: inputs that arrive late are applied one per tick from the
+next tick the server runs, so repeated rotations or drops are never merged.
+Clients that disconnect while waiting for an opponent are dropped before
+the next match is paired.
+
+Clearing lines sends garbage to the opponent (config.GARBAGE_LINES). It
+first cancels garbage waiting to come in, and the rest rises from the
+bottom the next time the receiver locks a piece without clearing.
+
+Every match runs from a single ticker task, so the server needs no thread
+per connection: each tick steps every match and, every SERVER_FRAME_TICKS
+ticks, queues a FRAME for each player holding only the boards that
+changed, and only their changed rows (see net.protocol). Players with no
+changed board and no newly applied input get no frame at all. Clients
+that stop reading are dropped once config.MAX_SEND_BUFFER bytes are queued
+for them.
+
+Run with: python -m net.server [--port 7777]
+"""
+import argparse
+import asyncio
+import contextlib
+import random
+import struct
+import time
+from collections import deque
+
+import services.config as config
+from core.loop import FixedTimestep
+from core.simulation import Action, Simulation
+from net import protocol
+from services.profiler import percentiles
+
+MAX_PENDING_INPUTS = 120  # Inputs queued per player before further ones are ignored
+MAX_INPUT_LEAD = 8  # Ticks past the match an input may be tagged for, later tags are pulled back to this
+
+
+class Player:
+    def __init__(self, index, writer, simulation):
+        self.index = index
+        self.writer = writer
+        self.simulation = simulation
+        self.inputs = deque()  # (tick, actions, counts) received, applied once the match reaches their tick
+        self.ack = 0  # Highest tick of the inputs applied
+        self.sent_ack = 0  # ack in the last frame sent
+        self.garbage = 0  # Incoming garbage rows not added yet
+        self.connected = True
+        self.masks = [0] * simulation.board.height  # Rows as last sent
+        self.summary = None  # Everything else about the board as last sent
+
+    @property
+    def alive(self):
+        return self.connected and not self.simulation.game_over
+
+    def add_input(self, tick, actions, counts, match_tick):
+        """Queue an input received for a tick.
+
+        Inputs are applied in arrival order, so a tick far ahead (a bad or
+        skewed client clock) would hold up every input behind it: it is
+        pulled back to at most MAX_INPUT_LEAD ticks past the match.
+        """
+        if len(self.inputs) < MAX_PENDING_INPUTS:
+            self.inputs.append((min(tick, match_tick + MAX_INPUT_LEAD), actions, counts))
+
+    def take_input(self, tick):
+        """Return (actions, counts) of the oldest input due by this tick, late ones wait for the next ticks"""
+        if not self.inputs or self.inputs[0][0] > tick:
+            return Action.NONE, None
+        input_tick, actions, counts = self.inputs.popleft()
+        self.ack = max(self.ack, input_tick)
+        return actions, counts
+
+    def delta(self):
+        """Return the encoded board if it changed since the last call, else None"""
+        board = self.simulation.board
+        masks = protocol.board_masks(board)
+        changed = [] if masks == self.masks else [y for y, (old, new) in enumerate(zip(self.masks, masks))
+                                                   if old != new]
+        piece = board.current_piece
+        summary = (board.score, board.lines_cleared, board.level, self.garbage, piece.shape_idx, piece.rotation,
+                   piece.x, piece.y, board.next_piece.shape_idx, board.game_over)
+        if not changed and summary == self.summary:
+            return None
+        self.masks = masks
+        self.summary = summary
+        return protocol.encode_board(self.index, board, self.garbage, changed, masks)
+
+
+class Match:
+    def __init__(self, match_id, writers, seed, tick_rate=None, width=None, height=None):
+        self.match_id = match_id
+        self.seed = seed
+        self.tick_rate = tick_rate or config.SERVER_TICK_RATE
+        self.width = width or config.GRID_WIDTH
+        self.height = height or config.GRID_HEIGHT
+        if self.width > protocol.MAX_WIDTH:
+            raise ValueError(f"Boards wider than {protocol.MAX_WIDTH} cannot be sent")
+
+        self.rng = random.Random(seed)  # Garbage holes
+        self.players = [Player(index, writer, Simulation(seed=seed, tick_rate=self.tick_rate, width=self.width,
+                                                         height=self.height))
+                        for index, writer in enumerate(writers)]
+        self.tick = 0
+        self.finished = False
+        self.winner = None
+
+    def start_message(self, player):
+        return protocol.encode_start(protocol.Start(self.match_id, player.index, len(self.players), self.seed,
+                                                    self.tick_rate, self.width, self.height))
+
+    def step(self):
+        """Advance every board by one tick and exchange garbage"""
+        self.tick += 1
+        for player in self.players:
+            if not player.alive:
+                continue
+            board = player.simulation.board
+            placed = board.pieces_placed
+            player.simulation.tick(*player.take_input(self.tick))
+            if board.pieces_placed != placed:
+                self._piece_locked(player)
+
+        alive = [player for player in self.players if player.alive]
+        if len(alive) <= (1 if len(self.players) > 1 else 0):
+            self.finished = True
+            self.winner = alive[0].index if alive else None
+
+    def _piece_locked(self, player):
+        """Send garbage for the lines a player cleared, or raise the garbage waiting for them"""
+        board = player.simulation.board
+        lines = len(board.last_cleared_rows)
+        if lines:
+            attack = config.GARBAGE_LINES.get(lines, 0)
+            # Clearing first cancels garbage on its way in
+            cancelled = min(attack, player.garbage)
+            player.garbage -= cancelled
+            target = self._target(player)
+            if target:
+                target.garbage += attack - cancelled
+        elif player.garbage and not board.game_over:
+            board.add_garbage(player.garbage, self.rng.randrange(board.width))
+            player.garbage = 0
+
+    def _target(self, player):
+        """Next opponent still playing after the given player, None if there is none"""
+        for offset in range(1, len(self.players)):
+            opponent = self.players[(player.index + offset) % len(self.players)]
+            if opponent.alive:
+                return opponent
+        return None
+
+    def frames(self, force=False):
+        """Return (player, FRAME message) for the connected players with anything new, boards encoded once for all"""
+        boards = [encoded for encoded in (player.delta() for player in self.players) if encoded]
+        messages = []
+        for player in self.players:
+            # Nothing changed and no input acknowledged: skip the frame and its send() call
+            if player.connected and (boards or player.ack != player.sent_ack or force):
+                messages.append((player, protocol.encode_frame(self.tick, player.ack, boards)))
+                player.sent_ack = player.ack
+        return messages
+
+
+class VersusServer:
+    def __init__(self, host=None, port=None, tick_rate=None, players_per_match=None, frame_ticks=None, seed=None):
+        self.host = config.SERVER_HOST if host is None else host
+        self.port = config.SERVER_PORT if port is None else port
+        self.tick_rate = tick_rate or config.SERVER_TICK_RATE
+        self.players_per_match = players_per_match or config.PLAYERS_PER_MATCH
+        self.frame_ticks = frame_ticks or config.SERVER_FRAME_TICKS
+        self.rng = random.Random(seed)  # Match seeds
+
+        self.waiting = []  # (reader, writer, future) of players waiting for a match
+        self.matches = {}  # match id -> Match
+        self.next_match_id = 1
+        self.timestep = FixedTimestep(self.tick_rate, config.MAX_CATCH_UP_TICKS)
+        self.tick_times = deque(maxlen=self.tick_rate * 60)  # Seconds each server tick took, last minute
+        self.counters = dict.fromkeys(('matches_started', 'matches_finished', 'dropped_clients'), 0)
+        self.server = None
+        self._ticker = None
+
+    async def start(self):
+        """Start listening and ticking, port 0 picks a free port"""
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._ticker = asyncio.create_task(self._run())
+
+    async def close(self):
+        self._ticker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._ticker
+        self.server.close()
+        for _, writer, future in self.waiting:
+            future.cancel()
+            writer.close()
+        self.waiting.clear()
+        for match in self.matches.values():
+            for player in match.players:
+                player.writer.close()
+        await self.server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        """Pair a client into a match, then queue its inputs until it disconnects"""
+        player = None
+        future = None
+        try:
+            payload = await protocol.read_message(reader)
+            if protocol.JOIN_MESSAGE.unpack(payload) != (protocol.JOIN, protocol.VERSION):
+                return
+            future = asyncio.get_running_loop().create_future()
+            self.waiting.append((reader, writer, future))
+            self._start_match()
+            match, player = await future
+
+            while True:
+                payload = await protocol.read_message(reader)
+                if payload[0] == protocol.INPUT:
+                    player.add_input(*protocol.decode_input(payload), match.tick)
+        except (asyncio.IncompleteReadError, ConnectionError, protocol.ProtocolError, struct.error, ValueError):
+            pass  # Disconnected or sent something undecodable: drop the connection
+        finally:
+            if player:
+                player.connected = False
+            elif future and not future.done():
+                self.waiting.remove((reader, writer, future))
+            writer.close()
+
+    def _start_match(self):
+        """Create a match from the players waiting longest, once enough of them are still connected"""
+        # Nothing reads a waiting client's socket, but its reader still sees the EOF or reset
+        for reader, writer, future in self.waiting:
+            if reader.at_eof() or reader.exception() is not None:
+                future.set_exception(ConnectionResetError("Disconnected while waiting"))
+        self.waiting[:] = [waiter for waiter in self.waiting if not waiter[2].done()]
+        if len(self.waiting) < self.players_per_match:
+            return
+
+        joined = self.waiting[:self.players_per_match]
+        del self.waiting[:self.players_per_match]
+
+        match = Match(self.next_match_id, [writer for _, writer, _ in joined], self.rng.getrandbits(64),
+                      self.tick_rate)
+        self.matches[match.match_id] = match
+        self.next_match_id += 1
+        self.counters['matches_started'] += 1
+        for player, (_, _, future) in zip(match.players, joined):
+            self._send(player, match.start_message(player))
+            future.set_result((match, player))
+
+    async def _run(self):
+        """Tick every match at the server tick rate"""
+        while True:
+            for _ in range(self.timestep.advance()):
+                start = time.perf_counter()
+                self._tick()
+                self.tick_times.append(time.perf_counter() - start)
+            # Sleep until the next tick is due
+            await asyncio.sleep(max(0.0, self.timestep.step - self.timestep.accumulator))
+
+    def _tick(self):
+        """Step every match, send frames and end finished matches"""
+        for match in list(self.matches.values()):
+            match.step()
+            if match.finished or match.tick % self.frame_ticks == 0:
+                for player, message in match.frames(force=match.finished):
+                    self._send(player, message)
+            if match.finished:
+                for player in match.players:
+                    self._send(player, protocol.encode_end(match.tick, match.winner))
+                    player.connected = False
+                    player.writer.close()
+                del self.matches[match.match_id]
+                self.counters['matches_finished'] += 1
+
+    def _send(self, player, message):
+        """Queue a message for a player, dropping clients that stopped reading"""
+        if not player.connected:
+            return
+        if player.writer.transport.get_write_buffer_size() > config.MAX_SEND_BUFFER:
+            player.connected = False
+            player.writer.close()
+            self.counters['dropped_clients'] += 1
+            return
+        player.writer.write(message)
+
+    def stats(self):
+        """Return the match counters, players connected and tick duration percentiles"""
+        stats = dict(self.counters, matches=len(self.matches),
+                     players=sum(player.connected for match in self.matches.values() for player in match.players),
+                     ticks=self.timestep.ticks, dropped_ticks=self.timestep.dropped_ticks)
+        if self.tick_times:
+            stats['tick_ms'] = percentiles(self.tick_times)
+        return stats
+
+
+def format_stats(stats):
+    """Return server stats as one line"""
+    line = (f"matches {stats['matches']} (started {stats['matches_started']}, finished {stats['matches_finished']}), "
+            f"players {stats['players']}, ticks {stats['ticks']}, dropped ticks {stats['dropped_ticks']}, "
+            f"dropped clients {stats['dropped_clients']}")
+    if 'tick_ms' in stats:
+        line += ", tick ms " + " ".join(f"{name} {ms:.2f}" for name, ms in stats['tick_ms'].items())
+    return line
+
+
+async def serve(host, port, duration=None, stats_interval=None):
+    """Run a server until cancelled or for duration seconds, printing stats every stats_interval seconds"""
+    server = VersusServer(host, port)
+    await server.start()
+    print(f"Listening on {server.host}:{server.port}", flush=True)
+    deadline = None if duration is None else time.perf_counter() + duration
+    try:
+        while deadline is None or time.perf_counter() < deadline:
+            await asyncio.sleep(stats_interval or 0.1)
+            if stats_interval:
+                print(format_stats(server.stats()), flush=True)
+    finally:
+        print(format_stats(server.stats()), flush=True)
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the versus match server")
+    parser.add_argument('--host', default=config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVER_PORT, help="0 picks a free port")
+    parser.add_argument('--duration', type=float, help="Stop after this many seconds")
+    parser.add_argument('--stats', type=float, metavar='SECONDS', help="Print stats at this interval")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.duration, args.stats))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,53 +1,70 @@
 import pygame
 import os
+import threading
+import time
 import services.config as config
+from services.music import MusicPlayer
+from services.sfx import SoundScheduler
+
+# Sound effects in loading order: the menus need theirs first, game over last
+SOUND_FILES = [
+    ('menu_move', 'menu_move.wav'),
+    ('menu_select', 'menu_select.wav'),
+    ('rotate', 'rotate.wav'),
+    ('drop', 'drop.wav'),
+    ('line_clear', 'line_clear.wav'),
+    ('tetris', 'tetris.wav'),  # Special sound for 4 lines
+    ('level_up', 'level_up.wav'),
+    ('game_over', 'game_over.wav')
+]
 
 
 class AudioManager:
-    def __init__(self):
-        # Initialize pygame mixer
-        pygame.mixer.init()
+    def __init__(self, background=None):
+        # Initialize pygame mixer, unless pygame.init() already did
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
 
-        # Sound dictionaries
+        # Sound dictionaries; sounds fill in as they load, the board shares the same dict
         self.sounds = {}
         self.music = {}
+        self.loaded = threading.Event()  # Set once every sound effect has been tried
+        self.load_seconds = None  # How long loading the sound effects took
 
-        # Load audio files
-        self._load_sounds()
+        # Load audio files, decoding the sound effects and reading the music behind the first frames
+        background = config.LOAD_SOUNDS_IN_BACKGROUND if background is None else background
         self._load_music()
+        self.music_player = MusicPlayer(self.music, config.MUSIC_VOLUME, config.MUSIC_FADE_IN_MS,
+                                        config.MUSIC_FADE_OUT_MS, preload=background)
+        self.scheduler = SoundScheduler(self.sounds, config.SOUND_CHANNEL_GROUPS, config.SOUND_MIN_INTERVAL_MS)
+        if background:
+            threading.Thread(target=self._load_sounds, name="sound-loader", daemon=True).start()
+        else:
+            self._load_sounds()
 
     def _load_sounds(self):
-        """Load sound effects"""
+        """Load sound effects in SOUND_FILES order"""
+        start = time.perf_counter()
         try:
-            # Create assets directory if it doesn't exist
-            if not os.path.exists(config.ASSETS_DIR):
-                os.makedirs(config.ASSETS_DIR)
-                print(f"Created '{config.ASSETS_DIR}' directory. Please add sound files.")
-                return
-
-            # Define sound files to load
-            sound_files = {
-                'line_clear': 'line_clear.wav',
-                'rotate': 'rotate.wav',
-                'drop': 'drop.wav',
-                'game_over': 'game_over.wav',
-                'tetris': 'tetris.wav',  # Special sound for 4 lines
-                'level_up': 'level_up.wav',
-                'menu_select': 'menu_select.wav',
-                'menu_move': 'menu_move.wav'
-            }
-
             # Load each sound file if it exists
-            for sound_name, file_name in sound_files.items():
+            for sound_name, file_name in SOUND_FILES:
                 file_path = os.path.join(config.ASSETS_DIR, 'sounds', file_name)
                 if os.path.exists(file_path):
-                    self.sounds[sound_name] = pygame.mixer.Sound(file_path)
-                    self.sounds[sound_name].set_volume(config.SOUND_VOLUME)
+                    sound = pygame.mixer.Sound(file_path)
+                    sound.set_volume(config.SOUND_VOLUME)
+                    self.sounds[sound_name] = sound  # Only published once ready to play
                 else:
                     print(f"Sound file not found: {file_path}")
 
         except pygame.error as e:
             print(f"Error loading sounds: {e}")
+        finally:
+            self.load_seconds = time.perf_counter() - start
+            self.loaded.set()
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until the sound effects are loaded; return False if the timeout ran out first"""
+        return self.loaded.wait(timeout)
 
     def _load_music(self):
         """Load music tracks"""
@@ -71,41 +88,42 @@ class AudioManager:
             print(f"Error loading music paths: {e}")
 
     def play_sound(self, sound_name):
-        """Play a sound effect"""
-        if sound_name in self.sounds:
-            self.sounds[sound_name].play()
+        """Play a sound effect at the end of the frame; sounds still loading are skipped silently"""
+        if sound_name in self.sounds or not self.loaded.is_set():
+            self.scheduler.request(sound_name)
         else:
             print(f"Sound '{sound_name}' not found")
 
-    def play_music(self, music_name):
-        """Play a music track with looping"""
-        if music_name in self.music:
-            try:
-                pygame.mixer.music.load(self.music[music_name])
-                pygame.mixer.music.set_volume(config.MUSIC_VOLUME)
-                pygame.mixer.music.play(-1)  # -1 for infinite loop
-            except pygame.error as e:
-                print(f"Error playing music '{music_name}': {e}")
-        else:
-            print(f"Music '{music_name}' not found")
+    def play_music(self, music_name, fade_in_ms=None, fade_out_ms=None):
+        """Play a music track with looping, fading from the current one; the same track keeps playing"""
+        self.music_player.play(music_name, fade_in_ms, fade_out_ms)
 
-    def stop_music(self):
-        """Stop the currently playing music"""
-        pygame.mixer.music.stop()
+    def stop_music(self, fade_out_ms=None):
+        """Fade out and stop the currently playing music"""
+        self.music_player.stop(fade_out_ms)
 
     def pause_music(self):
         """Pause the currently playing music"""
-        pygame.mixer.music.pause()
+        self.music_player.pause()
 
     def unpause_music(self):
         """Unpause the currently playing music"""
-        pygame.mixer.music.unpause()
+        self.music_player.unpause()
+
+    def update(self):
+        """Play the sound effects requested this frame and advance music fades, once per frame"""
+        self.scheduler.flush()
+        self.music_player.update()
+
+    def sound_stats(self):
+        """Voice usage counters of the sound effects, see SoundScheduler.stats"""
+        return self.scheduler.stats()
 
     def set_sound_volume(self, volume):
         """Set the volume for all sound effects"""
-        for sound in self.sounds.values():
+        for sound in list(self.sounds.values()):
             sound.set_volume(volume)
 
     def set_music_volume(self, volume):
         """Set the volume for music"""
-        pygame.mixer.music.set_volume(volume)
\ No newline at end of file
+        self.music_player.set_volume(volume)
\ No newline at end of file
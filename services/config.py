@@ -37,21 +37,103 @@ SCREEN_HEIGHT = BLOCK_SIZE * GRID_HEIGHT
 BASE_DIR = Path(__file__).resolve().parent.parent
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 HIGH_SCORES_FILE = os.path.join(BASE_DIR, 'data', 'high_scores.json')
+HIGH_SCORES_DB = os.path.join(BASE_DIR, 'data', 'high_scores.db')
+
+# Record every game as a binary replay (see core/replay.py)
+RECORD_REPLAYS = True
+REPLAY_DIR = os.path.join(BASE_DIR, 'data', 'replays')
+MAX_REPLAYS = 50  # Newest recordings kept in REPLAY_DIR, older ones are deleted; None keeps them all
 
 # Game settings
 FPS = 60
+
+# Main loop: 'fixed' runs game logic at LOGIC_RATE whatever the render rate,
+# 'frame' runs one logic update per rendered frame, capped at LOGIC_RATE
+LOOP_MODE = 'fixed'
+LOGIC_RATE = 60  # Logic ticks per second
+RENDER_FPS = FPS  # Frame cap in 'fixed' mode, 0 for uncapped
+VSYNC = False  # Let the display limit the frame rate
+MAX_CATCH_UP_TICKS = 5  # Most logic ticks run in one frame after a stall; the rest are dropped
+REPORT_LOOP_STATS = False  # Print tick and frame counters on exit
+
+# Frame profiler (see services/profiler.py)
+PROFILER_ENABLED = False  # Record phase timings from the start; showing the overlay also records
+PROFILER_HOTKEY = 'f3'  # Toggles the on-screen overlay
+PROFILER_FRAMES = 600  # Frames kept for the rolling percentiles
+PROFILER_TRACE_FILE = None  # Where to write the trace on exit (.csv or .json), None to skip
 MAX_HIGH_SCORES = 10
+HIGH_SCORES_WRITE_BEHIND = True  # Save high scores on a background thread instead of during the frame
+HIGH_SCORES_BACKEND = 'json'  # 'json' keeps the top MAX_HIGH_SCORES, 'sqlite' every score (see services/leaderboard.py)
+HIGH_SCORES_MODE = 'classic'  # Game mode scores are filed under in the SQLite leaderboard
 SOUND_VOLUME = 0.6
 MUSIC_VOLUME = 0.5
+MUSIC_FADE_IN_MS = 300  # Fade-in of a new music track
+MUSIC_FADE_OUT_MS = 500  # Fade-out of the old track before switching or stopping
+
+# Sound effects (see services/sfx.py): mixer channels reserved for every group, and the least
+# time between two plays of the same effect; repeats inside it are dropped
+SOUND_CHANNEL_GROUPS = {'movement': 2, 'clears': 2, 'ui': 2}
+SOUND_MIN_INTERVAL_MS = {'rotate': 60, 'drop': 40, 'menu_move': 40}
+REPORT_SOUND_STATS = False  # Print the voice usage counters on exit
+
+# Show the outline of where the current piece will land
+SHOW_GHOST_PIECE = True
+
+# Redraw only the cells and texts that changed during play instead of the whole screen
+DIRTY_RECT_RENDERING = True
+
+# Draw the locked stack from one palette-indexed surface (needs numpy) instead of a rect per cell
+INDEXED_GRID_RENDERING = True
+
+# Build static backgrounds (title, game panel, pause overlay) once and blit them every frame
+CACHE_STATIC_LAYERS = True
+
+# Piece sequence (see core/randomizer.py): 'bag' (7-bag), 'random' (independent draws) or 'nes' (classic reroll)
+PIECE_GENERATOR = 'bag'
+
+# Pieces shown ahead of the current one; the first in the preview box, up to four more below it
+PREVIEW_PIECES = 1
+
+# Board implementation used by the game: 'bitboard' (row bitmasks) or 'list' (list of lists)
+BOARD_BACKEND = 'bitboard'
 
 # Key repeat settings
 KEY_REPEAT_DELAY = 200  # milliseconds before first repeat
 KEY_REPEAT_INTERVAL = 70  # milliseconds between repeats
 
-# Create necessary directories
-os.makedirs(os.path.dirname(HIGH_SCORES_FILE), exist_ok=True)
-os.makedirs(os.path.join(ASSETS_DIR, 'sounds'), exist_ok=True)
-os.makedirs(os.path.join(ASSETS_DIR, 'music'), exist_ok=True)
+# Held key auto-repeat in milliseconds (see core/input.py): das before the first
+# sideways repeat, arr between sideways repeats (0 slides to the wall) and
+# soft_drop between rows while soft dropping (0 drops to the stack)
+INPUT_SETTINGS = {'das': KEY_REPEAT_DELAY, 'arr': KEY_REPEAT_INTERVAL, 'soft_drop': KEY_REPEAT_INTERVAL}
+
+# Per-player overrides of INPUT_SETTINGS, by player name, e.g. {'Alex': {'arr': 0}}
+PLAYER_INPUT_SETTINGS = {}
+
+# Startup
+LOAD_SOUNDS_IN_BACKGROUND = True  # Show the title screen while the sound effects load
+REPORT_STARTUP_TIME = False  # Print the time to the first frame (same as --startup-report)
+
+# Limits checked by main.py --profile-startup, in milliseconds: 'imports' is every module imported,
+# 'first_frame' the time to the first frame, any other key the import time of that top-level package
+STARTUP_BUDGETS_MS = {'imports': 800, 'first_frame': 2000, 'core': 60, 'ui': 40, 'services': 40}
+
+# Versus server (net/server.py)
+SERVER_HOST = '0.0.0.0'  # Listen on every interface so players on the local network can join
+SERVER_PORT = 7777
+SERVER_TICK_RATE = 60  # Simulation ticks per second of every match
+SERVER_FRAME_TICKS = 2  # Send the state of a match every this many ticks
+PLAYERS_PER_MATCH = 2
+MAX_SEND_BUFFER = 256 * 1024  # Bytes queued for a client before it is dropped as too slow
+GARBAGE_LINES = {2: 1, 3: 2, 4: 4}  # Garbage rows sent for clearing this many lines at once
+GARBAGE_COLOR = LIGHT_GRAY
+
+
+def ensure_directories():
+    """Create the data and asset directories the game writes to or looks in"""
+    os.makedirs(os.path.dirname(HIGH_SCORES_FILE), exist_ok=True)
+    os.makedirs(os.path.join(ASSETS_DIR, 'sounds'), exist_ok=True)
+    os.makedirs(os.path.join(ASSETS_DIR, 'music'), exist_ok=True)
+
 
 # Helper functions
 def get_drop_speed(level):
@@ -1,15 +1,55 @@
 import json
 import os
+import tempfile
+import threading
+from bisect import bisect_right
 from datetime import datetime
 import services.config as config
 
 
-class HighScoreManager:
-    def __init__(self):
-        self.high_scores_file = config.HIGH_SCORES_FILE
-        self.max_scores = config.MAX_HIGH_SCORES
+def create_high_score_manager():
+    """Create the high score store selected in config.HIGH_SCORES_BACKEND"""
+    if config.HIGH_SCORES_BACKEND == 'sqlite':
+        from services.leaderboard import SQLiteLeaderboard
+        return SQLiteLeaderboard()
+    return HighScoreManager()
 
-    def load_scores(self):
+
+class HighScoreManager:
+    """High score table kept in memory and written to disk behind the game.
+
+    The file is read once. Scores are kept sorted (best first) next to a list
+    of negated scores, so ranks and inserts are a bisect. Every change is
+    persisted by a background thread that replaces the file atomically;
+    call flush() or close() before exiting to make sure it reached the disk.
+    """
+
+    def __init__(self, high_scores_file=None, max_scores=None, write_behind=None):
+        self.high_scores_file = high_scores_file or config.HIGH_SCORES_FILE
+        self.max_scores = max_scores or config.MAX_HIGH_SCORES
+        self.write_behind = config.HIGH_SCORES_WRITE_BEHIND if write_behind is None else write_behind
+
+        self.scores = []  # Entries sorted by score, best first; equal scores keep insertion order
+        self._keys = []  # -score of every entry, ascending, for bisect
+
+        # Write-behind state: the writer saves until saved_version catches up with version
+        self._lock = threading.Condition()
+        self._version = 0
+        self._saved_version = 0
+        self._writer = None
+        self._closed = False
+
+        self.reload()
+
+    def reload(self):
+        """Read the high score file again, replacing the scores in memory"""
+        scores = self._read()
+        scores.sort(key=lambda entry: entry['score'], reverse=True)
+        with self._lock:
+            self.scores = scores
+            self._keys = [-entry['score'] for entry in scores]
+
+    def _read(self):
         """Load high scores from file"""
         try:
             if os.path.exists(self.high_scores_file):
@@ -21,56 +61,121 @@ class HighScoreManager:
             print(f"Error loading high scores: {e}")
             return []
 
-    def save_score(self, score, player_name):
-        """Save a new high score and return the updated list"""
-        try:
-            high_scores = self.load_scores()
-
-            # Add new score with player name
-            new_score = {
-                'score': score,
-                'name': player_name,
-                'date': datetime.now().strftime("%Y-%m-%d")
-            }
-
-            high_scores.append(new_score)
+    def load_scores(self):
+        """Return the high scores, best first"""
+        with self._lock:
+            return list(self.scores)
 
-            # Sort by score in descending order
-            high_scores = sorted(high_scores, key=lambda x: x['score'], reverse=True)
+    def save_score(self, score, player_name):
+        """Add a new high score and return the updated list; the file is written in the background"""
+        new_score = {
+            'score': score,
+            'name': player_name,
+            'date': datetime.now().strftime("%Y-%m-%d")
+        }
+
+        with self._lock:
+            # After any equal scores, like a stable sort of the appended entry
+            index = bisect_right(self._keys, -score)
+            self.scores.insert(index, new_score)
+            self._keys.insert(index, -score)
 
             # Keep only top scores
-            high_scores = high_scores[:self.max_scores]
-
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.high_scores_file), exist_ok=True)
+            del self.scores[self.max_scores:]
+            del self._keys[self.max_scores:]
 
-            # Save to file
-            with open(self.high_scores_file, 'w') as f:
-                json.dump(high_scores, f)
+            self._version += 1
+            high_scores = list(self.scores)
 
-            return high_scores
-        except Exception as e:
-            print(f"Error saving high score: {e}")
-            return []
+        self._schedule_write()
+        return high_scores
 
     def is_high_score(self, score):
         """Check if a score qualifies as a high score"""
-        high_scores = self.load_scores()
-
-        if len(high_scores) < self.max_scores:
-            return True
+        with self._lock:
+            if len(self.scores) < self.max_scores:
+                return True
 
-        return score > high_scores[-1]['score']
+            return score > self.scores[-1]['score']
 
     def get_rank(self, score):
         """Get the rank of a score in the high scores list"""
-        high_scores = self.load_scores()
-
-        for i, hs in enumerate(high_scores):
-            if score > hs['score']:
-                return i + 1
-
-        if len(high_scores) < self.max_scores:
-            return len(high_scores) + 1
+        with self._lock:
+            # Entries scoring at least as much rank above
+            index = bisect_right(self._keys, -score)
+
+        if index < self.max_scores:
+            return index + 1
+
+        return None
+
+    def _schedule_write(self):
+        """Persist the latest change, on the writer thread unless write-behind is off"""
+        if not self.write_behind:
+            self._write_pending()
+            return
+
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._closed = False
+                self._writer = threading.Thread(target=self._write_loop, name="high-score-writer", daemon=True)
+                self._writer.start()
+            self._lock.notify_all()
+
+    def _write_loop(self):
+        """Writer thread: save whenever the scores changed, until closed"""
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._saved_version != self._version or self._closed)
+                if self._saved_version == self._version:
+                    return
+            self._write_pending()
+
+    def _write_pending(self):
+        """Write the current scores if they changed since the last write"""
+        with self._lock:
+            version = self._version
+            if version == self._saved_version:
+                return
+            # Several saves in a row are written once, with the newest list
+            high_scores = list(self.scores)
+
+        self._write(high_scores)
+
+        with self._lock:
+            self._saved_version = max(self._saved_version, version)
+            self._lock.notify_all()
+
+    def _write(self, high_scores):
+        """Replace the high score file atomically through a temporary file in the same directory"""
+        directory = os.path.dirname(self.high_scores_file)
+        temp_path = None
+        try:
+            # Ensure directory exists
+            os.makedirs(directory, exist_ok=True)
 
-        return None
\ No newline at end of file
+            with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+                temp_path = f.name
+                json.dump(high_scores, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.high_scores_file)
+        except Exception as e:
+            print(f"Error saving high score: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def flush(self, timeout=None):
+        """Wait until every change so far is on disk; return False if the timeout ran out first"""
+        with self._lock:
+            return self._lock.wait_for(lambda: self._saved_version == self._version, timeout)
+
+    def close(self):
+        """Write any pending change and stop the writer thread"""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+            writer = self._writer
+        if writer:
+            writer.join()
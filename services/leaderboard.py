@@ -0,0 +1,250 @@
+"""SQLite leaderboard keeping every score ever played.
+
+SQLiteLeaderboard has the HighScoreManager interface, so the game can use
+either (config.HIGH_SCORES_BACKEND), and adds queries over the full
+history: top-N per mode, a player's personal best, the rank of any score
+and daily or weekly boards. Every query goes through an index on
+(mode, score), (player, mode, score) or (mode, created); nothing loads the
+whole table.
+
+The database runs in WAL mode with synchronous=NORMAL, so saving a score
+appends to the log without waiting for an fsync. Bulk loads use add_many(),
+which inserts in batches inside one transaction per batch.
+
+Import the JSON high score file (done automatically when the database is
+created) or query the board with: python -m services.leaderboard --help
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+import services.config as config
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_mode_score ON scores (mode, score DESC);
+CREATE INDEX IF NOT EXISTS scores_player_score ON scores (player, mode, score DESC);
+CREATE INDEX IF NOT EXISTS scores_mode_created ON scores (mode, created);
+"""
+
+
+def _entry(row):
+    """Turn a (player, score, created) row into a high score entry like the JSON file's"""
+    player, score, created = row
+    return {
+        'score': score,
+        'name': player,
+        'date': datetime.fromtimestamp(created).strftime("%Y-%m-%d")
+    }
+
+
+class SQLiteLeaderboard:
+    def __init__(self, path=None, max_scores=None, mode=None, migrate_from=None):
+        self.path = path or config.HIGH_SCORES_DB
+        self.max_scores = max_scores or config.MAX_HIGH_SCORES
+        self.mode = mode or config.HIGH_SCORES_MODE
+        self._counts = {}  # Rows per mode, counted on first use and kept up to date by _insert
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA cache_size=-65536")  # 64 MB, keeps the indexes hot during bulk inserts
+
+        # A new database starts with the scores of the JSON file
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            with self.connection:
+                self.connection.executescript(SCHEMA)
+                self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            source = config.HIGH_SCORES_FILE if migrate_from is None else migrate_from
+            if source and os.path.exists(source):
+                self.migrate_json(source)
+
+    def add_many(self, entries, batch_size=50000):
+        """Insert (player, score, created[, mode]) tuples in batches and return how many were added"""
+        count = 0
+        batch = []
+        for entry in entries:
+            batch.append(entry if len(entry) == 4 else (*entry, self.mode))
+            if len(batch) >= batch_size:
+                count += self._insert(batch)
+                batch = []
+        if batch:
+            count += self._insert(batch)
+        return count
+
+    def _insert(self, rows):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO scores (player, score, created, mode) VALUES (?, ?, ?, ?)", rows)
+        for mode in self._counts:
+            self._counts[mode] += sum(1 for row in rows if row[3] == mode)
+        return len(rows)
+
+    def migrate_json(self, path):
+        """Import the entries of a JSON high score file and return how many were imported"""
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"Error migrating high scores: {e}")
+            return 0
+
+        rows = []
+        for entry in entries:
+            try:
+                created = datetime.strptime(entry['date'], "%Y-%m-%d").timestamp()
+            except (KeyError, ValueError):
+                created = time.time()
+            rows.append((entry.get('name', ""), entry['score'], created))
+        return self.add_many(rows)
+
+    # Queries over the whole history
+
+    def top(self, count=None, mode=None, since=None, until=None):
+        """Return the best count entries of a mode, optionally only those played from since to before until"""
+        mode = mode or self.mode
+        count = count or self.max_scores
+        if since is None and until is None:
+            query = "SELECT player, score, created FROM scores WHERE mode = ?"
+            params = [mode]
+        else:
+            since = float('-inf') if since is None else since
+            until = float('inf') if until is None else until
+            index = self._window_index(mode, since, until, count)
+            query = (f"SELECT player, score, created FROM scores INDEXED BY {index} "
+                     "WHERE mode = ? AND created >= ? AND created < ?")
+            params = [mode, since, until]
+        query += " ORDER BY score DESC, id LIMIT ?"
+        params.append(count)
+        return [_entry(row) for row in self.connection.execute(query, params)]
+
+    def _window_index(self, mode, since, until, count):
+        """Pick the index for a time-window board.
+
+        Reading the window through (mode, created) and sorting it costs the
+        rows in the window; walking (mode, score) until count of them fall
+        in the window costs about count / (window share of the history).
+        SQLite has no statistics to tell the two apart, so estimate both
+        assuming the mode's scores are spread evenly between its oldest and
+        newest one.
+        """
+        # Separate subqueries, SQLite only reads a single MIN or MAX straight from the index
+        oldest, newest = self.connection.execute(
+            "SELECT (SELECT MIN(created) FROM scores WHERE mode = ?), (SELECT MAX(created) FROM scores WHERE mode = ?)",
+            (mode, mode)).fetchone()
+        if oldest is None:
+            return 'scores_mode_score'
+        window = min(until, newest) - max(since, oldest)
+        if window < 0 or (window == 0 and not since <= oldest < until):
+            return 'scores_mode_created'  # Nothing in the window
+        share = window / (newest - oldest) if newest > oldest else 1.0
+        if share == 0 or self._mode_count(mode) * share < count / share:
+            return 'scores_mode_created'
+        return 'scores_mode_score'
+
+    def _mode_count(self, mode):
+        """Number of scores of a mode"""
+        if mode not in self._counts:
+            self._counts[mode] = self.connection.execute(
+                "SELECT COUNT(*) FROM scores WHERE mode = ?", (mode,)).fetchone()[0]
+        return self._counts[mode]
+
+    def daily(self, count=None, mode=None, now=None):
+        """Return the best entries played on the day of now (today by default)"""
+        start = datetime.fromtimestamp(now or time.time()).replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.top(count, mode, start.timestamp(), (start + timedelta(days=1)).timestamp())
+
+    def weekly(self, count=None, mode=None, now=None):
+        """Return the best entries played in the week (from Monday) of now, this week by default"""
+        today = datetime.fromtimestamp(now or time.time()).replace(hour=0, minute=0, second=0, microsecond=0)
+        start = today - timedelta(days=today.weekday())
+        return self.top(count, mode, start.timestamp(), (start + timedelta(days=7)).timestamp())
+
+    def personal_best(self, player, mode=None):
+        """Return the best entry of a player, or None if they never played the mode"""
+        row = self.connection.execute(
+            "SELECT player, score, created FROM scores WHERE player = ? AND mode = ? "
+            "ORDER BY score DESC, id LIMIT 1", (player, mode or self.mode)).fetchone()
+        return _entry(row) if row else None
+
+    def rank(self, score, mode=None, limit=None):
+        """Return the rank a score would get among all scores of a mode, counting at most limit entries"""
+        query = "SELECT 1 FROM scores WHERE mode = ? AND score >= ?"
+        params = [mode or self.mode, score]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0] + 1
+
+    # HighScoreManager interface, over the top max_scores of the current mode
+
+    def load_scores(self):
+        """Return the high scores, best first"""
+        return self.top()
+
+    def save_score(self, score, player_name):
+        """Save a new high score and return the updated list"""
+        try:
+            self._insert([(player_name, score, time.time(), self.mode)])
+        except sqlite3.Error as e:
+            print(f"Error saving high score: {e}")
+        return self.top()
+
+    def is_high_score(self, score):
+        """Check if a score qualifies as a high score"""
+        row = self.connection.execute(
+            "SELECT score FROM scores WHERE mode = ? ORDER BY score DESC LIMIT 1 OFFSET ?",
+            (self.mode, self.max_scores - 1)).fetchone()
+        return row is None or score > row[0]
+
+    def get_rank(self, score):
+        """Get the rank of a score in the high scores list"""
+        rank = self.rank(score, limit=self.max_scores)
+        return rank if rank <= self.max_scores else None
+
+    def flush(self, timeout=None):
+        """Scores are committed as they are saved"""
+        return True
+
+    def close(self):
+        self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the SQLite leaderboard")
+    parser.add_argument('--db', default=None, help="Database file (default: config.HIGH_SCORES_DB)")
+    parser.add_argument('--mode', default=None)
+    parser.add_argument('--migrate', metavar='JSON', help="Import a JSON high score file")
+    parser.add_argument('--board', choices=('all', 'daily', 'weekly'), default='all')
+    parser.add_argument('--player', help="Show a player's personal best")
+    parser.add_argument('--count', type=int, default=10)
+    args = parser.parse_args()
+
+    leaderboard = SQLiteLeaderboard(args.db, mode=args.mode)
+    if args.migrate:
+        print(f"Imported {leaderboard.migrate_json(args.migrate)} scores from {args.migrate}")
+
+    if args.player:
+        best = leaderboard.personal_best(args.player)
+        print(f"{args.player}: {best['score']} on {best['date']}" if best else f"{args.player}: no scores")
+    else:
+        board = {'all': leaderboard.top, 'daily': leaderboard.daily, 'weekly': leaderboard.weekly}[args.board]
+        for rank, entry in enumerate(board(args.count), 1):
+            print(f"{rank:>3}. {entry['name']:<20} {entry['score']:>10} {entry['date']}")
+    leaderboard.close()
+
+
+if __name__ == '__main__':
+    main()
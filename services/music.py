@@ -0,0 +1,144 @@
+"""Music playback that never touches the disk during a frame.
+
+pygame.mixer.music streams one track at a time. MusicPlayer keeps the
+encoded bytes of every track in memory, read ahead by a background thread,
+and loads the mixer from them. A transition fades the playing track out,
+switches to the buffered track and fades it in, stepping the volume in
+update() once per frame instead of blocking. Asking for the track that is
+already playing or queued does nothing, so screens sharing a theme keep it
+playing without a reload.
+"""
+import io
+import os
+import threading
+import time
+
+import pygame
+
+
+class MusicPlayer:
+    def __init__(self, tracks, volume=1.0, fade_in_ms=0, fade_out_ms=0, preload=True, music=None,
+                 clock=time.perf_counter):
+        self.tracks = tracks  # name -> file path, in preloading order
+        self.volume = volume
+        self.fade_in_ms = fade_in_ms
+        self.fade_out_ms = fade_out_ms
+        self.music = music or pygame.mixer.music
+        self.clock = clock
+
+        self.data = {}  # name -> encoded track bytes
+        self.loaded = threading.Event()  # Set once every track has been read
+        self.current = None  # Track loaded in the mixer
+        self.target = None  # Track that should be playing next, None for silence
+        self.level = 0.0  # Fade multiplier of volume, 0 to 1
+        self.fade = None  # (from level, to level, start time, duration) of the running fade
+        self._fade_in_ms = fade_in_ms  # Fade-in of the track being switched to
+        self.paused = False
+
+        if preload:
+            threading.Thread(target=self._read_all, name="music-loader", daemon=True).start()
+        else:
+            self._read_all()
+
+    def _read_all(self):
+        """Read every track into memory"""
+        try:
+            for name, path in self.tracks.items():
+                try:
+                    with open(path, 'rb') as f:
+                        self.data[name] = f.read()
+                except OSError as e:
+                    print(f"Error loading music '{name}': {e}")
+        finally:
+            self.loaded.set()
+
+    def play(self, name, fade_in_ms=None, fade_out_ms=None):
+        """Switch to a track, fading out the current one first"""
+        if name not in self.tracks:
+            print(f"Music '{name}' not found")
+            return
+        if name == self.target:
+            return  # Already playing or on its way
+        if self.paused:
+            self.unpause()
+
+        self.target = name
+        self._fade_in_ms = self.fade_in_ms if fade_in_ms is None else fade_in_ms
+        if name == self.current:
+            # Still loaded and fading out: bring it back instead of reloading
+            self._fade_to(1.0, self._fade_in_ms)
+        else:
+            self._fade_to(0.0, self.fade_out_ms if fade_out_ms is None else fade_out_ms)
+        self.update()
+
+    def stop(self, fade_out_ms=None):
+        """Fade the music out and stop it"""
+        if self.paused:
+            self.unpause()
+        self.target = None
+        self._fade_to(0.0, self.fade_out_ms if fade_out_ms is None else fade_out_ms)
+        self.update()
+
+    def pause(self):
+        self.paused = True
+        self.music.pause()
+
+    def unpause(self):
+        self.paused = False
+        self.music.unpause()
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self.music.set_volume(self.volume * self.level)
+
+    def _fade_to(self, level, duration_ms):
+        """Start moving the fade level towards level over duration_ms"""
+        if self.current is None or duration_ms <= 0:
+            self.level = level
+            self.fade = None
+        else:
+            self.fade = (self.level, level, self.clock(), duration_ms / 1000)
+
+    def update(self):
+        """Advance fades and track switches; call once per frame"""
+        if self.paused:
+            return
+
+        if self.fade:
+            start_level, end_level, start, duration = self.fade
+            progress = (self.clock() - start) / duration
+            if progress >= 1.0:
+                self.level = end_level
+                self.fade = None
+            else:
+                self.level = start_level + (end_level - start_level) * progress
+            self.music.set_volume(self.volume * self.level)
+
+        # Switch tracks once the old one has faded out
+        if self.fade is None and self.level == 0.0 and self.current != self.target:
+            if self.current is not None:
+                self.music.stop()
+                self.current = None
+            if self.target is not None and self._start(self.target):
+                self._fade_to(1.0, self._fade_in_ms)
+                self.music.set_volume(self.volume * self.level)
+
+    def _start(self, name):
+        """Load a buffered track into the mixer and play it looped; False if it is not read yet"""
+        data = self.data.get(name)
+        if data is None:
+            if self.loaded.is_set():
+                self.target = None  # The file could not be read
+            return False
+
+        try:
+            self.music.load(io.BytesIO(data), os.path.splitext(self.tracks[name])[1].lstrip('.'))
+            self.music.set_volume(0.0)
+            self.music.play(-1)  # -1 for infinite loop
+        except pygame.error as e:
+            print(f"Error playing music '{name}': {e}")
+            self.target = None
+            return False
+
+        self.current = name
+        return True
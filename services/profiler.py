@@ -0,0 +1,94 @@
+"""Per-frame profiler for the main loop.
+
+Each frame is split into phases by calling mark(name) when a phase ends: the
+time since the previous mark is added to that phase. Samples live in a fixed
+size ring buffer per phase, from which rolling percentiles are computed, and
+the buffer can be written out as a CSV or JSON trace.
+
+When disabled every call returns after a single attribute check, so the
+instrumentation can stay in production builds.
+"""
+import csv
+import json
+import os
+import time
+from array import array
+
+# Phases of a frame, in the order they are marked
+PHASES = ('events', 'update', 'render', 'present', 'idle')
+
+# Percentiles reported by stats()
+PERCENTILES = (50, 95, 99)
+
+
+def percentiles(values):
+    """Return p50/p95/p99/max of samples in seconds, as milliseconds"""
+    values = sorted(values)
+    stats = {f'p{p}': values[min(len(values) - 1, len(values) * p // 100)] * 1000 for p in PERCENTILES}
+    stats['max'] = values[-1] * 1000
+    return stats
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, size=600, clock=time.perf_counter):
+        self.enabled = enabled
+        self.size = size  # Frames kept in the ring buffer
+        self.clock = clock
+        self.samples = {name: array('d', [0.0]) * size for name in PHASES + ('frame',)}
+        self.index = 0  # Slot of the frame being recorded
+        self.count = 0  # Frames recorded, up to size
+        self.frame_start = None
+        self.last_mark = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last_mark = self.clock()
+        for samples in self.samples.values():
+            samples[self.index] = 0.0
+
+    def mark(self, name):
+        """End the current phase, adding the time since the last mark to it"""
+        if not self.enabled or self.last_mark is None:
+            return
+        now = self.clock()
+        self.samples[name][self.index] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.samples['frame'][self.index] = self.clock() - self.frame_start
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.frame_start = self.last_mark = None
+
+    def frames(self):
+        """Return the recorded frames, oldest first, as dicts of seconds per phase"""
+        start = self.index - self.count
+        slots = [(start + i) % self.size for i in range(self.count)]
+        return [{name: samples[slot] for name, samples in self.samples.items()} for slot in slots]
+
+    def stats(self):
+        """Return p50/p95/p99/max milliseconds per phase over the frames in the buffer"""
+        stats = {}
+        for name, samples in self.samples.items():
+            values = samples[:self.count] if self.count < self.size else samples
+            if values:
+                stats[name] = percentiles(values)
+        return stats
+
+    def dump(self, path):
+        """Write the recorded frames to a .csv or .json file, in milliseconds"""
+        frames = [{name: value * 1000 for name, value in frame.items()} for frame in self.frames()]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=PHASES + ('frame',))
+                writer.writeheader()
+                writer.writerows(frames)
+            else:
+                json.dump({'summary': self.stats(), 'frames': frames}, f, indent=2)
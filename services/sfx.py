@@ -0,0 +1,103 @@
+"""Sound effect scheduling over reserved mixer channels.
+
+Game code asks for effects by name with request(). Requests are collected
+during the frame and played together by flush(), once per frame:
+
+- identical requests within a frame are coalesced into one voice,
+- an effect played less than its minimum interval ago is dropped,
+- every effect category (movement, clears, UI) plays on its own reserved
+  group of channels, so a burst of one kind can never take the voices of
+  another; when a group is full its oldest voice is cut.
+
+stats() reports how many voices were played, coalesced, rate limited,
+stolen or skipped because the sound was not loaded yet.
+"""
+import time
+
+import pygame
+
+# Channel group of every sound effect, anything else plays as 'ui'
+CATEGORIES = {
+    'rotate': 'movement',
+    'drop': 'movement',
+    'line_clear': 'clears',
+    'tetris': 'clears',
+    'level_up': 'clears',
+    'game_over': 'ui',
+    'menu_move': 'ui',
+    'menu_select': 'ui'
+}
+
+
+class SoundScheduler:
+    def __init__(self, sounds, groups, min_interval_ms=None, categories=CATEGORIES, clock=time.perf_counter):
+        self.sounds = sounds  # name -> pygame.mixer.Sound, may fill in while loading
+        self.categories = categories
+        self.min_interval = {name: ms / 1000 for name, ms in (min_interval_ms or {}).items()}
+        self.clock = clock
+
+        # Reserve the first channels for the groups so Sound.play() elsewhere cannot take them
+        total = sum(groups.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.groups = {}
+        first = 0
+        for group, count in groups.items():
+            self.groups[group] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+
+        self.pending = {}  # name -> None, requests of this frame in order
+        self.last_played = {}  # name -> clock time it last started
+        self.started = {group: [float('-inf')] * len(channels) for group, channels in self.groups.items()}
+        self.counters = dict.fromkeys(('requested', 'played', 'coalesced', 'rate_limited', 'stolen', 'not_loaded'), 0)
+        self.peak_voices = dict.fromkeys(self.groups, 0)
+
+    def request(self, name):
+        """Ask for an effect to play at the end of the frame"""
+        self.counters['requested'] += 1
+        if name in self.pending:
+            self.counters['coalesced'] += 1
+        else:
+            self.pending[name] = None
+
+    def flush(self):
+        """Play the effects requested this frame"""
+        if not self.pending:
+            return
+        now = self.clock()
+        for name in self.pending:
+            sound = self.sounds.get(name)
+            if sound is None:
+                self.counters['not_loaded'] += 1
+                continue
+            if now - self.last_played.get(name, float('-inf')) < self.min_interval.get(name, 0):
+                self.counters['rate_limited'] += 1
+                continue
+            group = self.categories.get(name, 'ui')
+            self._play(sound, group if group in self.groups else 'ui', now)
+            self.last_played[name] = now
+        self.pending.clear()
+
+    def _play(self, sound, group, now):
+        """Play a sound on a free channel of its group, or cut the group's oldest voice"""
+        channels = self.groups[group]
+        started = self.started[group]
+        busy = [channel.get_busy() for channel in channels]
+        if all(busy):
+            index = started.index(min(started))
+            self.counters['stolen'] += 1
+        else:
+            index = busy.index(False)
+        channels[index].play(sound)
+        started[index] = now
+        self.counters['played'] += 1
+        self.peak_voices[group] = max(self.peak_voices[group], sum(busy) + (0 if all(busy) else 1))
+
+    def voices(self):
+        """Return the number of voices playing in every group"""
+        return {group: sum(channel.get_busy() for channel in channels) for group, channels in self.groups.items()}
+
+    def stats(self):
+        """Return the counters, the voices playing now and the most voices each group used at once"""
+        return dict(self.counters, voices=self.voices(), peak_voices=dict(self.peak_voices))
@@ -0,0 +1,100 @@
+"""Startup profiling: import-time breakdown and budget checks.
+
+Runs the game once in a child process under `python -X importtime`, quits
+after the first frame and reports where the startup time went: the modules
+that took longest to import, the import time of every top-level package
+and the time to the first frame. Each figure can have a budget in
+config.STARTUP_BUDGETS_MS; exceeding any of them is a failure, so the check
+can gate CI.
+
+Run with: python main.py --profile-startup
+"""
+import os
+import re
+import subprocess
+import sys
+from collections import namedtuple
+
+import services.config as config
+
+# One line of -X importtime output; times in microseconds, depth from the indentation
+ImportRow = namedtuple('ImportRow', 'module self_us cumulative_us depth')
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+FIRST_FRAME_LINE = re.compile(r"First frame after (\d+) ms")
+
+
+def parse_importtime(text):
+    """Return the ImportRows of -X importtime output, ignoring any other lines"""
+    rows = []
+    for line in text.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append(ImportRow(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def package_times(rows):
+    """Return {top-level package: ms spent importing its own modules}"""
+    totals = {}
+    for row in rows:
+        package = row.module.split('.')[0]
+        totals[package] = totals.get(package, 0) + row.self_us / 1000
+    return totals
+
+
+def measure(rows, first_frame_ms=None):
+    """Return the figures budgets apply to: 'imports' (all modules), every package and 'first_frame'"""
+    figures = package_times(rows)
+    figures['imports'] = sum(row.self_us for row in rows) / 1000
+    if first_frame_ms is not None:
+        figures['first_frame'] = first_frame_ms
+    return figures
+
+
+def check_budgets(figures, budgets):
+    """Return [(name, ms, budget ms)] for every figure over its budget"""
+    return [(name, figures[name], budget) for name, budget in budgets.items()
+            if name in figures and figures[name] > budget]
+
+
+def format_report(rows, figures, top=15):
+    """Return the slowest modules, the package totals and the overall figures as text"""
+    lines = [f"{'slowest modules':<40} {'self':>9} {'cumulative':>11}"]
+    for row in sorted(rows, key=lambda row: row.self_us, reverse=True)[:top]:
+        lines.append(f"{row.module:<40} {row.self_us / 1000:7.1f}ms {row.cumulative_us / 1000:9.1f}ms")
+
+    packages = package_times(rows)
+    lines.append("")
+    lines.append(f"{'packages':<40} {'self':>9}")
+    for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"{package:<40} {ms:7.1f}ms")
+
+    lines.append("")
+    lines.append(f"{len(rows)} modules imported in {figures['imports']:.0f} ms")
+    if 'first_frame' in figures:
+        lines.append(f"First frame after {figures['first_frame']:.0f} ms")
+    return "\n".join(lines)
+
+
+def profile_startup(budgets=None, top=15):
+    """Profile one launch of the game, print the report and return the exit status (1 if over budget)"""
+    budgets = config.STARTUP_BUDGETS_MS if budgets is None else budgets
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join(config.BASE_DIR, 'main.py'), '--startup-report',
+         '--frames', '1'],
+        cwd=config.BASE_DIR, capture_output=True, text=True)
+    if result.returncode:
+        print(result.stdout + result.stderr)
+        return result.returncode
+
+    match = FIRST_FRAME_LINE.search(result.stdout)
+    rows = parse_importtime(result.stderr)
+    figures = measure(rows, int(match.group(1)) if match else None)
+    print(format_report(rows, figures, top))
+
+    failures = check_budgets(figures, budgets)
+    for name, ms, budget in failures:
+        print(f"Over budget: {name} took {ms:.0f} ms, budget {budget} ms")
+    return 1 if failures else 0
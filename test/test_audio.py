@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+pygame = pytest.importorskip('pygame')
+
+import services.audio as audio
+from services.audio import SOUND_FILES, AudioManager
+
+
+class TestAudioManager:
+    def setup_method(self):
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            pytest.skip("No audio device")
+
+    def teardown_method(self):
+        pygame.mixer.quit()
+
+    def test_sounds_load_in_priority_order(self, monkeypatch):
+        """Test that the sound effects load on a background thread, menu sounds first"""
+        loaded = []
+
+        class RecordingSound:
+            def __init__(self, path):
+                loaded.append(os.path.basename(path))
+
+            def set_volume(self, volume):
+                pass
+
+        monkeypatch.setattr(audio.os.path, 'exists', lambda path: True)
+        monkeypatch.setattr(audio.pygame.mixer, 'Sound', RecordingSound)
+        manager = AudioManager(background=True)
+
+        assert manager.wait_until_loaded(5)
+        assert loaded == [file_name for _, file_name in SOUND_FILES]
+        assert list(manager.sounds) == [name for name, _ in SOUND_FILES]
+
+    def test_sounds_still_loading_are_skipped(self, monkeypatch, capsys):
+        """Test that playing a sound before it has loaded does nothing and prints nothing"""
+        release = threading.Event()
+
+        class SlowSound:
+            def __init__(self, path):
+                release.wait(5)
+
+            def set_volume(self, volume):
+                pass
+
+            def play(self):
+                pass
+
+        monkeypatch.setattr(audio.os.path, 'exists', lambda path: True)
+        monkeypatch.setattr(audio.pygame.mixer, 'Sound', SlowSound)
+        manager = AudioManager(background=True)
+
+        manager.play_sound('menu_move')
+        assert not manager.loaded.is_set()
+        assert 'not found' not in capsys.readouterr().out
+
+        release.set()
+        assert manager.wait_until_loaded(5)
+        manager.play_sound('menu_move')
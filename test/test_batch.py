@@ -0,0 +1,67 @@
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip('numpy')
+
+from core.batch import BatchEngine
+from core.rules import calculate_score
+from core.simulation import Action
+
+
+class TestBatchEngine:
+    def test_init(self):
+        """Test batch initialization"""
+        engine = BatchEngine(8, seed=0)
+        assert engine.boards.shape == (8, engine.height, engine.width)
+        assert not engine.boards.any()
+        assert (engine.level == 1).all()
+        assert not engine.game_over.any()
+
+    def test_move_and_walls(self):
+        """Test horizontal moves stop at the walls"""
+        engine = BatchEngine(4, seed=0)
+        for _ in range(engine.width):
+            engine.step(np.full(4, Action.MOVE_LEFT))
+        assert (engine.x == 0).all()
+
+    def test_hard_drop_lands_on_floor(self):
+        """Test that a hard drop fills cells in the bottom row and spawns a new piece"""
+        engine = BatchEngine(16, seed=1)
+        engine.step(np.full(16, Action.HARD_DROP))
+
+        assert engine.boards[:, -1].any(axis=1).all()
+        assert (engine.pieces_placed == 1).all()
+        assert (engine.score > 0).all()
+
+    def test_line_clear_scoring(self):
+        """Test that line clears use the shared scoring rules and compact the stack"""
+        engine = BatchEngine(2, seed=2)
+        engine.piece[:] = 0  # I-piece
+        engine.rotation[:] = 0
+        engine.x[:] = 0
+        engine.y[:] = 0
+
+        # Two rows missing their four left cells, a marker block above them
+        engine.boards[:, -2:, 4:] = 1
+        engine.boards[:, -3, 9] = 1
+        engine.boards[1, -1, 4] = 0  # Board 1 keeps a gap, so nothing clears there
+
+        engine.step(np.array([Action.HARD_DROP, Action.HARD_DROP]))
+
+        assert engine.lines_cleared[0] == 1 and engine.lines_cleared[1] == 0
+        assert engine.boards[0, -2, 9] == 1  # Marker moved down by one row
+        assert engine.score[0] - 2 * (engine.height - 1) == calculate_score(1, 1)
+
+    def test_games_end_and_reset(self):
+        """Test that boards top out and can be restarted"""
+        engine = BatchEngine(4, seed=3)
+        while not engine.game_over.all():
+            engine.step(np.full(4, Action.HARD_DROP))
+
+        engine.reset(engine.game_over)
+        assert not engine.game_over.any()
+        assert not engine.boards.any()
@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.suite import SCENARIOS, compare, run_suite, load_baseline, save_baseline
+
+
+class TestBenchmarkSuite:
+    def test_compare_flags_regressions(self):
+        """Test that only slowdowns beyond the threshold are flagged"""
+        baseline = {'a': 1000.0, 'b': 1000.0, 'c': 1000.0}
+        results = {'a': 950.0, 'b': 800.0, 'c': 1500.0, 'new': 10.0}
+        rows = {row[0]: row for row in compare(results, baseline, threshold=0.1)}
+        assert set(rows) == {'a', 'b', 'c'}
+        assert not rows['a'][4] and rows['b'][4] and not rows['c'][4]
+
+    def test_baseline_round_trip(self, tmp_path):
+        """Test that saved baselines load back as the results"""
+        path = str(tmp_path / 'baseline.json')
+        save_baseline(path, {'rules.scoring': 123.0}, scale=0.5)
+        assert load_baseline(path) == {'rules.scoring': 123.0}
+
+    def test_scenarios_run(self):
+        """Test that the core scenarios run and report a rate"""
+        results = run_suite(['rules', 'board.hard_drop', 'simulation'], scale=0.01, repeat=1)
+        assert set(results) == {'rules.scoring', 'board.hard_drop', 'simulation.games'}
+        assert all(rate > 0 for rate in results.values())
+        assert 'renderer.render_game' in SCENARIOS and 'highscores.save' in SCENARIOS
@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+import random
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.board import Board
+from core.bitboard import BitBoard
+from core.piece import Tetromino
+
+
+class TestBitBoard:
+    def test_init(self):
+        """Test bitboard initialization"""
+        board = BitBoard()
+        assert len(board.rows) == board.height
+        assert not any(board.rows)
+        assert board.current_piece is not None
+
+    def test_is_valid_position(self):
+        """Test position validation against the walls and floor"""
+        board = BitBoard()
+        board.current_piece = Tetromino(shape_idx=0)  # I-piece
+        board.current_piece.x = 3
+        board.current_piece.y = 0
+
+        assert board.is_valid_position()
+        assert not board.is_valid_position(x_offset=-4)  # Too far left
+        assert not board.is_valid_position(x_offset=4)  # Too far right
+        assert not board.is_valid_position(y_offset=20)  # Too far down
+
+    def test_merge_and_clear(self):
+        """Test merging a piece that completes a line"""
+        board = BitBoard()
+        bottom = board.height - 1
+        board.rows[bottom] = board.full_row & ~0b1111
+        for x in range(4, board.width):
+            board.grid[bottom][x] = 1
+        board.recompute_heights()
+
+        board.current_piece = Tetromino(shape_idx=0)  # I-piece
+        board.current_piece.x = 0
+        board.hard_drop()
+
+        assert board.lines_cleared == 1
+        assert board.rows[bottom] == 0
+        assert sum(board.grid[bottom]) == 0
+
+    def test_matches_list_board(self):
+        """Test that BitBoard plays exactly like Board for the same inputs"""
+        def play(board_class):
+            random.seed(7)
+            rng = random.Random(42)
+            board = board_class()
+            history = []
+            for _ in range(2000):
+                if board.game_over:
+                    break
+                action = rng.randrange(5)
+                if action == 0:
+                    board.move_piece(dx=-1)
+                elif action == 1:
+                    board.move_piece(dx=1)
+                elif action == 2:
+                    board.rotate_piece()
+                elif action == 3:
+                    if not board.move_piece(dy=1):
+                        board.merge_piece()
+                else:
+                    board.hard_drop()
+                history.append(([row[:] for row in board.grid], board.score, board.game_over))
+            return history
+
+        assert play(BitBoard) == play(Board)
+
+    def test_add_garbage(self):
+        """Test that garbage rows keep the masks in step with the grid"""
+        board = BitBoard()
+        board.rows[board.height - 1] = 0b1
+        board.grid[board.height - 1][0] = 1
+        board.recompute_heights()
+
+        board.add_garbage(3, hole=9)
+        assert board.rows[board.height - 4] == 0b1
+        assert board.rows[board.height - 1] == board.full_row & ~(1 << 9)
+        for y in range(board.height):
+            assert board.rows[y] == sum(1 << x for x in range(board.width) if board.grid[y][x])
@@ -1,6 +1,7 @@
 import pytest
 import sys
 import os
+import random
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -77,6 +78,36 @@ class TestBoard:
         assert board.rotate_piece()
         assert board.current_piece.shape != original_shape
 
+    def test_rotate_wall_kick(self):
+        """Test that a rotation blocked by the wall is kicked into place"""
+        board = Board()
+
+        # Vertical I-piece flush against the right wall
+        board.current_piece = Tetromino(shape_idx=0)
+        board.current_piece.rotate()
+        board.current_piece.x = board.width - 1
+        board.current_piece.y = 5
+
+        assert board.rotate_piece()
+        assert board.is_valid_position()
+        assert board.current_piece.x + len(board.current_piece.shape[0]) <= board.width
+
+    def test_rotate_blocked(self):
+        """Test that a rotation with no valid kick leaves the piece unchanged"""
+        board = Board()
+        board.current_piece = Tetromino(shape_idx=0)  # I-piece
+        board.current_piece.x = 3
+        board.current_piece.y = board.height - 1
+
+        # Fill everything except the row the piece sits in
+        for y in range(board.height - 1):
+            for x in range(board.width):
+                board.grid[y][x] = 1
+
+        original = (board.current_piece.shape, board.current_piece.x, board.current_piece.y)
+        assert not board.rotate_piece()
+        assert (board.current_piece.shape, board.current_piece.x, board.current_piece.y) == original
+
     def test_clear_lines(self):
         """Test clearing completed lines"""
         board = Board()
@@ -90,4 +121,108 @@ class TestBoard:
         assert board.lines_cleared == 1
 
         # The bottom row should now be empty
-        assert sum(board.grid[board.height - 1]) == 0
\ No newline at end of file
+        assert sum(board.grid[board.height - 1]) == 0
+
+    def test_clear_lines_compacts_stack(self):
+        """Test clearing non-adjacent lines keeps the rows in between in order"""
+        board = Board()
+        bottom = board.height - 1
+
+        # Full rows at the bottom and two rows above, a marker block in between
+        for j in range(board.width):
+            board.grid[bottom][j] = 1
+            board.grid[bottom - 2][j] = 1
+        board.grid[bottom - 1][0] = 1
+        board.grid[bottom - 3][5] = 1
+
+        assert board.clear_lines() == 2
+        assert board.last_cleared_rows == [bottom - 2, bottom]
+        assert board.grid[bottom] == [1] + [0] * (board.width - 1)
+        assert board.grid[bottom - 1][5] == 1
+        assert not any(board.grid[0]) and not any(board.grid[1])
+        assert len(board.grid) == board.height
+
+    def test_custom_size(self):
+        """Test a board with a non-default size"""
+        board = Board(width=25, height=60)
+        assert len(board.grid) == 60
+        assert len(board.grid[0]) == 25
+        assert board.is_valid_position()
+
+        for j in range(board.width):
+            board.grid[59][j] = 1
+        assert board.clear_lines() == 1
+
+    def test_heights_tracked_incrementally(self):
+        """Test that column heights and holes match a full recount during play"""
+        random.seed(11)
+        board = Board()
+        rng = random.Random(5)
+
+        while not board.game_over and board.pieces_placed < 200:
+            board.current_piece.x = rng.randrange(board.width - len(board.current_piece.shape[0]) + 1)
+            board.hard_drop()
+
+            heights, filled = board.heights[:], board.filled_cells
+            board.recompute_heights()
+            assert heights == board.heights
+            assert filled == board.filled_cells
+
+        assert board.lines_cleared > 0 or board.game_over
+
+    def test_holes(self):
+        """Test hole counting from heights and block count"""
+        board = Board()
+        board.grid[board.height - 3][2] = 1
+        board.grid[board.height - 1][2] = 1
+        board.recompute_heights()
+        assert board.heights[2] == 3
+        assert board.holes == 1
+
+    def test_drop_distance(self):
+        """Test the landing row query against stepping the piece down"""
+        board = Board()
+        board.grid[board.height - 1][4] = 1
+        board.grid[board.height - 4][0] = 1  # Roof that the piece can be tucked under
+        board.recompute_heights()
+
+        board.current_piece = Tetromino(shape_idx=0)  # I-piece
+        board.current_piece.x = 3
+        board.current_piece.y = 0
+        assert board.drop_distance() == board.height - 2
+        assert board.drop_distance() == board._step_drop_distance(board.current_piece)
+
+        # Under the roof the heights cannot be used, but the answer must stay the same
+        board.current_piece.x = 0
+        board.current_piece.y = board.height - 3
+        assert board.drop_distance() == 2
+
+        # A vertical piece spawned above the grid falls further than the board height
+        board.current_piece = Tetromino(shape_idx=0)
+        board.current_piece.rotate()
+        board.current_piece.x = board.width - 1
+        board.current_piece.y = -4
+        assert board.drop_distance() == board.height
+
+    def test_add_garbage(self):
+        """Test that garbage pushes the stack up and keeps heights and block count in step"""
+        board = Board()
+        board.grid[board.height - 1][0] = 1
+        board.recompute_heights()
+
+        assert board.add_garbage(2, hole=3)
+        assert board.grid[board.height - 3][0] == 1
+        assert board.grid[board.height - 1] == [1, 1, 1, 0, 1, 1, 1, 1, 1, 1]
+        assert board.heights[0] == 3 and board.heights[3] == 0
+
+        heights, filled = board.heights[:], board.filled_cells
+        board.recompute_heights()
+        assert (heights, filled) == (board.heights, board.filled_cells)
+
+    def test_add_garbage_tops_out(self):
+        """Test that pushing blocks out of the top ends the game"""
+        board = Board()
+        board.grid[0][5] = 1
+        board.recompute_heights()
+        assert not board.add_garbage(1, hole=0)
+        assert board.game_over
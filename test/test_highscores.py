@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.highscores import HighScoreManager
+
+
+def write_scores(path, scores):
+    with open(path, 'w') as f:
+        json.dump([{'score': score, 'name': f"P{score}", 'date': "2024-01-01"} for score in scores], f)
+
+
+class TestHighScoreManager:
+    def test_loads_file_once(self, tmp_path):
+        """Test that queries are answered from memory after the first load"""
+        path = str(tmp_path / 'scores.json')
+        write_scores(path, [300, 100, 200])
+        manager = HighScoreManager(path, max_scores=5)
+        os.remove(path)
+
+        assert [entry['score'] for entry in manager.load_scores()] == [300, 200, 100]
+        assert manager.get_rank(250) == 2
+
+    def test_rank_and_qualification(self, tmp_path):
+        """Test ranks and high score checks against a full table"""
+        path = str(tmp_path / 'scores.json')
+        write_scores(path, [50, 40, 30])
+        manager = HighScoreManager(path, max_scores=3)
+
+        assert manager.get_rank(60) == 1
+        assert manager.get_rank(40) == 3  # Ties rank below the existing score
+        assert manager.get_rank(30) is None
+        assert manager.is_high_score(31) and not manager.is_high_score(30)
+
+    def test_save_keeps_order_and_limit(self, tmp_path):
+        """Test that saved scores are inserted in order and the table is trimmed"""
+        path = str(tmp_path / 'scores.json')
+        manager = HighScoreManager(path, max_scores=3)
+        for score, name in ((10, "a"), (30, "b"), (20, "c"), (30, "d"), (5, "e")):
+            high_scores = manager.save_score(score, name)
+
+        assert [(entry['score'], entry['name']) for entry in high_scores] == [(30, "b"), (30, "d"), (20, "c")]
+
+    def test_write_behind_reaches_disk(self, tmp_path):
+        """Test that saves are written by the background thread and flushed on close"""
+        path = str(tmp_path / 'scores.json')
+        manager = HighScoreManager(path, max_scores=10)
+        for score in range(1, 51):
+            manager.save_score(score, "p")
+        manager.close()
+
+        with open(path) as f:
+            saved = json.load(f)
+        assert [entry['score'] for entry in saved] == list(range(50, 40, -1))
+        assert os.listdir(tmp_path) == ['scores.json']  # No temporary files left behind
+        assert HighScoreManager(path).load_scores() == saved
+
+    def test_save_does_not_wait_for_disk(self, tmp_path, monkeypatch):
+        """Test that save_score returns while the file write is still in progress"""
+        path = str(tmp_path / 'scores.json')
+        manager = HighScoreManager(path, write_behind=True)
+        release = threading.Event()
+        write = manager._write
+        monkeypatch.setattr(manager, '_write', lambda scores: (release.wait(5), write(scores)))
+
+        manager.save_score(100, "p")
+        assert not manager.flush(timeout=0.05)
+        assert not os.path.exists(path)
+
+        release.set()
+        manager.close()
+        assert os.path.exists(path)
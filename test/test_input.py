@@ -0,0 +1,128 @@
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.input import InputEngine, InputSettings, INSTANT
+from core.loop import FixedTimestep
+from core.simulation import Action, Simulation
+
+SETTINGS = InputSettings(das=200, arr=70, soft_drop=50)
+
+# A short burst of play: (time in ms, action, pressed)
+SCRIPT = [
+    (40, Action.MOVE_LEFT, True),
+    (530, Action.MOVE_LEFT, False),
+    (600, Action.ROTATE_CW, True),
+    (610, Action.ROTATE_CW, False),
+    (700, Action.MOVE_RIGHT, True),
+    (780, Action.SOFT_DROP, True),
+    (1020, Action.SOFT_DROP, False),
+    (1333, Action.MOVE_RIGHT, False),
+    (1500, Action.HARD_DROP, True),
+    (1700, Action.MOVE_RIGHT, True),
+    (2100, Action.MOVE_RIGHT, False)
+]
+
+
+def total_fires(engine, action, ticks, tick_ms=10):
+    """Run ticks every tick_ms and return how many times an action fired"""
+    return sum(engine.tick(i * tick_ms)[1].get(action, 0) for i in range(ticks))
+
+
+def play_script(fps, tick_rate=60, seconds=2.5):
+    """Play SCRIPT through the fixed-timestep loop at a render rate, return each tick's input and the final board"""
+    engine = InputEngine(SETTINGS)
+    simulation = Simulation(seed=4, tick_rate=tick_rate)
+    timestep = FixedTimestep(tick_rate, max_catch_up=10)
+    events = list(SCRIPT)
+    ticks = []
+
+    for frame in range(int(seconds * fps) + 1):
+        now = frame * 1000 / fps
+        # Events are handled once per frame, carrying the time they happened
+        while events and events[0][0] <= now:
+            time, action, pressed = events.pop(0)
+            if pressed:
+                engine.press(action, time)
+            else:
+                engine.release(action, time)
+
+        for _ in range(timestep.advance(now / 1000)):
+            actions, counts = engine.tick(len(ticks) * 1000 / tick_rate)
+            simulation.tick(actions, counts)
+            ticks.append((actions, counts))
+
+    return ticks, simulation.board.grid
+
+
+class TestInputEngine:
+    def test_das_then_arr(self):
+        """Test that a held move fires on press, after DAS and then every ARR"""
+        engine = InputEngine(SETTINGS)
+        engine.press(Action.MOVE_LEFT, 0)
+        engine.release(Action.MOVE_LEFT, 500)
+        # Fires at 0, 200, 270, 340, 410 and 480
+        assert total_fires(engine, Action.MOVE_LEFT, 100) == 6
+
+    def test_repeats_exact_within_long_ticks(self):
+        """Test that several repeats falling in one tick are all counted"""
+        engine = InputEngine(SETTINGS)
+        engine.press(Action.MOVE_RIGHT, 0)
+        assert engine.tick(0)[1] == {Action.MOVE_RIGHT: 1}
+        assert engine.tick(350)[1] == {Action.MOVE_RIGHT: 3}  # 200, 270 and 340
+
+    def test_press_and_release_within_a_tick(self):
+        """Test that a tap between two ticks still moves once"""
+        engine = InputEngine(SETTINGS)
+        engine.tick(0)
+        engine.press(Action.MOVE_LEFT, 3)
+        engine.release(Action.MOVE_LEFT, 9)
+        actions, counts = engine.tick(16)
+        assert actions & Action.MOVE_LEFT and counts[Action.MOVE_LEFT] == 1
+        assert engine.tick(32) == (Action.NONE, {})
+
+    def test_zero_arr_slides_instantly(self):
+        """Test that ARR 0 pushes as far as possible on every tick after DAS"""
+        engine = InputEngine(InputSettings(das=100, arr=0, soft_drop=50))
+        engine.press(Action.MOVE_LEFT, 0)
+        assert engine.tick(50)[1] == {Action.MOVE_LEFT: 1}
+        assert engine.tick(100)[1] == {Action.MOVE_LEFT: INSTANT}
+        assert engine.tick(150)[1] == {Action.MOVE_LEFT: INSTANT}
+
+        simulation = Simulation(seed=1)
+        simulation.tick(Action.MOVE_LEFT, {Action.MOVE_LEFT: INSTANT})
+        assert not simulation.board.is_valid_position(x_offset=-1)
+
+    def test_last_direction_wins(self):
+        """Test that the most recent direction overrides and the other resumes after DAS"""
+        engine = InputEngine(SETTINGS)
+        engine.press(Action.MOVE_LEFT, 0)
+        engine.press(Action.MOVE_RIGHT, 100)
+        engine.release(Action.MOVE_RIGHT, 150)
+        assert engine.tick(150)[1] == {Action.MOVE_LEFT: 1, Action.MOVE_RIGHT: 1}
+        assert engine.tick(349)[1] == {}
+        assert engine.tick(350)[1] == {Action.MOVE_LEFT: 1}  # 150 + DAS
+
+    def test_soft_drop_has_no_das(self):
+        """Test that soft drop repeats at its own rate from the press"""
+        engine = InputEngine(SETTINGS)
+        engine.press(Action.SOFT_DROP, 0)
+        engine.release(Action.SOFT_DROP, 120)
+        # Fires at 0, 50 and 100
+        assert total_fires(engine, Action.SOFT_DROP, 20) == 3
+
+    def test_one_shot_actions(self):
+        """Test that rotations and hard drops fire once per press, however long they are held"""
+        engine = InputEngine(SETTINGS)
+        engine.press(Action.ROTATE_CW, 0)
+        assert engine.tick(10) == (Action.ROTATE_CW, {})
+        assert engine.tick(500) == (Action.NONE, {})
+
+    def test_same_moves_at_any_frame_rate(self):
+        """Test that 30, 60 and 240 FPS produce the same ticks and the same board"""
+        ticks, grid = play_script(60)
+        assert any(counts for _, counts in ticks)
+        for fps in (30, 240):
+            assert play_script(fps) == (ticks, grid)
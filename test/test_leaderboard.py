@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.config as config
+from services.highscores import HighScoreManager, create_high_score_manager
+from services.leaderboard import SQLiteLeaderboard
+
+DAY = 24 * 60 * 60
+
+
+class TestSQLiteLeaderboard:
+    def test_migrates_json_on_creation(self, tmp_path):
+        """Test that a new database imports the JSON high scores once"""
+        json_path = str(tmp_path / 'high_scores.json')
+        with open(json_path, 'w') as f:
+            json.dump([{'score': 500, 'name': "Ana", 'date': "2024-03-01"},
+                       {'score': 900, 'name': "Bo", 'date': "2024-02-01"}], f)
+        db_path = str(tmp_path / 'scores.db')
+
+        leaderboard = SQLiteLeaderboard(db_path, migrate_from=json_path)
+        assert leaderboard.load_scores() == [{'score': 900, 'name': "Bo", 'date': "2024-02-01"},
+                                             {'score': 500, 'name': "Ana", 'date': "2024-03-01"}]
+        leaderboard.close()
+
+        leaderboard = SQLiteLeaderboard(db_path, migrate_from=json_path)
+        assert len(leaderboard.top(100)) == 2
+        leaderboard.close()
+
+    def test_matches_json_manager(self, tmp_path):
+        """Test that both backends answer the HighScoreManager interface alike"""
+        json_manager = HighScoreManager(str(tmp_path / 'scores.json'), max_scores=5, write_behind=False)
+        leaderboard = SQLiteLeaderboard(str(tmp_path / 'scores.db'), max_scores=5, migrate_from='')
+
+        for score in (40, 10, 70, 40, 90, 20, 5, 70):
+            assert json_manager.save_score(score, f"P{score}") == leaderboard.save_score(score, f"P{score}")
+        for score in (0, 5, 20, 40, 50, 70, 100):
+            assert json_manager.get_rank(score) == leaderboard.get_rank(score)
+            assert json_manager.is_high_score(score) == leaderboard.is_high_score(score)
+        assert leaderboard.rank(5) == 9  # The full history keeps scores beyond the top 5
+        leaderboard.close()
+
+    def test_player_and_mode_queries(self, tmp_path):
+        """Test personal bests and that modes keep separate boards"""
+        leaderboard = SQLiteLeaderboard(str(tmp_path / 'scores.db'), mode='classic', migrate_from='')
+        now = time.time()
+        leaderboard.add_many([("Ana", 300, now), ("Ana", 800, now), ("Bo", 500, now), ("Ana", 999, now, 'sprint')])
+
+        assert leaderboard.personal_best("Ana")['score'] == 800
+        assert leaderboard.personal_best("Ana", mode='sprint')['score'] == 999
+        assert leaderboard.personal_best("Cy") is None
+        assert [entry['score'] for entry in leaderboard.top(10)] == [800, 500, 300]
+        leaderboard.close()
+
+    def test_time_windows(self, tmp_path):
+        """Test that daily and weekly boards only include recent scores"""
+        leaderboard = SQLiteLeaderboard(str(tmp_path / 'scores.db'), migrate_from='')
+        now = datetime(2024, 5, 15, 12).timestamp()  # A Wednesday
+        leaderboard.add_many([("old", 900, now - 30 * DAY), ("monday", 700, now - 2 * DAY),
+                              ("today", 100, now - 60), ("morning", 200, now - 3600)])
+
+        assert [entry['name'] for entry in leaderboard.daily(now=now)] == ["morning", "today"]
+        assert [entry['name'] for entry in leaderboard.weekly(now=now)] == ["monday", "morning", "today"]
+        assert leaderboard.top(1)[0]['name'] == "old"
+        leaderboard.close()
+
+    def test_past_windows_end_with_their_day_or_week(self, tmp_path):
+        """Test that boards for a past day or week leave out the scores played after it"""
+        leaderboard = SQLiteLeaderboard(str(tmp_path / 'scores.db'), migrate_from='')
+        now = datetime(2024, 5, 15, 12).timestamp()  # A Wednesday
+        leaderboard.add_many([("wednesday", 100, now), ("thursday", 900, now + DAY),
+                              ("next monday", 800, now + 5 * DAY)])
+
+        assert [entry['name'] for entry in leaderboard.daily(now=now)] == ["wednesday"]
+        assert [entry['name'] for entry in leaderboard.weekly(now=now)] == ["thursday", "wednesday"]
+        leaderboard.close()
+
+    def test_window_index_uses_the_mode_history(self, tmp_path):
+        """Test that the window index is chosen from the rows and time span of the queried mode only"""
+        leaderboard = SQLiteLeaderboard(str(tmp_path / 'scores.db'), mode='classic', migrate_from='')
+        now = datetime(2024, 5, 15, 12).timestamp()
+        leaderboard.add_many([("Ana", i, now - i * DAY / 10) for i in range(1000)])  # 100 days
+        assert leaderboard._window_index('classic', now - DAY, now + DAY, 10) == 'scores_mode_created'
+
+        # Many more scores of another mode change nothing, many of this mode favour the score index
+        leaderboard.add_many([("Bo", i, now - 50 * DAY, 'sprint') for i in range(100000)])
+        assert leaderboard._window_index('classic', now - DAY, now + DAY, 10) == 'scores_mode_created'
+        leaderboard.add_many([("Bo", i, now - 50 * DAY) for i in range(100000)])
+        assert leaderboard._window_index('classic', now - DAY, now + DAY, 10) == 'scores_mode_score'
+        leaderboard.close()
+
+    def test_backend_selection(self, tmp_path, monkeypatch):
+        """Test that the configured backend is created"""
+        monkeypatch.setattr(config, 'HIGH_SCORES_DB', str(tmp_path / 'scores.db'))
+        monkeypatch.setattr(config, 'HIGH_SCORES_FILE', str(tmp_path / 'scores.json'))
+        monkeypatch.setattr(config, 'HIGH_SCORES_BACKEND', 'sqlite')
+        manager = create_high_score_manager()
+        assert isinstance(manager, SQLiteLeaderboard)
+        manager.close()
+
+        monkeypatch.setattr(config, 'HIGH_SCORES_BACKEND', 'json')
+        assert isinstance(create_high_score_manager(), HighScoreManager)
@@ -0,0 +1,50 @@
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.loop import FixedTimestep
+
+
+def run_frames(timestep, frame_time, frames, start=0.0):
+    """Advance a timestep over evenly spaced frames and return the ticks of each"""
+    return [timestep.advance(start + i * frame_time) for i in range(frames)]
+
+
+class TestFixedTimestep:
+    def test_first_frame_runs_one_tick(self):
+        """Test that the first frame ticks once and starts the timing"""
+        timestep = FixedTimestep(60)
+        assert timestep.advance(100.0) == 1
+        assert timestep.advance(100.0) == 0
+
+    def test_tick_rate_independent_of_render_rate(self):
+        """Test that 30, 60 and 240 FPS all run 60 ticks per second"""
+        for fps in (30, 60, 240):
+            timestep = FixedTimestep(60)
+            ticks = run_frames(timestep, 1.0 / fps, fps + 1)
+            assert sum(ticks) == 61  # 60 ticks per second plus the first frame
+
+    def test_duplicated_frames_when_rendering_faster(self):
+        """Test that frames without a new tick are counted as duplicates"""
+        timestep = FixedTimestep(60)
+        run_frames(timestep, 1.0 / 240, 241)
+        assert timestep.duplicated_frames == 180
+
+    def test_catch_up_after_stall_is_capped(self):
+        """Test that a long stall runs at most max_catch_up ticks and drops the rest"""
+        timestep = FixedTimestep(60, max_catch_up=5)
+        timestep.advance(0.0)
+        assert timestep.advance(0.05) == 3  # A short hitch is fully caught up
+        assert timestep.advance(1.05) == 5
+        assert timestep.dropped_ticks == 55
+        assert timestep.catch_up_frames == 2
+
+    def test_remainder_carried_to_next_frame(self):
+        """Test that partial ticks accumulate across frames"""
+        timestep = FixedTimestep(100)
+        timestep.advance(0.0)
+        assert timestep.advance(0.015) == 1
+        assert abs(timestep.alpha - 0.5) < 1e-9
+        assert timestep.advance(0.03) == 2
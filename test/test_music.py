@@ -0,0 +1,133 @@
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.music import MusicPlayer
+
+
+class FakeMusic:
+    """Stands in for pygame.mixer.music, recording what was asked of it"""
+
+    def __init__(self):
+        self.loads = []
+        self.volume = None
+        self.playing = False
+
+    def load(self, fileobj, namehint=""):
+        self.loads.append(fileobj.read())
+
+    def play(self, loops=0):
+        self.playing = True
+
+    def stop(self):
+        self.playing = False
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def pause(self):
+        pass
+
+    def unpause(self):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_player(tmp_path, **kwargs):
+    tracks = {}
+    for name in ('title', 'game'):
+        path = tmp_path / f"{name}.mp3"
+        path.write_bytes(name.encode())
+        tracks[name] = str(path)
+    music, clock = FakeMusic(), FakeClock()
+    player = MusicPlayer(tracks, volume=0.5, fade_in_ms=250, fade_out_ms=500, preload=False, music=music,
+                         clock=clock, **kwargs)
+    return player, music, clock
+
+
+class TestMusicPlayer:
+    def test_same_track_is_not_reloaded(self, tmp_path):
+        """Test that asking again for the playing track keeps it going"""
+        player, music, clock = make_player(tmp_path)
+        player.play('title')
+        player.play('title')
+        clock.now = 1.0
+        player.update()
+        player.play('title')
+
+        assert music.loads == [b'title']
+        assert music.playing and music.volume == 0.5
+
+    def test_fade_out_then_in(self, tmp_path):
+        """Test that a transition fades the old track out over frames before starting the new one"""
+        player, music, clock = make_player(tmp_path)
+        player.play('title')
+        clock.now = 1.0
+        player.update()
+
+        player.play('game')
+        clock.now = 1.25
+        player.update()
+        assert player.current == 'title' and music.volume == 0.25
+
+        clock.now = 1.5
+        player.update()
+        assert player.current == 'game' and music.loads == [b'title', b'game']
+        assert music.volume == 0.0
+
+        clock.now = 1.625
+        player.update()
+        assert music.volume == 0.25
+
+    def test_returning_track_fades_back_in(self, tmp_path):
+        """Test that a track being faded out comes back without a reload"""
+        player, music, clock = make_player(tmp_path)
+        player.play('title')
+        clock.now = 1.0
+        player.update()
+
+        player.stop()
+        clock.now = 1.25
+        player.update()
+        player.play('title')
+        clock.now = 1.5
+        player.update()
+
+        assert music.loads == [b'title']
+        assert player.level == 1.0 and music.playing
+
+    def test_waits_for_preload(self, tmp_path):
+        """Test that a track not read yet starts once it is, without reading it on the caller's thread"""
+        player, music, clock = make_player(tmp_path)
+        player.data.clear()
+        player.loaded.clear()
+
+        player.play('game')
+        player.update()
+        assert not music.loads and player.target == 'game'
+
+        player._read_all()
+        player.update()
+        assert music.loads == [b'game']
+
+    def test_stop_fades_out(self, tmp_path):
+        """Test that stopping fades out before stopping the stream"""
+        player, music, clock = make_player(tmp_path)
+        player.play('title')
+        clock.now = 1.0
+        player.update()
+
+        player.stop()
+        assert music.playing
+        clock.now = 1.5
+        player.update()
+        assert not music.playing and player.current is None
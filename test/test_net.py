@@ -0,0 +1,224 @@
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.simulation import Action
+from net import protocol
+from net.client import VersusClient
+from net.server import MAX_INPUT_LEAD, Match, VersusServer
+
+
+class FakeWriter:
+    def __init__(self):
+        self.messages = []
+
+    def write(self, data):
+        self.messages.append(data)
+
+    def close(self):
+        pass
+
+
+class TestProtocol:
+    def test_input_roundtrip(self):
+        """Test that inputs keep their tick, actions and repeat counts"""
+        message = protocol.encode_input(1234, Action.MOVE_LEFT | Action.ROTATE_CW, {Action.MOVE_LEFT: 1000})
+        payload = message[protocol.LENGTH.size:]
+        assert protocol.LENGTH.unpack(message[:2])[0] == len(payload)
+        assert protocol.decode_input(payload) == (1234, Action.MOVE_LEFT | Action.ROTATE_CW,
+                                                  {Action.MOVE_LEFT: protocol.MAX_COUNT})
+
+    def test_frames_rebuild_the_board(self):
+        """Test that a remote board rebuilt from frame deltas matches the server's rows"""
+        match = Match(1, [FakeWriter(), FakeWriter()], seed=3)
+        remote = protocol.RemoteBoard(match.width, match.height)
+        player = match.players[0]
+        for tick in range(1, 200):
+            player.inputs.append((tick, Action.HARD_DROP if tick % 3 == 0 else Action.MOVE_LEFT, {}))
+            match.step()
+            for recipient, message in match.frames():
+                if recipient is player:
+                    _, ack, states = protocol.decode_frame(message[protocol.LENGTH.size:])
+                    for state in states:
+                        if state.player == 0:
+                            remote.apply(state)
+                    assert ack == match.tick
+            if match.finished:
+                break
+
+        assert remote.rows == protocol.board_masks(player.simulation.board)
+        assert remote.state.score == player.simulation.board.score
+
+    def test_unchanged_boards_send_nothing(self):
+        """Test that a frame is only sent when a board changed or an input was applied"""
+        match = Match(1, [FakeWriter(), FakeWriter()], seed=3)
+        match.step()
+        assert len(match.frames()) == 2
+        assert match.frames() == []
+        assert len(match.frames(force=True)) == 2
+
+
+class TestMatch:
+    def test_far_ahead_input_cannot_block(self):
+        """Test that an input tagged far in the future is pulled back near the match tick"""
+        match = Match(1, [FakeWriter(), FakeWriter()], seed=5)
+        player = match.players[0]
+        player.add_input(2 ** 31, Action.MOVE_LEFT, {}, match.tick)
+        player.add_input(1, Action.MOVE_RIGHT, {}, match.tick)
+        for _ in range(MAX_INPUT_LEAD + 1):  # The late input gets the tick after the pulled back one
+            match.step()
+        assert not player.inputs
+        assert player.ack == MAX_INPUT_LEAD
+
+    def test_late_inputs_keep_a_tick_each(self):
+        """Test that late one-shot inputs are applied on consecutive ticks instead of merged"""
+        match = Match(1, [FakeWriter(), FakeWriter()], seed=5)
+        player = match.players[0]
+        board = player.simulation.board
+        for _ in range(3):
+            match.step()
+        rotation = board.current_piece.rotation
+        for tick in (1, 2):
+            player.add_input(tick, Action.ROTATE_CW, {}, match.tick)
+        for tick in (3, 3):
+            player.add_input(tick, Action.HARD_DROP, {}, match.tick)
+
+        match.step()
+        assert board.current_piece.rotation == (rotation + 1) % 4 and player.ack == 1
+        match.step()
+        assert board.current_piece.rotation == (rotation + 2) % 4 and player.ack == 2
+        match.step()
+        match.step()
+        assert board.pieces_placed == 2 and player.ack == 3
+
+    def test_garbage_is_cancelled_then_sent(self):
+        """Test that clears cancel incoming garbage first and the rest goes to the opponent"""
+        match = Match(1, [FakeWriter(), FakeWriter()], seed=5)
+        attacker, defender = match.players
+        attacker.garbage = 1
+        attacker.simulation.board.last_cleared_rows = [16, 17, 18, 19]  # A tetris sends 4
+        match._piece_locked(attacker)
+        assert attacker.garbage == 0
+        assert defender.garbage == 3
+
+        # The defender locks without clearing: the garbage rises
+        defender.simulation.board.last_cleared_rows = []
+        match._piece_locked(defender)
+        board = defender.simulation.board
+        assert defender.garbage == 0
+        assert all(sum(row) == board.width - 1 for row in board.grid[-3:])
+
+    def test_last_player_standing_wins(self):
+        """Test that the match ends when only one player is left"""
+        match = Match(1, [FakeWriter(), FakeWriter()], seed=5)
+        match.players[0].connected = False
+        match.step()
+        assert match.finished and match.winner == 1
+
+
+class TestServer:
+    def test_match_over_tcp(self):
+        """Test that two clients are paired, see each other's boards and get the result"""
+        async def play():
+            server = VersusServer('127.0.0.1', 0, tick_rate=240, seed=1)
+            await server.start()
+            clients = [VersusClient(), VersusClient()]
+            try:
+                await asyncio.gather(*(client.connect('127.0.0.1', server.port) for client in clients))
+                loser = clients[0]
+                while not loser.finished:
+                    loser.send_input(loser.tick + 1, Action.HARD_DROP)
+                    await loser.receive()
+                while not clients[1].finished:
+                    await clients[1].receive()
+                return clients, server.stats()
+            finally:
+                for client in clients:
+                    client.close()
+                await server.close()
+
+        clients, stats = asyncio.run(asyncio.wait_for(play(), timeout=30))
+        assert {client.player for client in clients} == {0, 1}
+        assert clients[0].winner == clients[1].winner == clients[1].player
+        assert clients[1].boards[clients[0].player].state.game_over
+        assert stats['matches_finished'] == 1
+
+    def test_malformed_message_drops_the_client(self):
+        """Test that an empty message closes that connection without an unhandled error"""
+        async def play():
+            errors = []
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            server = VersusServer('127.0.0.1', 0, tick_rate=240, seed=1)
+            await server.start()
+            clients = [VersusClient(), VersusClient()]
+            try:
+                await asyncio.gather(*(client.connect('127.0.0.1', server.port) for client in clients))
+                clients[0].writer.write(protocol.LENGTH.pack(0))
+                while not clients[1].finished:
+                    await clients[1].receive()
+                return clients, errors
+            finally:
+                for client in clients:
+                    client.close()
+                await server.close()
+
+        clients, errors = asyncio.run(asyncio.wait_for(play(), timeout=30))
+        assert clients[1].winner == clients[1].player
+        assert errors == []
+
+    def test_close_disconnects_waiting_clients(self):
+        """Test that closing the server also closes players still waiting for an opponent"""
+        async def play():
+            server = VersusServer('127.0.0.1', 0, seed=1)
+            await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(protocol.encode_join())
+            while not server.waiting:
+                await asyncio.sleep(0.01)
+            await server.close()
+            data = await reader.read()
+            writer.close()
+            return data, server.waiting
+
+        assert asyncio.run(asyncio.wait_for(play(), timeout=30)) == (b'', [])
+
+    def test_close_waits_for_the_ticker(self):
+        """Test that the ticker task has finished when close returns"""
+        async def play():
+            server = VersusServer('127.0.0.1', 0, seed=1)
+            await server.start()
+            await asyncio.sleep(0.05)
+            await server.close()
+            return server._ticker.cancelled()
+
+        assert asyncio.run(asyncio.wait_for(play(), timeout=30))
+
+    def test_disconnected_waiter_is_not_paired(self):
+        """Test that a client that left while waiting is dropped instead of starting a match"""
+        async def play():
+            server = VersusServer('127.0.0.1', 0, tick_rate=240, seed=1)
+            await server.start()
+            _, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(protocol.encode_join())
+            while not server.waiting:
+                await asyncio.sleep(0.01)
+            writer.close()
+            while not server.waiting[0][0].at_eof():
+                await asyncio.sleep(0.01)
+
+            clients = [VersusClient(), VersusClient()]
+            try:
+                await asyncio.gather(*(client.connect('127.0.0.1', server.port) for client in clients))
+                return clients, server.stats(), server.waiting
+            finally:
+                for client in clients:
+                    client.close()
+                await server.close()
+
+        clients, stats, waiting = asyncio.run(asyncio.wait_for(play(), timeout=30))
+        assert {client.player for client in clients} == {0, 1}
+        assert stats['matches_started'] == 1
+        assert waiting == []
@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from core.piece import Tetromino
+from core.rotation import ROTATIONS, CLOCKWISE, COUNTER_CLOCKWISE, HALF_TURN
 
 
 class TestTetromino:
@@ -48,4 +49,33 @@ class TestTetromino:
         piece.rotate()
 
         # Should be unchanged
-        assert piece.shape == original_shape
\ No newline at end of file
+        assert piece.shape == original_shape
+
+    def test_rotate_counter_clockwise(self):
+        """Test that counter-clockwise rotation undoes a clockwise one"""
+        piece = Tetromino(shape_idx=2)  # T-piece
+        original = (piece.shape, piece.rotation, piece.x, piece.y)
+
+        piece.rotate(CLOCKWISE)
+        assert piece.shape != original[0]
+
+        piece.rotate(COUNTER_CLOCKWISE)
+        assert (piece.shape, piece.rotation, piece.x, piece.y) == original
+
+    def test_rotate_half_turn(self):
+        """Test that a 180 rotation equals two clockwise rotations"""
+        for shape_idx in range(len(Tetromino.SHAPES)):
+            turned = Tetromino(shape_idx=shape_idx)
+            turned.rotate(HALF_TURN)
+
+            stepped = Tetromino(shape_idx=shape_idx)
+            stepped.rotate()
+            stepped.rotate()
+
+            assert (turned.shape, turned.x, turned.y) == (stepped.shape, stepped.x, stepped.y)
+
+    def test_rotations_are_precomputed(self):
+        """Test that rotating reuses the shared rotation states"""
+        piece = Tetromino(shape_idx=6)  # Z-piece
+        piece.rotate()
+        assert piece.shape is ROTATIONS[6][piece.rotation]
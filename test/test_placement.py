@@ -0,0 +1,112 @@
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.evaluation import board_rows, drop, place
+from ai.placement import enumerate_placements, apply_path
+from ai.search import Searcher, TranspositionTable
+from core.bitboard import BitBoard
+from core.piece import Tetromino
+from core.rotation import ROTATION_MASKS
+from core.simulation import Action
+
+
+def make_board(cells, shape_idx):
+    """Build a BitBoard with the given filled (x, y) cells and current piece"""
+    board = BitBoard()
+    for x, y in cells:
+        board.grid[y][x] = 1
+        board.rows[y] |= 1 << x
+    board.recompute_heights()
+    board.current_piece = Tetromino(shape_idx=shape_idx)
+    board.current_piece.x = board.width // 2 - len(board.current_piece.shape[0]) // 2
+    return board
+
+
+class TestPlacement:
+    def test_empty_board(self):
+        """Test the number of distinct placements of an O-piece on an empty board"""
+        board = make_board([], shape_idx=1)
+        placements = enumerate_placements(board)
+        assert len(placements) == board.width - 1
+        assert all(placement.path[-1] == Action.HARD_DROP for placement in placements)
+
+    def test_paths_reproduce_boards(self):
+        """Test that playing each path on the board gives the predicted result"""
+        bottom = 19
+        cells = [(x, bottom) for x in range(8)] + [(x, bottom - 1) for x in range(3, 8)]
+        board = make_board(cells, shape_idx=2)  # T-piece
+
+        for placement in enumerate_placements(board):
+            played = make_board(cells, shape_idx=2)
+            apply_path(played, placement.path)
+            assert tuple(board_rows(played)) == placement.rows
+
+    def test_tuck_under_overhang(self):
+        """Test that placements needing a soft drop and a slide are found"""
+        # A roof over columns 0-3 at row 16 leaves a cave below it on the left
+        board = make_board([(x, 16) for x in range(0, 4)], shape_idx=0)  # I-piece
+
+        tucked = [placement for placement in enumerate_placements(board)
+                  if placement.y == 19 and placement.x == 0]
+        assert tucked
+        assert Action.SOFT_DROP in tucked[0].path
+
+        apply_path(board, tucked[0].path)
+        assert board.rows[19] == 0b1111
+
+
+class TestSearch:
+    def test_transposition_table_is_bounded(self):
+        """Test LRU eviction and hit counting"""
+        table = TranspositionTable(max_size=2)
+        table.put('a', 1)
+        table.put('b', 2)
+        assert table.get('a') == 1
+        table.put('c', 3)
+        assert table.get('b') is None
+        assert len(table) == 2
+        assert table.hits == 1 and table.misses == 1
+
+    def test_transposition_is_a_hit(self):
+        """Test that the same board reached in two move orders is evaluated once"""
+        board = BitBoard()
+        width, height = board.width, board.height
+        masks = ROTATION_MASKS[1][0]  # O-piece
+
+        def drop_o(rows, x):
+            return place(rows, width, masks, x, drop(rows, width, height, masks, x, -2))[0]
+
+        empty = board_rows(board)
+        searcher = Searcher()
+        searcher._static_value(drop_o(drop_o(empty, 0), 4), width)
+        searcher._static_value(drop_o(drop_o(empty, 4), 0), width)
+
+        stats = searcher.stats()
+        assert stats['evaluations'] == {'entries': 1, 'hits': 1, 'misses': 1}
+        assert stats['follow_ups'] == {'entries': 0, 'hits': 0, 'misses': 0}
+
+    def test_tables_are_separate(self):
+        """Test that a search fills both tables without mixing their counters"""
+        board = make_board([], shape_idx=1)
+        board.next_piece = Tetromino(shape_idx=1)
+        searcher = Searcher(time_budget=10.0)
+        searcher.best_placement(board)
+
+        stats = searcher.stats()
+        assert all(isinstance(key, tuple) and isinstance(key[1], int) for key in searcher.follow_ups.entries)
+        assert not any(key in searcher.follow_ups.entries for key in searcher.evaluations.entries)
+        assert stats['evaluations']['hits'] > 0  # O then O in either order gives the same boards
+        assert stats['follow_ups']['misses'] == stats['follow_ups']['entries']
+
+    def test_takes_the_line(self):
+        """Test that the search completes an open line with an I-piece"""
+        board = make_board([(x, y) for x in range(9) for y in range(16, 20)], shape_idx=0)
+        board.next_piece = Tetromino(shape_idx=1)
+
+        placement = Searcher(time_budget=1.0).best_placement(board)
+        assert placement.lines == 4
+        assert placement.x == 9
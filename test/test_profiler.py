@@ -0,0 +1,83 @@
+import csv
+import json
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.profiler import FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def record_frame(profiler, clock, **phases):
+    """Record one frame spending the given seconds in each phase"""
+    profiler.begin_frame()
+    for name, seconds in phases.items():
+        clock.now += seconds
+        profiler.mark(name)
+    profiler.end_frame()
+
+
+class TestFrameProfiler:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.profiler = FrameProfiler(enabled=True, size=4, clock=self.clock)
+
+    def test_disabled_records_nothing(self):
+        """Test that a disabled profiler ignores every call"""
+        self.profiler.enabled = False
+        record_frame(self.profiler, self.clock, events=0.001, render=0.002)
+        assert self.profiler.count == 0
+        assert self.profiler.frames() == []
+
+    def test_phases_and_frame_total(self):
+        """Test that marks split the frame into phases and repeated marks accumulate"""
+        self.profiler.begin_frame()
+        for name, seconds in (('events', 0.001), ('render', 0.002), ('render', 0.003), ('present', 0.004)):
+            self.clock.now += seconds
+            self.profiler.mark(name)
+        self.profiler.end_frame()
+
+        frame = self.profiler.frames()[0]
+        assert abs(frame['render'] - 0.005) < 1e-12
+        assert abs(frame['frame'] - 0.010) < 1e-12
+        assert frame['update'] == 0.0
+
+    def test_ring_buffer_keeps_latest_frames(self):
+        """Test that only the last size frames are kept, oldest first"""
+        for i in range(1, 7):
+            record_frame(self.profiler, self.clock, update=i / 1000)
+        assert self.profiler.count == 4
+        assert [round(frame['update'] * 1000) for frame in self.profiler.frames()] == [3, 4, 5, 6]
+
+    def test_percentiles(self):
+        """Test the rolling percentiles in milliseconds"""
+        for ms in (1, 2, 3, 10):
+            record_frame(self.profiler, self.clock, render=ms / 1000)
+        stats = self.profiler.stats()['render']
+        assert round(stats['p50']) == 3
+        assert round(stats['p99']) == 10
+        assert round(stats['max']) == 10
+
+    def test_dump_csv_and_json(self, tmp_path):
+        """Test that traces are written in the format of the file extension"""
+        record_frame(self.profiler, self.clock, events=0.001, render=0.002)
+
+        self.profiler.dump(str(tmp_path / 'trace.csv'))
+        with open(tmp_path / 'trace.csv') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 1 and float(rows[0]['render']) == 2.0
+
+        self.profiler.dump(str(tmp_path / 'trace.json'))
+        with open(tmp_path / 'trace.json') as f:
+            trace = json.load(f)
+        assert trace['frames'][0]['frame'] == 3.0
+        assert 'p95' in trace['summary']['events']
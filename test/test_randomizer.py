@@ -0,0 +1,95 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.config as config
+from core.board import Board
+from core.bitboard import BitBoard
+from core.randomizer import (GENERATORS, PIECE_COUNT, BagGenerator, ClassicGenerator, PieceQueue,
+                             create_generator)
+from core.rotation import SPAWN_ROTATION
+
+
+def sequence(generator, count):
+    return [generator.next() for _ in range(count)]
+
+
+class TestGenerators:
+    @pytest.mark.parametrize('name', sorted(GENERATORS))
+    def test_same_seed_same_sequence(self, name):
+        """Test that every generator repeats its sequence for the same seed"""
+        first = sequence(create_generator(name, random.Random(9)), 500)
+        second = sequence(create_generator(name, random.Random(9)), 500)
+        assert first == second
+        assert set(first) == set(range(PIECE_COUNT))
+
+    def test_bag_deals_every_shape_once_per_bag(self):
+        """Test that each group of seven pieces from a 7-bag holds all seven shapes"""
+        pieces = sequence(BagGenerator(random.Random(1)), PIECE_COUNT * 50)
+        for start in range(0, len(pieces), PIECE_COUNT):
+            assert sorted(pieces[start:start + PIECE_COUNT]) == list(range(PIECE_COUNT))
+
+    def test_classic_rerolls_repeats(self):
+        """Test that the NES-style generator repeats a shape far less often than chance"""
+        pieces = sequence(ClassicGenerator(random.Random(2)), 7000)
+        repeats = sum(a == b for a, b in zip(pieces, pieces[1:]))
+        assert repeats < len(pieces) / PIECE_COUNT / 2
+
+
+class TestPieceQueue:
+    def test_order_independent_of_size(self):
+        """Test that the preview length does not change the piece sequence"""
+        expected = sequence(BagGenerator(random.Random(4)), 100)
+        for size in (1, 3, 7):
+            queue = PieceQueue(BagGenerator(random.Random(4)), size)
+            assert [queue.pop() for _ in range(100)] == expected
+
+    def test_peek(self):
+        """Test that peek shows the shapes pop will return next"""
+        queue = PieceQueue(BagGenerator(random.Random(5)), 5)
+        for _ in range(12):
+            upcoming = queue.peek()
+            assert len(upcoming) == 5
+            assert queue.pop() == upcoming[0]
+            assert queue.peek(4) == upcoming[1:]
+
+
+class TestBoardPieces:
+    @pytest.mark.parametrize('board_class', [Board, BitBoard])
+    def test_seeded_boards_deal_the_same_pieces(self, board_class):
+        """Test that boards seeded alike spawn the same pieces"""
+        def shapes(board):
+            dealt = []
+            while not board.game_over and len(dealt) < 60:
+                dealt.append(board.current_piece.shape_idx)
+                board.hard_drop()
+            return dealt
+
+        assert shapes(board_class(rng=random.Random(3))) == shapes(board_class(rng=random.Random(3)))
+
+    def test_locked_piece_is_reused(self):
+        """Test that spawning recycles the locked piece as the next one instead of allocating"""
+        board = Board(rng=random.Random(6))
+        pieces = {id(board.current_piece), id(board.next_piece)}
+        for _ in range(10):
+            board.hard_drop()
+            assert {id(board.current_piece), id(board.next_piece)} == pieces
+            assert board.current_piece.y < 0 and board.current_piece.rotation == SPAWN_ROTATION[board.current_piece.shape_idx]
+
+    def test_preview(self, monkeypatch):
+        """Test that the preview lists the next pieces in spawn order"""
+        monkeypatch.setattr(config, 'PREVIEW_PIECES', 4)
+        board = Board(rng=random.Random(8))
+        preview = board.preview(4)
+        assert preview[0] == board.next_piece.shape_idx
+
+        spawned = []
+        for _ in range(4):
+            board.hard_drop()
+            spawned.append(board.current_piece.shape_idx)
+        assert spawned == preview
@@ -0,0 +1,147 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+pygame = pytest.importorskip('pygame')
+
+import services.config as config
+from ai.policies import GreedyPolicy
+from core.board import Board
+from core.simulation import Simulation, random_actions
+from ui.renderer import Renderer
+from ui.text import text_cache
+from ui.theme import COLORS
+from ui.widgets import Menu
+
+
+class TestRenderer:
+    def setup_method(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+
+    def teardown_method(self):
+        text_cache.reset()
+        pygame.quit()
+
+    @pytest.mark.parametrize('preview_pieces', [1, 5])
+    def test_dirty_rects_match_full_redraw(self, monkeypatch, preview_pieces):
+        """Test that dirty-rect frames leave the same pixels as full redraws"""
+        monkeypatch.setattr(config, 'PREVIEW_PIECES', preview_pieces)
+        full_surface = pygame.Surface(self.screen.get_size())
+        full = Renderer(full_surface, dirty_rects=False)
+        dirty = Renderer(self.screen, dirty_rects=True)
+
+        rng = random.Random(3)
+        simulation = Simulation(seed=3, tick_rate=config.FPS)
+        for frame in range(600):
+            if simulation.game_over:
+                simulation = Simulation(seed=frame, tick_rate=config.FPS)
+            simulation.tick(random_actions(rng))
+
+            full.render_game(simulation.board)
+            dirty.render_game(simulation.board)
+            if frame % 25 == 0:
+                assert pygame.image.tobytes(self.screen, 'RGB') == pygame.image.tobytes(full_surface, 'RGB')
+
+    def test_indexed_grid_matches_rect_drawing(self, monkeypatch):
+        """Test that the palette-indexed stack draws the same pixels as one rect per cell"""
+        pytest.importorskip('numpy')
+        rect_surface = pygame.Surface(self.screen.get_size())
+        renderer = Renderer(self.screen, dirty_rects=False)
+        rect_renderer = Renderer(rect_surface, dirty_rects=False)
+
+        board = Simulation(seed=5).board
+        for y in range(board.height - 6, board.height):
+            for x in range(board.width):
+                if (x + y) % 3:
+                    board.grid[y][x] = 1
+                    board.colors[y][x] = config.SHAPE_COLORS[(x * y) % 7]
+        board.colors[-1][0] = (10, 20, 30)  # A color outside the palette
+        board.recompute_heights()
+
+        renderer.render_game(board)
+        monkeypatch.setattr(config, 'INDEXED_GRID_RENDERING', False)
+        rect_renderer.render_game(board)
+        assert pygame.image.tobytes(self.screen, 'RGB') == pygame.image.tobytes(rect_surface, 'RGB')
+
+    def test_grid_sync_after_each_lock_matches_a_rebuild(self):
+        """Test that syncing only the rows a lock changed leaves the same pixels as a full rebuild"""
+        grid_module = pytest.importorskip('ui.grid')
+        board = Board(rng=random.Random(4))
+        grid = grid_module.GridSurface(board.width, board.height)
+        grid.sync(board)
+        policy = GreedyPolicy(seed=4)
+        lines = 0
+        while board.pieces_placed < 60 and policy.play(board):
+            grid.sync(board)
+            lines += len(board.last_cleared_rows)
+            rebuilt = grid_module.GridSurface(board.width, board.height)
+            rebuilt.sync(board)
+            assert pygame.image.tobytes(grid.surface, 'P') == pygame.image.tobytes(rebuilt.surface, 'P')
+        assert lines > 0
+
+    def test_grid_sync_ignores_untouched_rows(self, monkeypatch):
+        """Test that the work of a sync after a lock does not grow with the cells it leaves alone"""
+        grid_module = pytest.importorskip('ui.grid')
+        spans = {}
+        for height in (20, 200):
+            board = Board(height=height, rng=random.Random(1))
+            for y in range(height // 2, height):
+                board.grid[y][:] = [1] * (board.width - 1) + [0]
+                board.colors[y][:] = [config.SHAPE_COLORS[0]] * board.width
+            board.recompute_heights()
+            grid = grid_module.GridSurface(board.width, board.height)
+            grid.sync(board)
+
+            redrawn = []
+            redraw_rows = grid._redraw_rows
+            monkeypatch.setattr(grid, '_redraw_rows', lambda b, start, stop: redrawn.append(stop - start) or
+                                redraw_rows(b, start, stop))
+            board.hard_drop()
+            assert grid.sync(board)
+            spans[height] = redrawn
+        assert spans[20] == spans[200] == [len(board.last_locked_rows)]
+
+    def test_invalidate_redraws_everything(self):
+        """Test that an invalidated renderer repaints over foreign content"""
+        renderer = Renderer(self.screen, dirty_rects=True)
+        simulation = Simulation(seed=1)
+        renderer.render_game(simulation.board)
+        expected = pygame.image.tobytes(self.screen, 'RGB')
+
+        self.screen.fill(config.WHITE)
+        renderer.invalidate()
+        renderer.render_game(simulation.board)
+        assert pygame.image.tobytes(self.screen, 'RGB') == expected
+
+    def test_static_layers_match_uncached_drawing(self, monkeypatch):
+        """Test that screens composited from cached layers look the same as drawn from scratch"""
+        uncached_surface = pygame.Surface(self.screen.get_size())
+        renderer = Renderer(self.screen, dirty_rects=False)
+        uncached = Renderer(uncached_surface, dirty_rects=False)
+        board = Simulation(seed=2).board
+        menu = Menu(["Start Game", "High Scores", "Quit"], None)
+
+        for draw in (lambda r: r.render_title_screen(), lambda r: r.render_main_menu(menu),
+                     lambda r: r.render_game(board)):
+            monkeypatch.setattr(config, 'CACHE_STATIC_LAYERS', True)
+            draw(renderer)
+            draw(renderer)  # Second frame comes from the cache
+            monkeypatch.setattr(config, 'CACHE_STATIC_LAYERS', False)
+            draw(uncached)
+            assert pygame.image.tobytes(self.screen, 'RGB') == pygame.image.tobytes(uncached_surface, 'RGB')
+
+    def test_layers_rebuilt_on_theme_change(self, monkeypatch):
+        """Test that a theme color change invalidates the cached layers"""
+        renderer = Renderer(self.screen)
+        overlay = renderer.pause_overlay()
+        assert renderer.pause_overlay() is overlay
+
+        monkeypatch.setitem(COLORS, 'RED', (200, 0, 0))
+        assert renderer.pause_overlay() is not overlay
@@ -0,0 +1,96 @@
+import io
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.replay import (ReplayError, ReplayWriter, read_replay, play_headless, prune_replays, read_varint,
+                         write_varint)
+from core.simulation import Action, Simulation, random_actions
+
+
+def record_game(path, seed=7, max_frames=20000):
+    """Play a random game while recording it and return the finished Simulation"""
+    rng = random.Random(seed)
+    simulation = Simulation(seed=seed, tick_rate=60)
+    writer = ReplayWriter(path, seed, 60, simulation.board.width, simulation.board.height)
+    while not simulation.game_over and simulation.frame < max_frames:
+        actions = random_actions(rng)
+        counts = {Action.MOVE_LEFT: 3} if actions == Action.MOVE_LEFT else None
+        writer.record(simulation.frame, actions, counts)
+        simulation.tick(actions, counts)
+    writer.finish(simulation.frame, simulation.board.score, simulation.board.lines_cleared)
+    return simulation
+
+
+class TestReplay:
+    def test_varint_round_trip(self):
+        """Test that varints read back the values written"""
+        values = [0, 1, 127, 128, 300, 2 ** 32, 2 ** 63 - 1]
+        stream = io.BytesIO()
+        for value in values:
+            write_varint(stream, value)
+        stream.seek(0)
+        assert [read_varint(stream) for _ in values] == values
+        assert read_varint(stream) is None
+
+    def test_playback_matches_recording(self, tmp_path):
+        """Test that a recorded game plays back to the same board, score and lines"""
+        path = tmp_path / 'game.trpl'
+        simulation = record_game(path)
+
+        replay = read_replay(path)
+        played = play_headless(replay)
+
+        assert replay.final == (simulation.frame, simulation.board.score, simulation.board.lines_cleared)
+        assert played.frame == simulation.frame
+        assert played.board.grid == simulation.board.grid
+
+    def test_replay_is_compact(self, tmp_path):
+        """Test that a replay costs a few bytes per input, not per tick"""
+        path = tmp_path / 'game.trpl'
+        simulation = record_game(path)
+        inputs = len(read_replay(path).inputs)
+
+        assert os.path.getsize(path) < 40 + inputs * 3
+        assert os.path.getsize(path) < simulation.frame
+
+    def test_tampered_result_fails_verification(self, tmp_path):
+        """Test that a replay whose recorded score does not match playback is rejected"""
+        path = tmp_path / 'game.trpl'
+        record_game(path)
+        replay = read_replay(path)
+        ticks, score, lines = replay.final
+
+        with pytest.raises(ReplayError):
+            play_headless(replay._replace(final=(ticks, score + 1, lines)))
+
+    def test_not_a_replay(self, tmp_path):
+        """Test that other files are rejected"""
+        path = tmp_path / 'scores.json'
+        path.write_bytes(b'{"scores": []}')
+
+        with pytest.raises(ReplayError):
+            read_replay(path)
+
+    def test_game_stopped_midway_verifies(self, tmp_path):
+        """Test that a replay finished before game over, as on quitting, plays back to its result"""
+        path = tmp_path / 'game.trpl'
+        simulation = record_game(path, max_frames=500)
+        assert not simulation.game_over
+        assert play_headless(read_replay(path)).board.score == simulation.board.score
+
+    def test_prune_keeps_newest(self, tmp_path):
+        """Test that only the newest replays are kept"""
+        names = [f"replay_2024010{day}_120000_{day:016x}.trpl" for day in range(1, 6)]
+        for age, name in enumerate(reversed(names)):
+            (tmp_path / name).write_bytes(b'')
+            os.utime(tmp_path / name, (1000 - age, 1000 - age))
+        (tmp_path / 'notes.txt').write_text('')
+
+        assert prune_replays(str(tmp_path), 2) == 3
+        assert sorted(os.listdir(tmp_path)) == ['notes.txt'] + names[3:]
@@ -0,0 +1,80 @@
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.evaluation import board_rows, column_heights, count_holes, evaluate, place
+from ai.policies import GreedyPolicy, drop_placements
+from ai.selfplay import play_game, run_farm, summarize
+from core.board import Board
+from core.piece import Tetromino
+from core.rotation import ROTATION_MASKS
+
+
+class TestEvaluation:
+    def test_features(self):
+        """Test column heights and hole counting on row masks"""
+        rows = [0, 0b0010, 0b0000, 0b1011]  # 4x4 board, row 0 at the top
+        assert column_heights(rows, 4) == [1, 3, 0, 1]
+        assert count_holes(rows, 4) == 1
+
+    def test_board_rows(self):
+        """Test converting a list board to row masks"""
+        board = Board()
+        board.grid[board.height - 1][0] = 1
+        board.grid[board.height - 1][3] = 1
+        assert board_rows(board)[-1] == 0b1001
+
+
+class TestSelfPlay:
+    def test_drop_placements(self):
+        """Test that every column of a flat I-piece drop is enumerated"""
+        board = Board()
+        board.current_piece = Tetromino(shape_idx=0)
+        flat = [p for p in drop_placements(board) if p[0] == 0]
+        assert [x for _, x, _ in flat] == list(range(board.width - 3))
+        assert all(y == board.height - 1 for _, _, y in flat)
+
+    def test_greedy_scores_topped_out_placements(self):
+        """Test that greedy picks the same placement as a full evaluation when pieces top out"""
+        for shape_idx in range(7):
+            board = Board()
+            for y in range(1, board.height):
+                for x in range(1 if y % 2 else 2, board.width):
+                    board.grid[y][x] = 1
+            board.recompute_heights()
+            board.current_piece = Tetromino(shape_idx=shape_idx)
+
+            rows = board_rows(board)
+            scores = {}
+            for rotation, x, y in drop_placements(board):
+                new_rows, lines, topped_out = place(rows, board.width, ROTATION_MASKS[shape_idx][rotation], x, y)
+                scores[rotation, x] = evaluate(new_rows, board.width, lines) - (1000 if topped_out else 0)
+            assert scores[GreedyPolicy().choose(board)] == max(scores.values())
+
+    def test_greedy_clears_lines(self):
+        """Test that the greedy policy survives and clears lines"""
+        result = play_game(seed=1, policy_name='greedy', max_pieces=100)
+        assert result['pieces'] == 100
+        assert result['lines'] > 0
+
+    def test_deterministic(self):
+        """Test that a seed always plays the same game"""
+        first = play_game(seed=5, policy_name='random', max_pieces=50)
+        second = play_game(seed=5, policy_name='random', max_pieces=50)
+        first.pop('duration')
+        second.pop('duration')
+        assert first == second
+
+    def test_farm(self):
+        """Test running games across worker processes"""
+        streamed = []
+        results = run_farm(5, 'random', workers=2, chunk_size=2, max_pieces=30, on_result=streamed.append)
+        assert [result['seed'] for result in results] == list(range(5))
+        assert len(streamed) == 5
+
+        summary = summarize(results)
+        assert summary['games'] == 5
+        assert summary['pieces']['max'] <= 30
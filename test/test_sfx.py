@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+pygame = pytest.importorskip('pygame')
+
+from services.sfx import SoundScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSoundScheduler:
+    def setup_method(self):
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            pytest.skip("No audio device")
+        # Five seconds of silence, long enough to keep a channel busy during a test
+        frequency, size, channels = pygame.mixer.get_init()
+        sound = pygame.mixer.Sound(buffer=bytes(frequency * abs(size) // 8 * channels * 5))
+        self.sounds = {name: sound for name in ('rotate', 'drop', 'line_clear', 'menu_move')}
+        self.clock = FakeClock()
+
+    def teardown_method(self):
+        pygame.mixer.quit()
+
+    def make_scheduler(self, min_interval_ms=None):
+        return SoundScheduler(self.sounds, {'movement': 2, 'clears': 1, 'ui': 1}, min_interval_ms,
+                              clock=self.clock)
+
+    def test_same_frame_requests_coalesce(self):
+        """Test that repeated requests within a frame play one voice"""
+        scheduler = self.make_scheduler()
+        for _ in range(5):
+            scheduler.request('rotate')
+        scheduler.request('line_clear')
+        scheduler.flush()
+
+        stats = scheduler.stats()
+        assert (stats['requested'], stats['played'], stats['coalesced']) == (6, 2, 4)
+        assert stats['voices'] == {'movement': 1, 'clears': 1, 'ui': 0}
+
+    def test_rate_limit(self):
+        """Test that an effect is dropped when repeated sooner than its minimum interval"""
+        scheduler = self.make_scheduler({'rotate': 50})
+        for step in (0.0, 0.02, 0.04, 0.06):
+            self.clock.now = 100.0 + step
+            scheduler.request('rotate')
+            scheduler.flush()
+
+        assert scheduler.counters['played'] == 2
+        assert scheduler.counters['rate_limited'] == 2
+
+    def test_groups_keep_their_voices(self):
+        """Test that a burst of one category steals within its own group only"""
+        scheduler = self.make_scheduler()
+        scheduler.request('menu_move')
+        scheduler.flush()
+        for frame in range(6):
+            self.clock.now += 1
+            scheduler.request('rotate' if frame % 2 else 'drop')
+            scheduler.flush()
+
+        stats = scheduler.stats()
+        assert stats['stolen'] == 4
+        assert stats['voices'] == {'movement': 2, 'clears': 0, 'ui': 1}
+        assert stats['peak_voices']['movement'] == 2
+
+    def test_reserved_channels(self):
+        """Test that Sound.play() elsewhere cannot take the group channels"""
+        scheduler = self.make_scheduler()
+        self.sounds['rotate'].play()  # Picks any free unreserved channel
+        assert scheduler.voices() == {'movement': 0, 'clears': 0, 'ui': 0}
+
+    def test_missing_sounds_are_counted(self):
+        """Test that effects not loaded yet are skipped"""
+        scheduler = self.make_scheduler()
+        scheduler.request('tetris')
+        scheduler.flush()
+        assert scheduler.counters['not_loaded'] == 1 and scheduler.counters['played'] == 0
@@ -0,0 +1,76 @@
+import pytest
+import sys
+import os
+import random
+import subprocess
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.board import Board
+from core.piece import Tetromino
+from core.simulation import Simulation, Action, random_actions
+
+
+class TestSimulation:
+    def test_gravity(self):
+        """Test that the piece falls one row per gravity interval"""
+        simulation = Simulation(seed=1, tick_rate=60)
+        start_y = simulation.board.current_piece.y
+
+        for _ in range(simulation.gravity_interval()):
+            simulation.tick()
+
+        assert simulation.board.current_piece.y == start_y + 1
+
+    def test_hard_drop(self):
+        """Test that a hard drop locks the piece and reports a drop event"""
+        simulation = Simulation(seed=1)
+        next_piece = simulation.board.next_piece
+
+        events = simulation.tick(Action.HARD_DROP)
+
+        assert events == ['drop']
+        assert simulation.board.current_piece is next_piece
+        assert any(any(row) for row in simulation.board.grid)
+
+    def test_line_clear_events(self):
+        """Test that the board's line clears come back as events of the tick that locked the piece"""
+        board = Board(rng=random.Random(1))
+        simulation = Simulation(board=board)
+        for x in range(4, board.width):
+            board.grid[board.height - 1][x] = 1
+        board.recompute_heights()
+        board.current_piece = Tetromino(shape_idx=0)  # Flat I-piece filling columns 0-3
+        board.current_piece.x = 0
+
+        assert simulation.tick(Action.HARD_DROP) == ['drop', 'line_clear']
+        assert simulation.tick(Action.MOVE_LEFT) == []
+
+    def test_combined_actions(self):
+        """Test that several actions can be applied in the same tick"""
+        simulation = Simulation(seed=1)
+        simulation.board.current_piece.y = 5
+        start_x = simulation.board.current_piece.x
+
+        events = simulation.tick(Action.MOVE_LEFT | Action.ROTATE_CW)
+
+        assert events == ['rotate']
+        assert simulation.board.current_piece.x != start_x
+
+    def test_deterministic(self):
+        """Test that the same seed and inputs produce the same game"""
+        def play(seed):
+            simulation = Simulation(seed=seed)
+            rng = random.Random(99)
+            while not simulation.game_over and simulation.frame < 20000:
+                simulation.tick(random_actions(rng))
+            return simulation.frame, simulation.board.score, simulation.board.grid
+
+        assert play(3) == play(3)
+
+    def test_headless(self):
+        """Test that the simulation never imports pygame"""
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        code = "import sys, core.simulation; sys.exit('pygame' in sys.modules)"
+        assert subprocess.run([sys.executable, '-c', code], cwd=root).returncode == 0
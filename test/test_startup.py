@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+# Add the project root to the path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from services.startup import parse_importtime, measure, check_budgets, format_report
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       2500 |     numpy._core
+import time:      4000 |       6500 |   numpy
+import time:     30000 |      36500 | pygame
+import time:       800 |        800 | core.rules
+import time:      1200 |       2000 | core.board
+"""
+
+# Modules that must stay usable without pygame: the headless simulation, the AI, the storage and the server
+HEADLESS_MODULES = ['core.batch', 'core.bitboard', 'core.board', 'core.input', 'core.loop', 'core.piece',
+                    'core.randomizer', 'core.replay', 'core.rotation', 'core.rules', 'core.simulation',
+                    'ai.evaluation', 'ai.placement', 'ai.policies', 'ai.search', 'ai.selfplay',
+                    'services.config', 'services.highscores', 'services.leaderboard', 'services.startup',
+                    'net.server', 'net.loadtest', 'main']
+
+
+def imports_pygame(module):
+    code = f"import sys, {module}; sys.exit(1 if 'pygame' in sys.modules else 0)"
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT).returncode == 1
+
+
+class TestStartupProfile:
+    def test_parse_importtime(self):
+        """Test that importtime lines are parsed with their depth and other lines ignored"""
+        rows = parse_importtime(SAMPLE + "First frame after 420 ms\n")
+        assert len(rows) == 6
+        assert rows[1] == ('numpy._core', 2500, 2500, 2)
+        assert rows[3].module == 'pygame' and rows[3].depth == 0
+
+    def test_measure_and_budgets(self):
+        """Test that packages are totalled and only figures over budget are reported"""
+        figures = measure(parse_importtime(SAMPLE), first_frame_ms=420)
+        assert figures['numpy'] == 6.5
+        assert figures['core'] == 2.0
+        assert figures['imports'] == 38.62
+        assert figures['first_frame'] == 420
+
+        budgets = {'imports': 100, 'pygame': 20, 'core': 5, 'first_frame': 500, 'ui': 10}
+        assert check_budgets(figures, budgets) == [('pygame', 30.0, 20)]
+
+    def test_report(self):
+        """Test that the report lists the slowest module first"""
+        rows = parse_importtime(SAMPLE)
+        report = format_report(rows, measure(rows, 420), top=2)
+        lines = report.splitlines()
+        assert lines[1].startswith('pygame')
+        assert '6 modules imported in 39 ms' in report
+        assert 'First frame after 420 ms' in report
+
+    def test_headless_modules_skip_pygame(self):
+        """Test that the simulation, AI, storage and main module import without loading pygame"""
+        assert [module for module in HEADLESS_MODULES if imports_pygame(module)] == []
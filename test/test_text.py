@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+pygame = pytest.importorskip('pygame')
+
+from ui.text import TextCache
+
+
+class TestTextCache:
+    def setup_method(self):
+        pygame.font.init()
+        self.cache = TextCache(max_surfaces=2)
+
+    def teardown_method(self):
+        pygame.font.quit()
+
+    def test_fonts_loaded_once(self):
+        """Test that a face and size is only looked up once"""
+        assert self.cache.font(30) is self.cache.font(30)
+        assert self.cache.font(30) is not self.cache.font(40)
+        assert len(self.cache.fonts) == 2
+
+    def test_render_hits_and_misses(self):
+        """Test that identical text is rendered once and served from the cache"""
+        first = self.cache.render("Score: 0", 30, (255, 255, 255))
+        second = self.cache.render("Score: 0", 30, [255, 255, 255])
+        assert first is second
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+        # Any part of the key changing renders a new surface
+        self.cache.render("Score: 0", 30, (255, 0, 0))
+        assert self.cache.misses == 2
+
+    def test_least_recently_used_evicted(self):
+        """Test that the surface cache is bounded and evicts the oldest entry"""
+        a = self.cache.render("a", 30, (255, 255, 255))
+        self.cache.render("b", 30, (255, 255, 255))
+        self.cache.render("a", 30, (255, 255, 255))  # "a" is now the most recent
+        self.cache.render("c", 30, (255, 255, 255))
+
+        assert len(self.cache.surfaces) == 2
+        assert self.cache.render("a", 30, (255, 255, 255)) is a
+        misses = self.cache.misses
+        self.cache.render("b", 30, (255, 255, 255))
+        assert self.cache.misses == misses + 1
@@ -0,0 +1,117 @@
+"""Locked stack kept as a palette-indexed surface.
+
+Every cell of the board is one pixel of a small 8-bit surface whose value is
+a palette index (0 for an empty cell). When a piece locks, only the rows it
+touched (and the rows its line clear shifted) are written through
+pygame.surfarray, scaled to BLOCK_SIZE into the same rows of a second 8-bit
+surface and OR'd with a pre-rendered border template: index | BORDER is
+white for filled cells and black for empty ones. Drawing the whole stack is
+then a single blit, whatever its size or how full it is.
+
+Requires numpy (for pygame.surfarray), which the game itself does not need.
+"""
+import numpy as np
+import pygame
+
+import services.config as config
+from ui.theme import COLORS, SHAPE_COLORS
+
+# Bit set on the palette index of the pixels on a block's border
+BORDER = 128
+
+
+def border_template(width, height, block_size):
+    """Return a (width * block_size, height * block_size) array with BORDER on every cell outline"""
+    cell = np.zeros((block_size, block_size), dtype=np.uint8)
+    cell[[0, -1], :] = BORDER
+    cell[:, [0, -1]] = BORDER
+    return np.tile(cell, (width, height))
+
+
+class GridSurface:
+    def __init__(self, width, height, block_size=config.BLOCK_SIZE):
+        self.width = width
+        self.height = height
+        self.colors = [COLORS['BLACK']] + list(SHAPE_COLORS)
+        self.palette_index = {color: i for i, color in enumerate(self.colors)}
+
+        self.cells = pygame.Surface((width, height), depth=8)
+        self.surface = pygame.Surface((width * block_size, height * block_size), depth=8)
+        self.cells.fill(0)
+        self.border = border_template(width, height, block_size)
+        self._set_palette()
+        pygame.surfarray.blit_array(self.surface, self.border)
+
+        self.block_size = block_size
+        self.indices = np.zeros((width, height), dtype=np.uint8)  # Indexed [x, y] like surfarray
+        self.synced = None  # (board, pieces_placed) the surface was last built from
+
+    def _set_palette(self):
+        palette = [COLORS['BLACK']] * 256
+        palette[:len(self.colors)] = self.colors
+        palette[BORDER + 1:BORDER + len(self.colors)] = [COLORS['WHITE']] * (len(self.colors) - 1)
+        self.cells.set_palette(palette)
+        self.surface.set_palette(palette)
+
+    def _index(self, color):
+        """Return the palette index of a color, adding it to the palette if needed"""
+        index = self.palette_index.get(color)
+        if index is None:
+            if len(self.colors) == BORDER:
+                return len(self.colors) - 1  # Palette full: reuse the last color
+            index = self.palette_index[color] = len(self.colors)
+            self.colors.append(color)
+            self._set_palette()
+        return index
+
+    def sync(self, board):
+        """Bring the surface up to date with the board's locked cells, returns True if it changed"""
+        key = (board, board.pieces_placed)
+        if key == self.synced:
+            return False
+        incremental = self.synced == (board, board.pieces_placed - 1)
+        self.synced = key
+
+        if incremental:
+            return self._redraw_rows(board, *self._locked_span(board))
+        return self._redraw_rows(board, 0, self.height)
+
+    def _locked_span(self, board):
+        """Return the rows (start, stop) changed by the single piece locked since the last sync"""
+        start, stop = board.last_locked_rows.start, board.last_locked_rows.stop
+        cleared = board.last_cleared_rows
+        if cleared:
+            # Rows down to the lowest cleared one moved, up to the old stack top:
+            # it was at most len(cleared) rows above the new one, or a cleared row itself
+            top = self.height - max(board.heights) - len(cleared)
+            start = max(0, min(start, top, cleared[0]))
+            stop = max(stop, cleared[-1] + 1)
+        return start, stop
+
+    def _redraw_rows(self, board, start, stop):
+        """Rewrite, scale and border the rows start to stop, returns True if any cell changed"""
+        if start >= stop:
+            return False
+        indices = np.array([[self._index(colors[x]) if row[x] else 0 for x in range(self.width)]
+                            for row, colors in zip(board.grid[start:stop], board.colors[start:stop])],
+                           dtype=np.uint8).T
+        if np.array_equal(indices, self.indices[:, start:stop]):
+            return False
+        self.indices[:, start:stop] = indices
+
+        cells = pygame.surfarray.pixels2d(self.cells)
+        cells[:, start:stop] = indices
+        del cells  # Unlock the surface
+
+        size = self.block_size
+        rows = pygame.Rect(0, start * size, self.width * size, (stop - start) * size)
+        pygame.transform.scale(self.cells.subsurface((0, start, self.width, stop - start)), rows.size,
+                               self.surface.subsurface(rows))
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        pixels[:, rows.top:rows.bottom] |= self.border[:, rows.top:rows.bottom]
+        del pixels
+        return True
+
+    def invalidate(self):
+        """Force the next sync to rescan the board"""
+        self.synced = None
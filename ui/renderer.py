@@ -1,16 +1,31 @@
 import pygame
 import services.config as config
-from ui.theme import COLORS, FONTS
+from core.rotation import ROTATIONS, SPAWN_ROTATION
+from ui.theme import COLORS
+from ui.text import text_cache
+
+try:
+    from ui.grid import GridSurface  # Needs numpy for pygame.surfarray
+except ImportError:
+    GridSurface = None
 
 
 class Renderer:
-    def __init__(self, screen):
+    def __init__(self, screen, dirty_rects=None, profiler=None):
         self.screen = screen
-
-    def _draw_text(self, text, size, x, y, color=COLORS['WHITE'], centered=True):
-        """Helper function to draw text on screen"""
-        font = pygame.font.SysFont(FONTS['main'], size)
-        text_surface = font.render(text, True, color)
+        self.profiler = profiler  # FrameProfiler timing the render and present phases
+        self.show_profiler = False  # Draw the profiler overlay on every frame
+        self._profiler_lines = []
+        # Only redraw and present what changed in the game screen
+        self.dirty_rects = config.DIRTY_RECT_RENDERING if dirty_rects is None else dirty_rects
+        self._game_frame = None  # What the last dirty-rect game frame put on screen
+        self._grid = None  # Palette-indexed surface of the locked stack
+        self._layers = {}  # Static backgrounds and overlays, built once
+        self._layer_signature = None  # Resolution and theme the layers were built for
+
+    def _draw_text(self, text, size, x, y, color=COLORS['WHITE'], centered=True, surface=None):
+        """Helper function to draw text on screen (or on another surface)"""
+        text_surface = text_cache.render(text, size, color)
         text_rect = text_surface.get_rect()
 
         if centered:
@@ -18,13 +33,38 @@ class Renderer:
         else:
             text_rect.topleft = (x, y)
 
-        self.screen.blit(text_surface, text_rect)
+        (self.screen if surface is None else surface).blit(text_surface, text_rect)
 
         return text_rect
 
-    def render_title_screen(self):
-        """Render the title screen"""
-        self.screen.fill(COLORS['BLACK'])
+    def _layer(self, name, build, *key):
+        """Return a cached static layer, building it on first use or after a theme or resolution change"""
+        if not config.CACHE_STATIC_LAYERS:
+            return build(*key)
+
+        signature = (self.screen.get_size(), tuple(COLORS.values()))
+        if signature != self._layer_signature:
+            self._layers.clear()
+            self._layer_signature = signature
+
+        layer = self._layers.get((name,) + key)
+        if layer is None:
+            layer = self._layers[(name,) + key] = build(*key)
+        return layer
+
+    def invalidate_layers(self):
+        """Rebuild every static layer on next use, e.g. after changing the theme"""
+        self._layers.clear()
+
+    def _new_layer(self):
+        """Return a black surface the size and format of the screen"""
+        layer = pygame.Surface(self.screen.get_size(), 0, self.screen)
+        layer.fill(COLORS['BLACK'])
+        return layer
+
+    def _build_title_letters(self):
+        """Black background with the rainbow TETRIS title"""
+        layer = self._new_layer()
 
         # Draw title
         title = "TETRIS"
@@ -38,13 +78,60 @@ class Renderer:
         # Draw each letter
         for i, letter in enumerate(title):
             color = colors[i % len(colors)]
-            self._draw_text(letter, font_size, start_x + i * 40, y, color)
+            self._draw_text(letter, font_size, start_x + i * 40, y, color, surface=layer)
+
+        return layer
+
+    def _build_title_screen(self):
+        """The whole title screen, which never changes"""
+        layer = self._new_layer()
+        layer.blit(self._layer('title_letters', self._build_title_letters), (0, 0))
 
         # Draw instructions
         self._draw_text("Press ENTER to Start", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2,
-                        COLORS['WHITE'])
+                        COLORS['WHITE'], surface=layer)
+
+        return layer
+
+    def _build_game_panel(self, board_width):
+        """Game screen background: separation line, next piece box and pause hint"""
+        layer = self._new_layer()
 
-        pygame.display.update()
+        # Draw a separation line between game board and UI area
+        pygame.draw.line(
+            layer,
+            config.WHITE,
+            (board_width * config.BLOCK_SIZE, 0),
+            (board_width * config.BLOCK_SIZE, config.SCREEN_HEIGHT),
+            2
+        )
+
+        # Draw the next piece box
+        preview_x = config.SCREEN_WIDTH - 160
+        preview_y = 200
+        self._draw_text("Next:", 30, preview_x, preview_y - 30, COLORS['WHITE'], centered=False, surface=layer)
+        pygame.draw.rect(layer, COLORS['WHITE'], [preview_x, preview_y, 140, 140], 1)
+
+        self._draw_text(f"Press 'P' to pause", 20, config.SCREEN_WIDTH - 150, 400, config.WHITE,
+                        centered=False, surface=layer)
+
+        return layer
+
+    def _build_pause_overlay(self):
+        """Semi-transparent black overlay drawn over the paused game"""
+        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 128))  # Transparent black
+        return overlay
+
+    def pause_overlay(self):
+        """Return the cached pause overlay"""
+        return self._layer('pause_overlay', self._build_pause_overlay)
+
+    def render_title_screen(self):
+        """Render the title screen"""
+        self.screen.blit(self._layer('title_screen', self._build_title_screen), (0, 0))
+
+        self.present()
 
     def render_name_entry(self, input_box):
         """Render the name entry screen"""
@@ -60,75 +147,216 @@ class Renderer:
         self._draw_text("Press ENTER when done", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT * 3 // 4,
                         COLORS['WHITE'])
 
-        pygame.display.update()
+        self.present()
 
     def render_main_menu(self, menu):
         """Render the main menu"""
-        self.screen.fill(COLORS['BLACK'])
-
-        # Draw title
-        title = "TETRIS"
-        colors = [COLORS['RED'], COLORS['ORANGE'], COLORS['YELLOW'], COLORS['GREEN'], COLORS['BLUE'], COLORS['PURPLE']]
-
-        # Starting position (centered roughly)
-        start_x = config.SCREEN_WIDTH // 2 - 100
-        y = config.SCREEN_HEIGHT // 4
-        font_size = 80
-
-        # Draw each letter
-        for i, letter in enumerate(title):
-            color = colors[i % len(colors)]
-            self._draw_text(letter, font_size, start_x + i * 40, y, color)
+        self.screen.blit(self._layer('title_letters', self._build_title_letters), (0, 0))
 
         # Draw menu
         menu.draw(self.screen, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2)
 
-        pygame.display.update()
+        self.present()
 
     def render_game(self, board):
         """Render the game board and current piece"""
-        self.screen.fill(config.BLACK)
+        if self.dirty_rects:
+            self._render_game_dirty(board)
+            return
+
+        self._draw_game(board)
+        self.present()
+
+    def invalidate(self):
+        """Forget what is on screen so the next game frame is drawn in full"""
+        self._game_frame = None
+        if self._grid:
+            self._grid.invalidate()
+
+    def _score_texts(self, board):
+        """Return the (text, x, y) of the score information in the side panel"""
+        return [
+            (f"Score: {board.score}", config.SCREEN_WIDTH - 150, 30),
+            (f"Level: {board.level}", config.SCREEN_WIDTH - 150, 60),
+            (f"Lines: {board.lines_cleared}", config.SCREEN_WIDTH - 150, 90)
+        ]
+
+    def _draw_game(self, board):
+        """Draw the whole game screen and return the rects of the score texts"""
+        self.screen.blit(self._layer('game_panel', self._build_game_panel, board.width), (0, 0))
 
         # Draw the grid
-        for i in range(board.height):
-            for j in range(board.width):
-                if board.grid[i][j]:
-                    pygame.draw.rect(
-                        self.screen,
-                        board.colors[i][j],
-                        [j * config.BLOCK_SIZE, i * config.BLOCK_SIZE, config.BLOCK_SIZE, config.BLOCK_SIZE]
-                    )
-                    pygame.draw.rect(
-                        self.screen,
-                        config.WHITE,
-                        [j * config.BLOCK_SIZE, i * config.BLOCK_SIZE, config.BLOCK_SIZE, config.BLOCK_SIZE],
-                        1
-                    )
-
-        # Draw a separation line between game board and UI area
-        pygame.draw.line(
-            self.screen,
-            config.WHITE,
-            (board.width * config.BLOCK_SIZE, 0),
-            (board.width * config.BLOCK_SIZE, config.SCREEN_HEIGHT),
-            2
-        )
+        grid = self._grid_surface(board)
+        if grid:
+            self.screen.blit(grid.surface, (0, 0))
+        else:
+            self._draw_cells(board)
 
-        # Draw the current piece
+        # Draw where the current piece will land, then the piece itself
+        if config.SHOW_GHOST_PIECE:
+            self._draw_ghost(board)
         self._draw_tetromino(board.current_piece)
 
-        # Draw next piece preview
-        self._draw_next_piece(board.next_piece)
+        # Draw next piece preview, and the pieces after it if more are shown
+        self._draw_preview_piece(board.next_piece)
+        if config.PREVIEW_PIECES > 1:
+            self._draw_queue(board.preview(config.PREVIEW_PIECES)[1:])
 
         # Draw the score information
-        self._draw_text(f"Score: {board.score}", 30, config.SCREEN_WIDTH - 150, 30, config.WHITE, centered=False)
-        self._draw_text(f"Level: {board.level}", 30, config.SCREEN_WIDTH - 150, 60, config.WHITE, centered=False)
-        self._draw_text(f"Lines: {board.lines_cleared}", 30, config.SCREEN_WIDTH - 150, 90, config.WHITE,
-                        centered=False)
-        self._draw_text(f"Press 'P' to pause", 20, config.SCREEN_WIDTH - 150, 400, config.WHITE,
-                        centered=False)
+        return [self._draw_text(text, 30, x, y, config.WHITE, centered=False)
+                for text, x, y in self._score_texts(board)]
+
+    def _grid_surface(self, board):
+        """Return the indexed stack surface synced with the board, or None to draw cell by cell"""
+        if not (config.INDEXED_GRID_RENDERING and GridSurface):
+            return None
+        if self._grid is None or (self._grid.width, self._grid.height) != (board.width, board.height):
+            self._grid = GridSurface(board.width, board.height)
+        self._grid.sync(board)
+        return self._grid
+
+    def _draw_cells(self, board):
+        """Draw the locked cells one block at a time"""
+        for i in range(board.height):
+            for j in range(board.width):
+                if board.grid[i][j]:
+                    self._draw_block(j * config.BLOCK_SIZE, i * config.BLOCK_SIZE, board.colors[i][j])
+
+    def _render_game_dirty(self, board):
+        """Redraw and present only the parts of the game screen that changed since the last frame"""
+        piece = board.current_piece
+        piece_cells = self._piece_cells(piece, piece.y)
+        ghost_cells = set()
+        if config.SHOW_GHOST_PIECE:
+            ghost_cells = self._piece_cells(piece, piece.y + board.drop_distance()) - piece_cells
+        texts = [text for text, _, _ in self._score_texts(board)]
+
+        frame = self._game_frame
+        if frame is None or frame['board'] is not board:
+            # First frame of this board: draw everything once
+            text_rects = self._draw_game(board)
+            self.present()
+            self._game_frame = {
+                'board': board,
+                'pieces_placed': board.pieces_placed,
+                'grid': [row[:] for row in board.grid],
+                'colors': [row[:] for row in board.colors],
+                'piece_cells': piece_cells,
+                'ghost_cells': ghost_cells,
+                'texts': texts,
+                'text_rects': text_rects,
+                'next_piece': board.next_piece,
+                'preview': board.preview(config.PREVIEW_PIECES)
+            }
+            return
+
+        # Cells covered by the active piece or its ghost, now or in the last frame
+        dirty = frame['piece_cells'] | frame['ghost_cells'] | piece_cells | ghost_cells
+
+        # The stack only changes when a piece locks (merges and line clears)
+        if frame['pieces_placed'] != board.pieces_placed:
+            for y in range(board.height):
+                if board.grid[y] != frame['grid'][y] or board.colors[y] != frame['colors'][y]:
+                    dirty.update((x, y) for x in range(board.width)
+                                 if board.grid[y][x] != frame['grid'][y][x] or
+                                 board.colors[y][x] != frame['colors'][y][x])
+            frame['grid'] = [row[:] for row in board.grid]
+            frame['colors'] = [row[:] for row in board.colors]
+            frame['pieces_placed'] = board.pieces_placed
+
+        grid = self._grid_surface(board)
+        rects = [self._redraw_cell(board, x, y, piece_cells, ghost_cells, grid)
+                 for x, y in dirty if 0 <= x < board.width and 0 <= y < board.height]
+
+        # Side panel texts
+        for i, text in enumerate(texts):
+            if text != frame['texts'][i]:
+                old_rect = frame['text_rects'][i]
+                self.screen.fill(config.BLACK, old_rect)
+                _, x, y = self._score_texts(board)[i]
+                new_rect = self._draw_text(text, 30, x, y, config.WHITE, centered=False)
+                rects.append(old_rect.union(new_rect))
+                frame['text_rects'][i] = new_rect
+        frame['texts'] = texts
+
+        # Next piece preview (the locked piece object is reused as the next one, so compare shapes too)
+        preview = board.preview(config.PREVIEW_PIECES)
+        if board.next_piece is not frame['next_piece'] or preview != frame['preview']:
+            rects.append(self._draw_preview_piece(board.next_piece, clear=True))
+            if config.PREVIEW_PIECES > 1:
+                rects.append(self._draw_queue(preview[1:], clear=True))
+            frame['next_piece'] = board.next_piece
+            frame['preview'] = preview
+
+        frame['piece_cells'] = piece_cells
+        frame['ghost_cells'] = ghost_cells
+
+        self.present(rects)
+
+    def present(self, rects=None):
+        """Push the frame (or only the given rects) to the display"""
+        profiler = self.profiler
+        if profiler:
+            profiler.mark('render')
+            if self.show_profiler:
+                overlay_rect = self._draw_profiler_overlay()
+                if rects is not None:
+                    rects = rects + [overlay_rect]
+
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+        if profiler:
+            profiler.mark('present')
+
+    def _draw_profiler_overlay(self):
+        """Draw the frame phase percentiles in the top left corner, return the overlay rect"""
+        # Percentiles are refreshed twice a second at 60 FPS
+        if not self._profiler_lines or self.profiler.index % 30 == 0:
+            stats = self.profiler.stats()
+            self._profiler_lines = [["ms", "p50", "p95", "p99", "max"]] + [
+                [name] + [f"{s[key]:.2f}" for key in ('p50', 'p95', 'p99', 'max')] for name, s in stats.items()
+            ]
+
+        rect = pygame.Rect(0, 0, 250, 8 + 16 * len(self._profiler_lines))
+        self.screen.fill(config.BLACK, rect)
+        for i, line in enumerate(self._profiler_lines):
+            # Phase name column, then one column per statistic
+            for j, cell in enumerate(line):
+                self._draw_text(cell, 18, 5 + (60 + 45 * (j - 1) if j else 0), 4 + 16 * i, config.GREEN,
+                                centered=False)
+        return rect
+
+    def _piece_cells(self, piece, y):
+        """Return the set of visible (x, y) grid cells covered by a piece placed at row y"""
+        return {(piece.x + j, y + i) for i, row in enumerate(piece.shape)
+                for j, cell in enumerate(row) if cell and y + i >= 0}
+
+    def _redraw_cell(self, board, x, y, piece_cells, ghost_cells, grid=None):
+        """Redraw a single grid cell and return its rect"""
+        rect = pygame.Rect(x * config.BLOCK_SIZE, y * config.BLOCK_SIZE, config.BLOCK_SIZE, config.BLOCK_SIZE)
+        if grid:
+            # Copy the cell, empty or locked, from the indexed stack surface
+            self.screen.blit(grid.surface, rect, rect)
+        else:
+            self.screen.fill(config.BLACK, rect)
+
+        if (x, y) in piece_cells:
+            self._draw_block(rect.x, rect.y, board.current_piece.color)
+        elif grid is None and board.grid[y][x]:
+            self._draw_block(rect.x, rect.y, board.colors[y][x])
+        elif (x, y) in ghost_cells:
+            pygame.draw.rect(self.screen, board.current_piece.color, rect, 1)
+
+        return rect
 
-        pygame.display.update()
+    def _draw_block(self, x, y, color, size=None):
+        """Draw one block with a white border at pixel position (x, y)"""
+        size = size or config.BLOCK_SIZE
+        pygame.draw.rect(self.screen, color, [x, y, size, size])
+        pygame.draw.rect(self.screen, COLORS['WHITE'], [x, y, size, size], 1)
 
     def render_game_over(self, score, player_name, high_scores, show_high_scores=False):
         """Render the game over screen"""
@@ -172,7 +400,7 @@ class Renderer:
             # Back button
             self._draw_text("Press B to go Back", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT - 50, config.WHITE)
 
-        pygame.display.update()
+        self.present()
 
     def render_confirm_name(self, player_name):
         """Render the name confirmation screen"""
@@ -184,162 +412,73 @@ class Renderer:
         self._draw_text("Y - Yes", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT * 2 // 3, config.WHITE)
         self._draw_text("N - No", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT * 2 // 3 + 40, config.WHITE)
 
-        pygame.display.update()
+        self.present()
 
     def _draw_tetromino(self, tetromino):
         """Draw a tetromino on the screen"""
         for i, row in enumerate(tetromino.shape):
             for j, cell in enumerate(row):
                 if cell:
+                    self._draw_block((tetromino.x + j) * config.BLOCK_SIZE, (tetromino.y + i) * config.BLOCK_SIZE,
+                                     tetromino.color)
+
+    def _draw_ghost(self, board):
+        """Draw the outline of the current piece at its landing row"""
+        piece = board.current_piece
+        ghost_y = piece.y + board.drop_distance()
+        for i, row in enumerate(piece.shape):
+            for j, cell in enumerate(row):
+                if cell and ghost_y + i >= 0:
                     pygame.draw.rect(
                         self.screen,
-                        tetromino.color,
-                        [(tetromino.x + j) * config.BLOCK_SIZE, (tetromino.y + i) * config.BLOCK_SIZE,
-                         config.BLOCK_SIZE, config.BLOCK_SIZE]
-                    )
-                    pygame.draw.rect(
-                        self.screen,
-                        COLORS['WHITE'],
-                        [(tetromino.x + j) * config.BLOCK_SIZE, (tetromino.y + i) * config.BLOCK_SIZE,
+                        piece.color,
+                        [(piece.x + j) * config.BLOCK_SIZE, (ghost_y + i) * config.BLOCK_SIZE,
                          config.BLOCK_SIZE, config.BLOCK_SIZE],
                         1
                     )
 
-    def _draw_next_piece(self, next_piece):
-        """Draw the next piece preview"""
-        # Draw preview box
+    def _draw_preview_piece(self, next_piece, clear=False):
+        """Draw the next piece centered in the preview box, return the box interior rect"""
         preview_x = config.SCREEN_WIDTH - 160
         preview_y = 200
-
-        # Draw "Next" text
-        self._draw_text("Next:", 30, preview_x, preview_y - 30, COLORS['WHITE'], centered=False)
-
-        # Draw box outline
         box_size = 140
-        pygame.draw.rect(self.screen, COLORS['WHITE'],
-                         [preview_x, preview_y, box_size, box_size], 1)
+        interior = pygame.Rect(preview_x + 1, preview_y + 1, box_size - 2, box_size - 2)
+        if clear:
+            self.screen.fill(config.BLACK, interior)
 
         # Calculate center position for the piece
         offset_x = preview_x + box_size // 2 - (len(next_piece.shape[0]) * config.BLOCK_SIZE) // 2
         offset_y = preview_y + box_size // 2 - (len(next_piece.shape) * config.BLOCK_SIZE) // 2
 
-        # Draw next piece
         for i, row in enumerate(next_piece.shape):
             for j, cell in enumerate(row):
                 if cell:
-                    pygame.draw.rect(
-                        self.screen,
-                        next_piece.color,
-                        [offset_x + j * config.BLOCK_SIZE, offset_y + i * config.BLOCK_SIZE,
-                         config.BLOCK_SIZE, config.BLOCK_SIZE]
-                    )
-                    pygame.draw.rect(
-                        self.screen,
-                        COLORS['WHITE'],
-                        [offset_x + j * config.BLOCK_SIZE, offset_y + i * config.BLOCK_SIZE,
-                         config.BLOCK_SIZE, config.BLOCK_SIZE],
-                        1
-                    )
-
-                def render_pause_menu(self, menu):
-                    """Render the pause menu overlay"""
-                    # Create a semi-transparent overlay
-                    overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA)
-                    overlay.fill((0, 0, 0, 128))  # Transparent black
-                    self.screen.blit(overlay, (0, 0))
-
-                    # Draw pause text
-                    self._draw_text("PAUSED", 60, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 4, COLORS['WHITE'])
-
-                    # Draw menu
-                    menu.draw(self.screen, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2)
-
-                    pygame.display.update()
-
-                def render_game_over(self, score, player_name, high_scores, show_high_scores):
-                    """Render the game over screen"""
-                    self.screen.fill(COLORS['BLACK'])
-
-                    if not show_high_scores:
-                        # Draw game over message
-                        self._draw_text("GAME OVER", 60, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 4,
-                                        COLORS['RED'])
-
-                        # Draw final score with player name
-                        self._draw_text(f"{player_name}: {score} pts", 35, config.SCREEN_WIDTH // 2,
-                                        config.SCREEN_HEIGHT // 2 - 40, COLORS['WHITE'])
-
-                        # Draw options
-                        self._draw_text("Press H to view High Scores", 30, config.SCREEN_WIDTH // 2,
-                                        config.SCREEN_HEIGHT // 2 + 20, COLORS['CYAN'])
-                        self._draw_text("Press ENTER to Play Again", 30, config.SCREEN_WIDTH // 2,
-                                        config.SCREEN_HEIGHT // 2 + 80, COLORS['WHITE'])
-                        self._draw_text("Press ESC to Quit", 25, config.SCREEN_WIDTH // 2,
-                                        config.SCREEN_HEIGHT // 2 + 120, COLORS['WHITE'])
-                    else:
-                        # Draw high scores screen
-                        self._draw_text("HIGH SCORES", 50, config.SCREEN_WIDTH // 2, 50, COLORS['YELLOW'])
-
-                        # Check if this score is a new high score (in top 3)
-                        is_new_high_score = False
-                        for i, hs in enumerate(high_scores[:3]):
-                            if hs['score'] == score and hs['name'] == player_name and i < 3:
-                                is_new_high_score = True
-
-                        if is_new_high_score:
-                            self._draw_text("NEW HIGH SCORE!", 35, config.SCREEN_WIDTH // 2, 100, COLORS['GREEN'])
-
-                        # Display top scores (maximum 8 to fit on screen)
-                        start_y = 150
-                        for i, hs in enumerate(high_scores[:8]):
-                            color = COLORS['CYAN'] if hs['score'] == score and hs['name'] == player_name else COLORS[
-                                'WHITE']
-                            self._draw_text(f"{i + 1}. {hs['name']}: {hs['score']} pts",
-                                            25, config.SCREEN_WIDTH // 2, start_y + i * 35, color)
-
-                        # Back button
-                        self._draw_text("Press B to go Back", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT - 50,
-                                        COLORS['WHITE'])
-
-                    pygame.display.update()
-
-                def render_high_scores(self, high_scores):
-                    """Render the high scores screen"""
-                    self.screen.fill(COLORS['BLACK'])
-
-                    # Draw title
-                    self._draw_text("HIGH SCORES", 50, config.SCREEN_WIDTH // 2, 50, COLORS['YELLOW'])
-
-                    # Display scores
-                    start_y = 150
-                    if high_scores:
-                        for i, hs in enumerate(high_scores[:10]):
-                            self._draw_text(f"{i + 1}. {hs['name']}: {hs['score']} pts",
-                                            25, config.SCREEN_WIDTH // 2, start_y + i * 35, COLORS['WHITE'])
-                    else:
-                        self._draw_text("No high scores yet!", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2,
-                                        COLORS['WHITE'])
-
-                    # Back button
-                    self._draw_text("Press any key to return", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT - 50,
-                                    COLORS['WHITE'])
-
-                    pygame.display.update()
-
-                def render_confirm_name(self, player_name):
-                    """Render the name confirmation screen"""
-                    self.screen.fill(COLORS['BLACK'])
-
-                    self._draw_text(f"Current Name: {player_name}", 40, config.SCREEN_WIDTH // 2,
-                                    config.SCREEN_HEIGHT // 3, COLORS['WHITE'])
-                    self._draw_text("Keep this name?", 35, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2,
-                                    COLORS['CYAN'])
-                    self._draw_text("Y - Yes", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT * 2 // 3,
-                                    COLORS['WHITE'])
-                    self._draw_text("N - No", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT * 2 // 3 + 40,
-                                    COLORS['WHITE'])
-
-                    pygame.display.update()
+                    self._draw_block(offset_x + j * config.BLOCK_SIZE, offset_y + i * config.BLOCK_SIZE,
+                                     next_piece.color)
+
+        return interior
+
+    def _draw_queue(self, shapes, clear=False):
+        """Draw the pieces after the next one at half size below the pause hint, return the area rect"""
+        queue_x = config.SCREEN_WIDTH - 160
+        queue_y = 430
+        block = config.BLOCK_SIZE // 2
+        area = pygame.Rect(queue_x, queue_y, 140, config.SCREEN_HEIGHT - queue_y)
+        if clear:
+            self.screen.fill(config.BLACK, area)
+
+        # Each slot holds a spawn-rotation piece (at most two rows) plus a gap
+        slot = 2 * block + 10
+        for n, shape_idx in enumerate(shapes[:area.height // slot]):
+            shape = ROTATIONS[shape_idx][SPAWN_ROTATION[shape_idx]]
+            offset_x = queue_x + 70 - (len(shape[0]) * block) // 2
+            for i, row in enumerate(shape):
+                for j, cell in enumerate(row):
+                    if cell:
+                        self._draw_block(offset_x + j * block, queue_y + n * slot + i * block,
+                                         config.SHAPE_COLORS[shape_idx], block)
+
+        return area
 
     def render_high_scores(self, high_scores):
         """Render the high scores screen"""
@@ -362,14 +501,11 @@ class Renderer:
         self._draw_text("Press ENTER to return", 30, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT - 50,
                         config.WHITE)
 
-        pygame.display.update()
+        self.present()
 
     def render_pause_menu(self, menu):
         """Render the pause menu overlay"""
-        # Create a semi-transparent overlay
-        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))  # Transparent black
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.pause_overlay(), (0, 0))
 
         # Draw pause text
         self._draw_text("PAUSED", 60, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 4, config.WHITE)
@@ -377,4 +513,4 @@ class Renderer:
         # Draw menu
         menu.draw(self.screen, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2)
 
-        pygame.display.update()
+        self.present()
@@ -0,0 +1,60 @@
+"""Shared font and rendered-text cache.
+
+SysFont lookups are slow, so fonts are loaded once per (face, size) and kept
+for the lifetime of the game. Rendered text surfaces are kept in a bounded
+LRU keyed by (text, size, color, antialias, face). Cached surfaces are shared:
+blit them, never draw on them.
+"""
+from collections import OrderedDict
+
+import pygame
+from ui.theme import FONTS, FONT_SIZES
+
+
+class TextCache:
+    def __init__(self, max_surfaces=256):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        self.hits = 0
+        self.misses = 0
+
+    def preload(self, sizes=FONT_SIZES, face=FONTS['main']):
+        """Load the fonts used by the game up front, e.g. right after pygame.init()"""
+        for size in sizes:
+            self.font(size, face)
+
+    def font(self, size, face=FONTS['main']):
+        """Return the font for a face and size, loading it on first use"""
+        font = self.fonts.get((face, size))
+        if font is None:
+            font = self.fonts[(face, size)] = pygame.font.SysFont(face, size)
+        return font
+
+    def render(self, text, size, color, antialias=True, face=FONTS['main']):
+        """Return a surface with the rendered text"""
+        key = (text, size, tuple(color), antialias, face)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.surfaces[key] = self.font(size, face).render(text, antialias, color)
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all rendered surfaces, e.g. after a theme change"""
+        self.surfaces.clear()
+
+    def reset(self):
+        """Drop fonts and surfaces; fonts must not be used after pygame.font.quit()"""
+        self.fonts.clear()
+        self.clear()
+
+
+# Cache shared by the renderer, widgets and states
+text_cache = TextCache()
@@ -30,6 +30,9 @@ FONTS = {
     'title': None  # Default system font
 }
 
+# Font sizes used by the screens, loaded once at startup
+FONT_SIZES = (20, 25, 30, 35, 40, 50, 60, 80)
+
 # UI theme settings
 UI_THEME = {
     'background': COLORS['BLACK'],
@@ -1,6 +1,7 @@
 import pygame
 import services.config as config
-from ui.theme import COLORS, FONTS
+from ui.theme import COLORS
+from ui.text import text_cache
 
 
 class InputBox:
@@ -8,8 +9,7 @@ class InputBox:
         self.rect = pygame.Rect(x, y, width, height)
         self.color = COLORS['WHITE']
         self.text = text
-        self.font = pygame.font.SysFont(FONTS['main'], 40)
-        self.txt_surface = self.font.render(text, True, self.color)
+        self.txt_surface = text_cache.render(text, 40, self.color)
         self.active = True
         self.cursor_visible = True
         self.last_cursor_update = pygame.time.get_ticks()
@@ -30,7 +30,7 @@ class InputBox:
                 self.last_cursor_update = pygame.time.get_ticks()
 
                 # Re-render the text
-                self.txt_surface = self.font.render(self.text, True, self.color)
+                self.txt_surface = text_cache.render(self.text, 40, self.color)
 
         return None
 
@@ -64,7 +64,6 @@ class Menu:
     def __init__(self, options, state_manager):
         self.options = options
         self.selected = 0
-        self.font = pygame.font.SysFont(None, 30)
         self.state_manager = state_manager
 
     def handle_event(self, event):
@@ -86,6 +85,6 @@ class Menu:
     def draw(self, screen, x, y):
         for i, option in enumerate(self.options):
             color = (0, 255, 255) if i == self.selected else (255, 255, 255)
-            text = self.font.render(option, True, color)
+            text = text_cache.render(option, 30, color)
             rect = text.get_rect(center=(x, y + i * 40))
             screen.blit(text, rect)